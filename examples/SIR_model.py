@@ -28,7 +28,7 @@ and then something on the lines of::
 
 import math
 import random
-from traits.trait_types import Enum, Int, CInt, Float, Set
+from traits.trait_types import Any, Enum, Int, CInt, Float, Set
 
 import gevent
 from pynetsym import Simulation
@@ -40,9 +40,7 @@ from pynetsym.simulation import BaseClock
 from pynetsym.configurators import BasicH5Configurator
 from pynetsym.termination.conditions import always_true
 from pynetsym.graph import BasicH5Graph
-from pynetsym.agent_db import MongoAgentDB
-
-from pymongo import MongoClient
+from pynetsym.agent_db import LazyAgentDB, MongoAgentDB, get_mongo_client
 
 
 
@@ -66,8 +64,8 @@ class Recorder(Agent):
         self.infected = 0
         self.recovered = 0
 
-        # opens a connection to Mongo
-        self.client = MongoClient()
+        # shares the connection pool with the agent db
+        self.client = get_mongo_client()
         # resets the stats of old simulations
         self.client.drop_database('stats')
         self.db = self.client.stats
@@ -129,6 +127,12 @@ class AdvancedRecorder(Recorder):
 
 class Activator(pynetsym.Activator):
     infected_nodes = Set(CInt)
+    _recorder = Any(transient=True)
+
+    def notify_recorder(self, message_name, node):
+        if self._recorder is None:
+            self._recorder = self.handle(Recorder.name)
+        self.send(self._recorder, message_name, node=node)
 
     def tick(self):
         if self.infected_nodes:
@@ -145,14 +149,14 @@ class Activator(pynetsym.Activator):
         which are the only ones that receive an `activate` message.
         """
         self.infected_nodes.add(node)
-        self.send(Recorder.name, 'node_infected', node=node)
+        self.notify_recorder('node_infected', node)
 
     def not_infected(self, node):
         """
         Whenever a node recovers, it notifies the Activator.
         """
         self.infected_nodes.remove(node)
-        self.send(Recorder.name, 'node_recovered', node=node)
+        self.notify_recorder('node_recovered', node)
 
     def nodes_to_activate(self):
         """
@@ -166,16 +170,22 @@ class Node(pynetsym.Node):
     recovery_rate = Float(1.0)
     infection_rate = Float(1.0)
     spread_out = False
+    _activator = Any(transient=True)
+
+    def notify_activator(self, message_name):
+        if self._activator is None:
+            self._activator = self.handle(Activator.name)
+        self.send(self._activator, message_name, node=self.id)
 
     def initialize(self, state):
         self.state = state
         if state == 'I':
-            self.send(Activator.name, 'infected', node=self.id)
+            self.notify_activator('infected')
 
     def infect(self):
         if self.state == 'S':
             self.state = 'I'
-            self.send(Activator.name, 'infected', node=self.id)
+            self.notify_activator('infected')
 
     def activate(self):
         if self.state == 'I':
@@ -186,15 +196,19 @@ class Node(pynetsym.Node):
                 self.spread_out = True
             if random.random() < self.recovery_rate:
                 self.state = 'R'
-                self.send(Activator.name, 'not_infected', node=self.id)
+                self.notify_activator('not_infected')
 
 class Simulation(pynetsym.Simulation):
     default_infection_rate = 1.
     default_recovery_rate = 1.
     default_infected_rate = 0.01
 
-    agent_db_type = MongoAgentDB
-    agent_db_parameters = {}
+    # susceptible nodes are created only when a neighbor infects them
+    agent_db_type = LazyAgentDB
+
+    @property
+    def agent_db_parameters(self):
+        return dict(agent_db=MongoAgentDB())
 
     recorder_type = Recorder
     # recorder_type = AdvancedRecorder
@@ -227,6 +241,7 @@ class Simulation(pynetsym.Simulation):
         node_options = {
             'infection_rate',
             'recovery_rate',}
+        lazy_nodes = True
 
         def initialize_nodes(self):
             infected_rate = self.full_parameters[
@@ -234,14 +249,12 @@ class Simulation(pynetsym.Simulation):
             infected_population_size = int(
                 math.ceil(
                     len(self.node_identifiers) * infected_rate))
-            infected_nodes = set(
-                    random.sample(
-                        self.node_identifiers,
-                        infected_population_size))
-            self.sync_send_all(
-                   self.node_identifiers, 'initialize',
-                   state=lambda rid: ('I' if (rid in infected_nodes)
-                                            else 'S'))
+            infected_nodes = random.sample(
+                    self.node_identifiers,
+                    infected_population_size)
+            # nodes start susceptible: only the infected ones are
+            # initialized (and thus created)
+            self.sync_send_all(infected_nodes, 'initialize', state='I')
 
 def bench_mem(timeout, filename='meliae-dump-'):
     try:
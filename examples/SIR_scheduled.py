@@ -0,0 +1,112 @@
+"""
+Continuous time SIR Model.
+
+Same model as SIR_model.py, simulated with a
+:class:`pynetsym.simulation.ScheduledActivator`: every infected node
+draws the time of its next event from an exponential distribution with
+rate infection_rate * degree + recovery_rate (Gillespie's direct
+method, one node at a time) and either recovers or tries to infect a
+random neighbor. Susceptible nodes are never activated, so the cost of
+the simulation depends on the number of events and not on the size of
+the network.
+
+For example::
+
+    python SIR_scheduled.py -n 100000 -d 10 -p 0.3 -r 0.5 -f 0.001
+"""
+
+import math
+import random
+
+import networkx as nx
+from traits.api import Enum, Float, Int
+
+import pynetsym
+from pynetsym import FastClock, NXGraphConfigurator
+from pynetsym.simulation import ScheduledActivator
+
+
+class Activator(ScheduledActivator):
+    infected = Int(0)
+    recovered = Int(0)
+
+    def infected_node(self, node, delay):
+        self.infected += 1
+        self.schedule(node, delay=delay)
+
+    def recovered_node(self, node):
+        self.infected -= 1
+        self.recovered += 1
+
+
+class Node(pynetsym.Node):
+    state = Enum('S', 'I', 'R')
+    infection_rate = Float(1.0)
+    recovery_rate = Float(1.0)
+
+    def initialize(self):
+        self.infect()
+
+    def next_event_delay(self):
+        rate = (self.infection_rate * len(self.neighbors()) +
+                self.recovery_rate)
+        return random.expovariate(rate)
+
+    def infect(self):
+        if self.state == 'S':
+            self.state = 'I'
+            self.send(Activator.name, 'infected_node',
+                      node=self.id, delay=self.next_event_delay())
+
+    def activate(self):
+        neighbors = self.neighbors()
+        rate = self.infection_rate * len(neighbors)
+        if random.random() * (rate + self.recovery_rate) < rate:
+            self.sync_send(random.choice(neighbors), 'infect')
+            return self.next_event_delay()
+        else:
+            self.state = 'R'
+            self.send(Activator.name, 'recovered_node', node=self.id)
+
+
+class Simulation(pynetsym.Simulation):
+    command_line_options = (
+        ('-n', '--network-size', dict(default=10000, type=int)),
+        ('-d', '--average-degree', dict(default=10., type=float)),
+        ('-p', '--infection-rate', dict(default=0.3, type=float)),
+        ('-r', '--recovery-rate', dict(default=0.5, type=float)),
+        ('-f', '--initial-infected-rate', dict(default=0.001, type=float)),
+    )
+
+    activator_type = Activator
+    clock_type = FastClock
+
+    class configurator_type(NXGraphConfigurator):
+        node_type = Node
+        node_options = {'infection_rate', 'recovery_rate'}
+
+        def initialize_nodes(self):
+            infected_rate = self.full_parameters['initial_infected_rate']
+            population = list(self.node_identifiers)
+            infected_nodes = random.sample(
+                population,
+                int(math.ceil(len(population) * infected_rate)))
+            self.sync_send_all(infected_nodes, 'initialize')
+
+    # the simulation ends when there are no more events
+    termination_checker_conditions = ()
+
+    def setup(self):
+        self.add_parameter('starting_graph', nx.fast_gnp_random_graph(
+            self.network_size,
+            self.average_degree / (self.network_size - 1)))
+        super(Simulation, self).setup()
+
+
+if __name__ == '__main__':
+    sim = Simulation()
+    sim.run(force_cli=True)
+    print sim.motive
+    print 'time: %f infected: %d recovered: %d' % (
+        sim.activator.current_time, sim.activator.infected,
+        sim.activator.recovered)
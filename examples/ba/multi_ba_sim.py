@@ -10,12 +10,7 @@ import matplotlib
 
 #from . import ba_stepped2 as barabasi_albert
 from pynetsym.util import sna
-
-
-def average_distribution(dst):
-    pad(dst)
-    dst = np.vstack(dst)
-    return np.average(dst, axis=0)
+from pynetsym.util.ensemble import Ensemble
 
 
 ITERATIONS = 10
@@ -36,16 +31,6 @@ ba_marker = 'x'
 
 matplotlib.rc('font', size=20)
 
-def pad(seq):
-    """
-    Pads a sequence of arrays to make them vstackable.
-
-    @return: None
-    """
-    max_ = max(el.size for el in seq)
-    for el in seq:
-        el.resize(max_, refcheck=False)
-
 if __name__ == '__main__':
     directory_name = "multi_ba_sim_%d" % time.time()
     os.mkdir(directory_name)
@@ -53,8 +38,9 @@ if __name__ == '__main__':
     F_pdf = plt.figure()
     F_ccdf = plt.figure()
 
-    ba_ccdfs = []
-    ba_pdfs = []
+    # the distributions of the runs are aggregated, not stored
+    ba_ccdfs = Ensemble()
+    ba_pdfs = Ensemble()
 
     for _iteration in xrange(ITERATIONS):
         sim = barabasi_albert.BA()
@@ -66,7 +52,7 @@ if __name__ == '__main__':
         starting_edges = sim.starting_edges
         starting_networks_size = sim.starting_network_size
 
-        graph = sim.graph.handle
+        graph = sim.graph.to_nx()
 
         del sim
 
@@ -74,16 +60,16 @@ if __name__ == '__main__':
         ccdf = sna.ccdf(bins)
         pdf = np.asfarray(bins) / len(bins)
 
-        ba_ccdfs.append(ccdf)
-        ba_pdfs.append(pdf)
+        ba_ccdfs.add(ccdf)
+        ba_pdfs.add(pdf)
 
     ccdf_axes = F_ccdf.gca()
     pdf_axes = F_pdf.gca()
 
-    for dst, color in zip(ba_ccdfs, colors):
-        ccdf_axes.loglog(dst, color=color)
-        
-    #ccdf_axes.loglog(ba_avg_ccdf, color='red')
+    degrees = np.arange(ba_ccdfs.width)
+    low, high = ba_ccdfs.quantile([0.05, 0.95])
+    ccdf_axes.fill_between(degrees[1:], low[1:], high[1:], color=colors[3])
+    ccdf_axes.loglog(degrees, ba_ccdfs.mean, color=ba_color)
 
     ccdf_axes.set_title('CCDF BA(%d, %d)' % (steps, starting_edges))
     ccdf_axes.set_xlabel('Degree $x$')
@@ -91,9 +77,12 @@ if __name__ == '__main__':
     ccdf_axes.set_xlim(left=starting_edges-1)
     ccdf_axes.grid(True)
 
-    for dst, color, marker in zip(ba_pdfs, colors, markers):
-        pdf_axes.loglog(dst, color=color, marker=marker, linestyle='')
-        
+    pdf_axes.errorbar(np.arange(ba_pdfs.width), ba_pdfs.mean,
+                      yerr=ba_pdfs.std(ddof=1), color=ba_color,
+                      marker=ba_marker, linestyle='')
+    pdf_axes.set_xscale('log')
+    pdf_axes.set_yscale('log', nonposy='clip')
+
     pdf_axes.set_title('PMF BA(%d, %d)' % (steps, starting_edges))
     pdf_axes.set_xlabel('Degree $x$')
     pdf_axes.set_ylabel('Probability')
@@ -101,8 +90,6 @@ if __name__ == '__main__':
     pdf_axes.grid(True)
     
 
-    #pdf_axes.loglog(ba_avg_pdf, color='red', marker='x', linestyle='')
-    
     F_ccdf.tight_layout(pad=0.4)
     F_pdf.tight_layout(pad=0.4)
     
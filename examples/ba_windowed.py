@@ -0,0 +1,93 @@
+"""
+Throughput and fidelity of the Barabasi-Albert model with different
+activation windows.
+
+Every step nodes_per_step nodes are created and activated with a
+:class:`pynetsym.simulation.WindowedActivator`; nodes yield control
+after every link, so with larger windows the nodes created in the same
+step interleave and see each other's links. A window of 1 is the
+serial model; "none" puts no limit.
+
+For example::
+
+    python ba_windowed.py -s 200 -k 50 -w 1 4 16 64 none
+"""
+
+import argparse
+
+import numpy as np
+
+from pynetsym import BasicConfigurator
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+from pynetsym.simulation import WindowedActivator
+
+
+class Node(barabasi_albert.Node):
+    def activate(self):
+        forbidden = set()
+        forbidden.add(self.id)
+        rs = self.graph.random_selector
+        while self.starting_edges:
+            random_node = rs.preferential_attachment()
+            if random_node not in forbidden:
+                self.link_to(random_node)
+                forbidden.add(random_node)
+                self.starting_edges -= 1
+                self.cooperate()
+
+
+class Activator(WindowedActivator):
+    options = {'starting_edges', 'nodes_per_step'}
+
+    def nodes_to_activate(self):
+        return self.fresh_nodes
+
+    def nodes_to_create(self):
+        return [(Node, dict(starting_edges=self.starting_edges))
+                for _ in xrange(self.nodes_per_step)]
+
+
+class BA(barabasi_albert.BA):
+    command_line_options = (
+        ('-k', '--nodes-per-step', dict(default=10, type=int)),
+    )
+    activator_type = Activator
+
+    class configurator_type(BasicConfigurator):
+        node_type = Node
+        node_options = {'starting_edges'}
+
+
+def run(window, steps, nodes_per_step, starting_edges):
+    sim = BA()
+    sim.activator_parameters = dict(window=window)
+    sim.run(steps=steps, nodes_per_step=nodes_per_step,
+            starting_edges=starting_edges,
+            starting_network_size=starting_edges)
+    with sim.graph.handle as graph:
+        degrees = np.array(graph.degree().values())
+    return sim.activator.metrics(), degrees
+
+
+def parse_window(value):
+    return None if value.lower() == 'none' else int(value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--steps', default=100, type=int)
+    parser.add_argument('-k', '--nodes-per-step', default=20, type=int)
+    parser.add_argument('-m', '--starting-edges', default=5, type=int)
+    parser.add_argument('-w', '--windows', nargs='+', type=parse_window,
+                        default=[1, 4, 16, None])
+    arguments = parser.parse_args()
+
+    print '%8s %12s %14s %10s %10s' % (
+        'window', 'latency ms', 'activations/s', 'max deg', 'std deg')
+    for window in arguments.windows:
+        metrics, degrees = run(window, arguments.steps,
+                               arguments.nodes_per_step,
+                               arguments.starting_edges)
+        print '%8s %12.3f %14.1f %10d %10.2f' % (
+            window, 1000 * metrics['latency'], metrics['throughput'],
+            degrees.max(), degrees.std())
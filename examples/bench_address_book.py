@@ -0,0 +1,58 @@
+"""
+Micro-benchmark of the address book resolution throughput.
+
+The node namespace of a simulation is filled with integer identifiers
+and resolved directly and through the AutoResolvingAddressBook the
+simulations use.
+"""
+import argparse
+import operator
+import random
+import timeit
+
+from pynetsym import addressing
+
+
+def make_auto_resolving(node_address_book):
+    address_book = addressing.AutoResolvingAddressBook(
+        main=addressing.FlatAddressBook(), node=node_address_book)
+    address_book.add_resolver('node', operator.isNumberType)
+    address_book.add_resolver('main', lambda o: isinstance(o, basestring))
+    return address_book
+
+
+def bench(address_book, identifiers, repeat):
+    resolve = address_book.resolve
+
+    def resolve_all():
+        for identifier in identifiers:
+            resolve(identifier)
+    best = min(timeit.repeat(resolve_all, number=1, repeat=repeat))
+    return len(identifiers) / best
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--number-of-nodes', type=int, default=100000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    namespace = parser.parse_args()
+
+    identifiers = range(namespace.number_of_nodes)
+    random.shuffle(identifiers)
+
+    print '%-30s %14s' % ('address book', 'resolve/s')
+    for name, factory in [('FlatAddressBook', addressing.FlatAddressBook),
+                          ('IntAddressBook', addressing.IntAddressBook)]:
+        node_address_book = factory()
+        for identifier in identifiers:
+            node_address_book.register(object(), identifier)
+        print '%-30s %14.0f' % (
+            name, bench(node_address_book, identifiers, namespace.repeat))
+        print '%-30s %14.0f' % (
+            'AutoResolving(%s)' % name,
+            bench(make_auto_resolving(node_address_book), identifiers,
+                  namespace.repeat))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+"""
+Compares the throughput of the agent serializers.
+
+Every serializer is used by an AgentDB to store and then recover
+a population of BA nodes and of SIR nodes.
+"""
+import argparse
+import random
+import time
+
+from pynetsym import agent_db
+from pynetsym.generation_models import nx_barabasi_albert as ba
+
+import SIR_model as sir
+
+
+def make_ba_nodes(how_many):
+    nodes = []
+    for identifier in xrange(how_many):
+        node = ba.Node(starting_edges=random.randint(0, 10))
+        node.id = identifier
+        nodes.append(node)
+    return nodes
+
+
+def make_sir_nodes(how_many):
+    nodes = []
+    for identifier in xrange(how_many):
+        node = sir.Node(state=random.choice('SIR'),
+                        infection_rate=random.random(),
+                        recovery_rate=random.random())
+        node.id = identifier
+        nodes.append(node)
+    return nodes
+
+
+def bench(pickler, nodes):
+    db = agent_db.AgentDB(pickler, dict())
+    start = time.time()
+    for node in nodes:
+        db.store(node)
+    stored = time.time()
+    for node in nodes:
+        db.recover(node.id)
+    recovered = time.time()
+    size = sum(len(value) for value in db.storage.itervalues())
+    return (len(nodes) / (stored - start),
+            len(nodes) / (recovered - stored),
+            float(size) / len(nodes))
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--number-of-nodes', type=int, default=10000)
+    namespace = parser.parse_args()
+
+    picklers = [('python', agent_db.PythonPickler()),
+                ('json', agent_db.JSONPickler()),
+                ('schema', agent_db.SchemaPickler())]
+    populations = [('BA', make_ba_nodes(namespace.number_of_nodes)),
+                   ('SIR', make_sir_nodes(namespace.number_of_nodes))]
+
+    print '%-5s %-8s %12s %12s %8s' % (
+        'nodes', 'pickler', 'store/s', 'recover/s', 'bytes')
+    for population_name, nodes in populations:
+        for pickler_name, pickler in picklers:
+            store_rate, recover_rate, size = bench(pickler, nodes)
+            print '%-5s %-8s %12.0f %12.0f %8.1f' % (
+                population_name, pickler_name,
+                store_rate, recover_rate, size)
+
+if __name__ == '__main__':
+    run()
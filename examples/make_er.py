@@ -1,39 +1,40 @@
 """
 This simple script creates G(n,m) ER random graphs of
 arbitrary dimension and saves them to a file in HDF5 format
-as sparse matrices.
+as sparse matrices (see :func:`pynetsym.graph.snapshot.write_edges`).
+
+The number of edges is given per node: the graph has n * m / 2
+edges, so that the average degree is m. The edges are generated and
+written in chunks, so that graphs larger than the memory can be
+created (unless the output name ends in .npz: numpy archives are
+built in memory); the same seed gives the same graph.
 """
-import h5py
-import numpy as np
-import numpy.random as rr
 import argparse
 
-bufsize = 10
+from pynetsym.graph import generators, snapshot
+
 
 def run():
     parser = argparse.ArgumentParser()
     parser.add_argument('-o', '--output')
     parser.add_argument('-n', '--number-of-nodes', type=int)
-    parser.add_argument('-m', '--number-of-edges', type=int)
+    parser.add_argument('-m', '--number-of-edges', type=int,
+                        help='edges per node (the average degree)')
+    parser.add_argument('-s', '--seed', type=int, default=None)
+    parser.add_argument('-c', '--compression', default=None)
 
     namespace = parser.parse_args()
 
     n = namespace.number_of_nodes
-    m = namespace.number_of_edges
-
-    ofile = h5py.File(namespace.output, 'w')
-    indptr = ofile.create_dataset('indptr', (n+1, ), np.int64)
-    indptr.write_direct(np.arange(0, m*n + 1, m, dtype=np.int64))
-    indices = ofile.create_dataset('indices', (m * n, ), dtype=np.int32)
-    # data = ofile.create_dataset('data', (m * n, ), dtype=np.int8)
-
-    for index in xrange(n/bufsize):
-        indices[index*m*bufsize:(index+1)*m*bufsize] =\
-                rr.random_integers(0, n-1, m * bufsize)
-
-    # data[:] = 1
-
-    ofile.close()
+    m = n * namespace.number_of_edges // 2
+    seed = namespace.seed
+    if seed is None:
+        # the edges are generated more than once: they must be the same
+        seed = generators.random_state().randint(1 << 31)
+
+    snapshot.write_edges(
+        namespace.output, n, lambda: generators.gnm_edges(n, m, seed),
+        compression=namespace.compression)
 
 if __name__ == '__main__':
     run()
@@ -7,12 +7,16 @@ from os import path
 # TODO: decide what to do
 from matplotlib import pyplot as plt
 import pynetsym
+from pynetsym.graph import NxGraph
 
 
 FORMATS = ('dot', 'gexf', 'gml', 'gpickle',
            'graphml', 'pajek', 'yaml')
 """Available formats"""
 
+SNAPSHOT_FORMATS = ('h5', 'npz')
+"""Binary formats written by IGraph.save"""
+
 def read_network(network_path, fmt=None, **kwargs):
     """
     Reads a network from filesystem.
@@ -27,8 +31,10 @@ def read_network(network_path, fmt=None, **kwargs):
     if fmt is None:
         _, ext = path.splitext(network_path)
         fmt = ext[1:]
-        if fmt not in FORMATS:
+        if fmt not in FORMATS + SNAPSHOT_FORMATS:
             raise IOError("Did not undestand format from filename %s." % network_path)
+    if fmt in SNAPSHOT_FORMATS:
+        return NxGraph.load(network_path, **kwargs).to_nx()
     fn = getattr(nx, 'read_' + fmt)
     return fn(network_path, **kwargs)
 
@@ -8,12 +8,15 @@ __all__ = [
     "get_logger",
     "MissingNode",
     "AgentDB",
+    "CachedAgentDB",
+    "LazyAgentDB",
     "NodeManager",
     "Node",
     'Simulation',
     'Activator',
     'AsyncClock',
     'Clock',
+    'FastClock',
     "IConfigurator",
     "AbstractConfigurator",
     "BasicConfigurator",
@@ -25,12 +28,13 @@ __all__.extend(configurators.__all__)
 
 from .core import Agent, AgentError, MinimalAgentRuntime, Logger, get_logger
 from .addressing import AddressingError
-from .agent_db import MissingNode, AgentDB
+from .agent_db import MissingNode, AgentDB, CachedAgentDB, LazyAgentDB
 from .node_manager import NodeManager
 from .nodes import Node
 from .simulation import Simulation
 from .simulation import Activator
-from .simulation import Clock, AsyncClock
+from .simulation import Clock, AsyncClock, FastClock
 from .configurators import IConfigurator, AbstractConfigurator, BasicConfigurator, Either
 from .configurators import BasicH5Configurator, NXGraphConfigurator
+from .configurators import BulkConfigurator
 from .error import PyNetSymError
\ No newline at end of file
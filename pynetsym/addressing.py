@@ -1,5 +1,6 @@
 import itertools
 import operator
+import weakref
 
 from pynetsym.error import PyNetSymError
 from pynetsym.util import encapsulate_global
@@ -20,6 +21,42 @@ get_root_address_book, \
 set_root_address_book = encapsulate_global('root', {})
 
 
+class AgentHandle(object):
+    """
+    A stable reference to the agent bound to an identifier.
+
+    The handle caches the agent, so that sending many messages to the
+    same agent does not resolve the identifier every time. The address
+    book that created the handle clears it when the identifier is
+    unregistered (e.g., because the agent is hibernated) and fills it
+    again when an agent is registered with the same identifier.
+
+    Handles refer to live agents: they should be kept in transient
+    attributes.
+    """
+    __slots__ = ('identifier', 'agent', '__weakref__')
+
+    def __init__(self, identifier, agent=None):
+        self.identifier = identifier
+        self.agent = agent
+
+    def resolve(self):
+        """
+        Return the agent bound to the identifier.
+
+        :raise AddressingError: if no agent is bound to the identifier.
+        """
+        agent = self.agent
+        if agent is None:
+            raise AddressingError(
+                "Could not find node with address %r." % self.identifier)
+        return agent
+
+    def __repr__(self):
+        return '<AgentHandle %r%s>' % (
+            self.identifier, '' if self.agent is not None else ' (unbound)')
+
+
 class AddressBook(object):
     """
     The Address book holds information on every agent in the system.
@@ -27,6 +64,9 @@ class AddressBook(object):
     An agent that is not in the AddressBook is virtually unreachable.
     """
 
+    def __init__(self):
+        self.handles = weakref.WeakValueDictionary()
+
     def register(self, agent, identifier):
         """
         Binds the identifier with the agent
@@ -57,6 +97,29 @@ class AddressBook(object):
         """
         raise NotImplementedError()
 
+    def handle(self, identifier):
+        """
+        Return the :class:`AgentHandle` for identifier.
+
+        Handles are shared: as long as a handle for identifier is alive,
+        the same object is returned. The identifier need not be bound.
+        """
+        handle = self.handles.get(identifier)
+        if handle is None:
+            try:
+                agent = self.resolve(identifier)
+            except AddressingError:
+                agent = None
+            handle = AgentHandle(identifier, agent)
+            self.handles[identifier] = handle
+        return handle
+
+    def _bind_handle(self, identifier, agent):
+        if self.handles:
+            handle = self.handles.get(identifier)
+            if handle is not None:
+                handle.agent = agent
+
     def list(self):
         """
         Returns a list with all the available agents.
@@ -81,6 +144,7 @@ class FlatAddressBook(AddressBook):
         """
         Creates the address book.
         """
+        super(FlatAddressBook, self).__init__()
         self.name_registry = {}
 
     def register(self, agent, identifier):
@@ -91,6 +155,7 @@ class FlatAddressBook(AddressBook):
                     agent, identifier))
         else:
             self.name_registry[identifier] = agent
+            self._bind_handle(identifier, agent)
 
     def unregister(self, identifier):
         try:
@@ -99,6 +164,7 @@ class FlatAddressBook(AddressBook):
             raise AddressingError(
                 "Could not remove not registered identifier %r" % (
                     identifier))
+        self._bind_handle(identifier, None)
 
     def resolve(self, identifier):
         try:
@@ -114,8 +180,75 @@ class FlatAddressBook(AddressBook):
         return self.name_registry.viewkeys()
 
 
+class IntAddressBook(AddressBook):
+    """
+    Address book for dense non negative integer identifiers.
+
+    Agents are kept in a list indexed by identifier, so that register,
+    unregister and resolve cost O(1) without hashing.
+    """
+
+    def __init__(self):
+        """
+        Creates the address book.
+        """
+        super(IntAddressBook, self).__init__()
+        self.agents = []
+        self.size = 0
+
+    def register(self, agent, identifier):
+        identifier = operator.index(identifier)
+        if identifier < 0:
+            raise AddressingError(
+                "Could not bind agent %r to negative identifier %r." % (
+                    agent, identifier))
+        agents = self.agents
+        if identifier >= len(agents):
+            agents.extend(
+                [None] * max(identifier + 1 - len(agents), len(agents)))
+        current = agents[identifier]
+        if current is None:
+            agents[identifier] = agent
+            self.size += 1
+            self._bind_handle(identifier, agent)
+        elif current is not agent:
+            raise AddressingError(
+                "Could not rebind agent %r to identifier %r." % (
+                    agent, identifier))
+
+    def unregister(self, identifier):
+        try:
+            if identifier < 0 or self.agents[identifier] is None:
+                raise IndexError(identifier)
+            self.agents[identifier] = None
+            self.size -= 1
+        except (IndexError, TypeError):
+            raise AddressingError(
+                "Could not remove not registered identifier %r" % (
+                    identifier))
+        self._bind_handle(identifier, None)
+
+    def resolve(self, identifier):
+        try:
+            agent = self.agents[identifier]
+        except (IndexError, TypeError):
+            agent = None
+        if agent is None or identifier < 0:
+            raise AddressingError(
+                "Could not find node with address %r." % identifier)
+        return agent
+
+    def list_iter(self):
+        return (identifier for identifier, agent in enumerate(self.agents)
+                if agent is not None)
+
+    def __len__(self):
+        return self.size
+
+
 class NamespacedAddressBook(AddressBook):
     def __init__(self, E={}, **F):
+        super(NamespacedAddressBook, self).__init__()
         self.namespaces = {}
         self.namespaces.update(E, **F)
 
@@ -155,6 +288,10 @@ class NamespacedAddressBook(AddressBook):
         address_book = self.resolve_namespace(namespace)
         address_book.unregister(*rest)
 
+    def handle(self, namespace, *rest):
+        address_book = self.resolve_namespace(namespace)
+        return address_book.handle(*rest)
+
     def list_iter(self):
         for namespace, ab in self.namespaces.iteritems():
             for identifier in ab.list():
@@ -163,25 +300,52 @@ class NamespacedAddressBook(AddressBook):
 
 # noinspection PyMethodOverriding
 class AutoResolvingAddressBook(NamespacedAddressBook):
+    """
+    Chooses the namespace from the identifier itself.
+
+    Resolvers are checked in order the first time an identifier of
+    a given type is seen; the result is cached by type, so checkers
+    must depend only on the type of the identifier.
+    """
     def __init__(self, E=None, **F):
         if not E:
             E = {}
         super(AutoResolvingAddressBook, self).__init__(E, **F)
         self.resolvers = []
+        self.address_books_by_type = {}
 
     def add_resolver(self, namespace, checker):
         self.resolvers.append((checker, namespace))
+        self.address_books_by_type.clear()
+
+    def register_namespace(self, namespace, address_book):
+        super(AutoResolvingAddressBook, self).register_namespace(
+            namespace, address_book)
+        self.address_books_by_type.clear()
+
+    def unregister_namespace(self, namespace):
+        super(AutoResolvingAddressBook, self).unregister_namespace(namespace)
+        self.address_books_by_type.clear()
 
     def resolve_identifier(self, identifier):
+        try:
+            return self.address_books_by_type[type(identifier)]
+        except KeyError:
+            pass
         for resolver_check, namespace in self.resolvers:
             if resolver_check(identifier):
-                return self.resolve_namespace(namespace)
+                address_book = self.resolve_namespace(namespace)
+                self.address_books_by_type[type(identifier)] = address_book
+                return address_book
         else:
             raise AddressingError(
                 "Could not find namespace for '%s'" % identifier)
 
     def resolve(self, identifier):
-        address_book = self.resolve_identifier(identifier)
+        try:
+            address_book = self.address_books_by_type[type(identifier)]
+        except KeyError:
+            address_book = self.resolve_identifier(identifier)
         return address_book.resolve(identifier)
 
     def register(self, agent, identifier):
@@ -192,6 +356,10 @@ class AutoResolvingAddressBook(NamespacedAddressBook):
         address_book = self.resolve_identifier(identifier)
         address_book.unregister(identifier)
 
+    def handle(self, identifier):
+        address_book = self.resolve_identifier(identifier)
+        return address_book.handle(identifier)
+
     def list_iter(self):
         return itertools.imap(operator.itemgetter(1),
                               super(AutoResolvingAddressBook, self).list_iter())
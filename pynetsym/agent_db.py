@@ -1,7 +1,16 @@
+import collections
+import sqlite3
+import struct
+import sys
+import time
+
+import gevent
 import numpy
 from traits.api import Interface, HasTraits, SingletonHasStrictTraits
-from traits.api import Instance, Module, Dict, Either, CInt, Str
-from traits.api import implements
+from traits.api import Instance, Module, Dict, Either, Int
+from traits.api import Callable, implements
+from traits import trait_types
+from traits.has_traits import TraitsVersion
 from pynetsym.error import PyNetSymError
 
 
@@ -9,9 +18,14 @@ __all__ = [
     "MissingNode",
     "ISerialize",
     "PythonPickler",
+    "SchemaPickler",
     "JSONPickler",
     "IAgentStorage",
-    "AgentDB"
+    "AgentDB",
+    "CachedAgentDB",
+    "LazyAgentDB",
+    "SQLiteStorage",
+    "SQLiteAgentDB",
 ]
 
 
@@ -61,6 +75,167 @@ class PythonPickler(SingletonHasStrictTraits):
         except TypeError as e:
             raise SerializationError(e)
 
+class _Schema(object):
+    """
+    Binary layout of the fixed-size traits of a class.
+
+    Bool, Int, Float (and their coercing variants) and Enum traits
+    with at most 256 constant values are packed with a struct; Enum
+    values are stored as their position.
+    """
+    CODES = (((trait_types.Bool, trait_types.CBool), '?'),
+             ((trait_types.Int, trait_types.CInt), 'q'),
+             ((trait_types.Float, trait_types.CFloat), 'd'))
+
+    def __init__(self, cls):
+        names = []
+        codes = []
+        self.enums = {}
+        class_traits = cls.class_traits(transient=lambda value: value is None)
+        for name, trait in sorted(class_traits.iteritems()):
+            code = self._code(name, trait.trait_type)
+            if code is not None:
+                names.append(name)
+                codes.append(code)
+        self.names = tuple(names)
+        self.struct = struct.Struct('<' + ''.join(codes))
+        self.enum_positions = [(position, self.enums[name])
+                               for position, name in enumerate(self.names)
+                               if name in self.enums]
+
+    def _code(self, name, trait_type):
+        for types, code in self.CODES:
+            if type(trait_type) in types:
+                return code
+        values = getattr(trait_type, 'values', None)
+        if (isinstance(trait_type, trait_types.BaseEnum)
+                and isinstance(values, (tuple, list))
+                and 0 < len(values) <= 256):
+            try:
+                positions = dict((value, position)
+                                 for position, value in enumerate(values))
+            except TypeError:
+                return None
+            self.enums[name] = tuple(values), positions
+            return 'B'
+
+    def pack(self, state):
+        values = [state.pop(name) for name in self.names]
+        for position, (_values, positions) in self.enum_positions:
+            values[position] = positions[values[position]]
+        return self.struct.pack(*values)
+
+    def unpack(self, data, offset):
+        values = self.struct.unpack_from(data, offset)
+        if self.enum_positions:
+            values = list(values)
+            for position, (enum_values, _positions) in self.enum_positions:
+                values[position] = enum_values[values[position]]
+        return zip(self.names, values)
+
+
+class SchemaPickler(SingletonHasStrictTraits):
+    """
+    Serializes traits objects using a per-class binary schema.
+
+    The fixed-size traits of the class (see :class:`_Schema`) are
+    packed in a binary record; the rest of the state is pickled.
+    If the record cannot be built (e.g., an integer does not fit in
+    64 bits) the whole object is pickled instead. Records of classes
+    that cannot be found by module and name (e.g., nested classes)
+    can be loaded only by the process that wrote them.
+    """
+    implements(ISerialize)
+    pickle_module = Module
+
+    _HEADER = struct.Struct('<BH')
+    _SCHEMA, _PICKLED = 0, 1
+
+    _schemas = Dict
+    _classes = Dict
+    _class_paths = Dict
+
+    def __init__(self):
+        try:
+            import cPickle as pickle_module
+        except ImportError:
+            import pickle as pickle_module
+        self.pickle_module = pickle_module
+
+    def _schema(self, cls):
+        try:
+            return self._schemas[cls]
+        except KeyError:
+            schema = self._schemas[cls] = _Schema(cls)
+            return schema
+
+    def _class(self, class_path):
+        try:
+            return self._classes[class_path]
+        except KeyError:
+            module_name, class_name = class_path.split(':')
+            module = __import__(module_name, fromlist=[class_name])
+            cls = getattr(module, class_name)
+            self._classes[class_path] = cls
+            return cls
+
+    def _class_path(self, cls):
+        try:
+            return self._class_paths[cls]
+        except KeyError:
+            pass
+        class_path = '%s:%s' % (cls.__module__, cls.__name__)
+        module = sys.modules.get(cls.__module__)
+        if getattr(module, cls.__name__, None) is not cls:
+            # e.g., a nested class: only this process can load it
+            class_path = '%s#%x' % (class_path, id(cls))
+            self._classes[class_path] = cls
+        self._class_paths[cls] = class_path
+        return class_path
+
+    def dumps(self, obj):
+        pickle_module = self.pickle_module
+        cls = type(obj)
+        class_path = self._class_path(cls)
+        try:
+            state = obj.__getstate__()
+            state.pop('__traits_version__', None)
+            packed = self._schema(cls).pack(state)
+            rest = pickle_module.dumps(state, pickle_module.HIGHEST_PROTOCOL)
+        except (AttributeError, KeyError, struct.error):
+            try:
+                return self._HEADER.pack(self._PICKLED, 0) + \
+                    pickle_module.dumps(obj, pickle_module.HIGHEST_PROTOCOL)
+            except (TypeError, pickle_module.PicklingError) as e:
+                raise SerializationError(e)
+        except TypeError as e:
+            raise SerializationError(e)
+        return ''.join((self._HEADER.pack(self._SCHEMA, len(class_path)),
+                        class_path, packed, rest))
+
+    def loads(self, pickled_representation):
+        data = pickled_representation
+        try:
+            kind, length = self._HEADER.unpack_from(data)
+            offset = self._HEADER.size
+            if kind == self._PICKLED:
+                return self.pickle_module.loads(data[offset:])
+            cls = self._class(data[offset:offset + length])
+            schema = self._schema(cls)
+            offset += length
+            fields = schema.unpack(data, offset)
+            state = self.pickle_module.loads(
+                data[offset + schema.struct.size:])
+        except (TypeError, ValueError, AttributeError, ImportError,
+                struct.error) as e:
+            raise SerializationError(e)
+        state.update(fields)
+        state['__traits_version__'] = TraitsVersion
+        obj = cls.__new__(cls)
+        obj.__setstate__(state)
+        return obj
+
+
 try:
     import jsonpickle
 except ImportError:
@@ -136,8 +311,7 @@ class AgentDB(HasTraits):
     implements(IAgentStorage)
 
     pickling_module = Instance(ISerialize, allow_none=False)
-    storage = Dict(key_trait=Either(CInt, Str),
-                   value_trait=Str, allow_none=False)
+    storage = Instance(collections.MutableMapping, allow_none=False)
 
     def __init__(self, pickling_module, storage):
         """
@@ -163,9 +337,482 @@ class AgentDB(HasTraits):
         s = self.pickling_module.dumps(node)
         self.storage[node.id] = s
 
+    def records(self, serializer):
+        """
+        Return a copy of the stored agents, as a dictionary from their
+        identifiers to their representations made by serializer (e.g.,
+        for a checkpoint). If serializer is the pickling module, the
+        stored representations are copied as they are.
+
+        :type serializer: :class:`ISerialize`
+        """
+        copy = getattr(self.storage, 'copy', None)
+        records = copy() if copy is not None else dict(self.storage)
+        if serializer is not self.pickling_module:
+            for identifier, data in records.iteritems():
+                records[identifier] = serializer.dumps(
+                    self.pickling_module.loads(data))
+        return records
+
+
+class SQLiteStorage(collections.MutableMapping):
+    """
+    Mapping from agent identifiers to pickled agents kept in an
+    SQLite file.
+
+    Writes are buffered and committed in a single transaction when
+    batch_size writes are pending or, at the latest, batch_seconds
+    after the first pending write (a timer greenlet commits the last
+    batch). Recently read values are kept in a small LRU cache. The
+    database uses write-ahead logging, so that commits do not block
+    readers.
+    """
+    _DELETED = object()
+
+    def __init__(self, path, batch_size=1000, batch_seconds=1.0,
+                 cache_size=1000):
+        """
+        :param path: the database file (':memory:' for a private
+            in-memory database)
+        :param batch_size: maximum number of writes in a transaction
+        :param batch_seconds: maximum time a write remains uncommitted
+        :param cache_size: number of read values that are cached
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS agents '
+            '(id PRIMARY KEY, state BLOB NOT NULL)')
+        self.connection.commit()
+        self._pending = {}
+        self._cache = collections.OrderedDict()
+        self._last_commit = time.time()
+        self._timer = None
+
+    def __getitem__(self, key):
+        value = self._pending.get(key)
+        if value is self._DELETED:
+            raise KeyError(key)
+        elif value is not None:
+            return value
+        try:
+            value = self._cache.pop(key)
+        except KeyError:
+            row = self.connection.execute(
+                'SELECT state FROM agents WHERE id = ?', (key, )).fetchone()
+            if row is None:
+                raise KeyError(key)
+            value = str(row[0])
+        self._cache_value(key, value)
+        return value
+
+    def _cache_value(self, key, value):
+        if self.cache_size:
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def __setitem__(self, key, value):
+        self._cache.pop(key, None)
+        self._pending[key] = value
+        self._maybe_flush()
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        self._pending[key] = self._DELETED
+        self._maybe_flush()
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __iter__(self):
+        self.flush()
+        cursor = self.connection.execute('SELECT id FROM agents')
+        return (row[0] for row in cursor.fetchall())
+
+    def __len__(self):
+        self.flush()
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM agents').fetchone()[0]
+
+    def copy(self):
+        """
+        Return a dictionary with all the stored values, read with a
+        single query.
+        """
+        self.flush()
+        return dict((key, str(value)) for key, value in
+                    self.connection.execute('SELECT id, state FROM agents'))
+
+    def _maybe_flush(self):
+        if (len(self._pending) >= self.batch_size or
+                time.time() - self._last_commit >= self.batch_seconds):
+            self.flush()
+        elif self._timer is None:
+            self._timer = gevent.spawn_later(
+                self.batch_seconds, self._timed_flush)
+
+    def _timed_flush(self):
+        self._timer = None
+        self.flush()
+
+    def flush(self):
+        """
+        Commits the pending writes.
+        """
+        if self._pending:
+            deleted = [(key, ) for key, value in self._pending.iteritems()
+                       if value is self._DELETED]
+            written = [(key, sqlite3.Binary(value))
+                       for key, value in self._pending.iteritems()
+                       if value is not self._DELETED]
+            with self.connection:
+                self.connection.executemany(
+                    'DELETE FROM agents WHERE id = ?', deleted)
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO agents (id, state) '
+                    'VALUES (?, ?)', written)
+            self._pending.clear()
+        self._last_commit = time.time()
+
+    def close(self):
+        """
+        Commits the pending writes and closes the database.
+        """
+        if self._timer is not None:
+            self._timer.kill(block=False)
+            self._timer = None
+        self.flush()
+        self.connection.close()
+
+
+class SQLiteAgentDB(AgentDB):
+    """
+    An :class:`AgentDB` whose agents are stored in an SQLite file
+    (see :class:`SQLiteStorage`), so that hibernated agents do not
+    use memory.
+
+    It can be used as agent_db_type directly or wrapped by a
+    :class:`CachedAgentDB`.
+    """
+    def __init__(self, pickling_module, path, batch_size=1000,
+                 batch_seconds=1.0, cache_size=1000):
+        """
+        :param pickling_module: something that is able to pickle Python
+            objects. Pickle interface expected (loads and dumps).
+        :param path: the database file
+        :param batch_size: see :class:`SQLiteStorage`
+        :param batch_seconds: see :class:`SQLiteStorage`
+        :param cache_size: see :class:`SQLiteStorage`
+        """
+        super(SQLiteAgentDB, self).__init__(
+            pickling_module,
+            SQLiteStorage(path, batch_size, batch_seconds, cache_size))
+
+    def commit(self):
+        """
+        Commits the pending writes (see :func:`SQLiteStorage.flush`).
+        """
+        self.storage.flush()
+
+    def close(self):
+        self.storage.close()
+
+
+def estimate_agent_size(agent):
+    """
+    Rough estimate of the memory used by agent, in bytes.
+
+    Only the agent and its attributes are considered, not the
+    objects they refer to.
+    """
+    return sys.getsizeof(agent) + sum(
+        sys.getsizeof(value) for value in vars(agent).itervalues())
+
+
+class CachedAgentDB(HasTraits):
+    """
+    Keeps recently stored agents alive in front of another agent storage.
+
+    Agents are serialized (i.e., stored in the wrapped storage) only
+    when they are evicted from the cache, so agents that hibernate and
+    are awakened frequently are never serialized. The least recently
+    stored agent is evicted when either budget is exceeded.
+    """
+    implements(IAgentStorage)
+
+    agent_db = Instance(IAgentStorage, allow_none=False)
+    max_agents = Either(None, Int)
+    max_bytes = Either(None, Int)
+    size_estimator = Callable(estimate_agent_size)
+
+    hits = Int(0)
+    misses = Int(0)
+    evictions = Int(0)
+    cached_bytes = Int(0)
+
+    _cache = Instance(collections.OrderedDict, args=())
+
+    def __init__(self, agent_db=None, max_agents=10000, max_bytes=None,
+                 size_estimator=estimate_agent_size,
+                 pickling_module=None, storage=None):
+        """
+        Creates a new CachedAgentDB.
+
+        :param agent_db: the storage where evicted agents are stored
+        :type agent_db: :class:`IAgentStorage`
+        :param max_agents: maximum number of cached agents (None
+            means no limit)
+        :param max_bytes: maximum estimated memory used by cached
+            agents (None means no limit)
+        :param size_estimator: function estimating the size of an agent
+        :param pickling_module: the serializer of the :class:`AgentDB`
+            created when agent_db is None (by default a
+            :class:`SchemaPickler`)
+        :param storage: the storage of that :class:`AgentDB` (by
+            default a dictionary)
+        """
+        if agent_db is None:
+            agent_db = AgentDB(
+                pickling_module=(SchemaPickler() if pickling_module is None
+                                 else pickling_module),
+                storage=dict() if storage is None else storage)
+        self.agent_db = agent_db
+        self.max_agents = max_agents
+        self.max_bytes = max_bytes
+        self.size_estimator = size_estimator
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, identifier):
+        return identifier in self._cache
+
+    def recover(self, identifier):
+        try:
+            agent, size = self._cache.pop(identifier)
+        except KeyError:
+            self.misses += 1
+            return self.agent_db.recover(identifier)
+        else:
+            self.hits += 1
+            self.cached_bytes -= size
+            return agent
+
+    def store(self, agent):
+        previous = self._cache.pop(agent.id, None)
+        if previous is not None:
+            self.cached_bytes -= previous[1]
+        size = self.size_estimator(agent) if self.max_bytes else 0
+        self._cache[agent.id] = agent, size
+        self.cached_bytes += size
+        self._evict()
+
+    def _over_budget(self):
+        return ((self.max_agents is not None and
+                 len(self._cache) > self.max_agents) or
+                (self.max_bytes is not None and
+                 self.cached_bytes > self.max_bytes))
+
+    def _evict(self):
+        while self._cache and self._over_budget():
+            _identifier, (agent, size) = self._cache.popitem(last=False)
+            self.cached_bytes -= size
+            self.agent_db.store(agent)
+            self.evictions += 1
+
+    def flush(self):
+        """
+        Stores every cached agent in the wrapped storage.
+        """
+        while self._cache:
+            _identifier, (agent, _size) = self._cache.popitem(last=False)
+            self.agent_db.store(agent)
+        self.cached_bytes = 0
+
+    def prefetch(self, identifiers):
+        """
+        Forwards the request for the agents that are not cached to the
+        wrapped storage, if it supports it.
+        """
+        prefetch = getattr(self.agent_db, 'prefetch', None)
+        if prefetch is not None:
+            cache = self._cache
+            missing = [identifier for identifier in identifiers
+                       if identifier not in cache]
+            if missing:
+                prefetch(missing)
+
+    def commit(self):
+        """
+        Forwards the request to the wrapped storage, if it supports it.
+        The cached agents are not stored.
+        """
+        commit = getattr(self.agent_db, 'commit', None)
+        if commit is not None:
+            commit()
+
+    def records(self, serializer):
+        """
+        Return the records of the wrapped storage (see
+        :func:`AgentDB.records`) together with the cached agents,
+        serialized with serializer; None if the wrapped storage does
+        not support it.
+        """
+        records = getattr(self.agent_db, 'records', None)
+        if records is None:
+            return None
+        records = records(serializer)
+        if records is not None:
+            for identifier, (agent, _size) in self._cache.iteritems():
+                records[identifier] = serializer.dumps(agent)
+        return records
+
+
+class LazyAgentDB(HasTraits):
+    """
+    Creates agents that were declared but never started.
+
+    Agents declared with :func:`LazyAgentDB.add_factory` are built the
+    first time they are recovered, i.e., when the first message
+    addressed to them is sent; afterwards they are stored and recovered
+    as usual by the wrapped storage. Only non negative integer
+    identifiers can be declared: for every one of them a small integer
+    is kept, so that a large network of nodes costs a few bytes per
+    node until its agents are actually needed.
+    """
+    implements(IAgentStorage)
+
+    agent_db = Instance(IAgentStorage, allow_none=False)
+
+    materialized = Int(0)
+
+    def __init__(self, agent_db):
+        """
+        Creates a new LazyAgentDB.
+
+        :param agent_db: the storage of the agents that were created
+        :type agent_db: :class:`IAgentStorage`
+        """
+        self.agent_db = agent_db
+        self._factories = []
+        self._pending = numpy.zeros(0, dtype=numpy.int32)
+
+    @property
+    def pending(self):
+        """
+        The number of declared agents that were not created yet.
+        """
+        return int(numpy.count_nonzero(self._pending))
+
+    def add_factory(self, identifiers, factory, parameters):
+        """
+        Declares the agents with the specified identifiers.
+
+        :param identifiers: the identifiers of the agents
+        :param factory: the callable creating each agent
+        :param parameters: the keyword arguments passed to factory
+        :type parameters: dict
+        """
+        identifiers = numpy.asarray(identifiers, dtype=numpy.int64)
+        if not len(identifiers):
+            return
+        if identifiers.min() < 0:
+            raise ValueError('Identifiers must be non negative.')
+        size = int(identifiers.max()) + 1
+        if size > len(self._pending):
+            grown = numpy.zeros(max(size, 2 * len(self._pending)),
+                                dtype=numpy.int32)
+            grown[:len(self._pending)] = self._pending
+            self._pending = grown
+        self._factories.append((factory, parameters))
+        # 0 means "not pending", hence the factories are numbered from 1
+        self._pending[identifiers] = len(self._factories)
+
+    def _pop_factory(self, identifier):
+        try:
+            if 0 <= identifier < len(self._pending):
+                index = self._pending[identifier]
+                if index:
+                    self._pending[identifier] = 0
+                    return self._factories[index - 1]
+        except TypeError:
+            pass
+        return None
+
+    def get_state(self):
+        """
+        Return the declarations of the agents that were not created yet
+        (e.g., for a checkpoint).
+        """
+        return dict(pending=self._pending.copy(),
+                    factories=list(self._factories))
+
+    def set_state(self, state):
+        """
+        Replaces the declarations with those returned by
+        :func:`LazyAgentDB.get_state`.
+        """
+        self._pending = state['pending'].copy()
+        self._factories = list(state['factories'])
+
+    def recover(self, identifier):
+        try:
+            return self.agent_db.recover(identifier)
+        except MissingNode:
+            specification = self._pop_factory(identifier)
+            if specification is None:
+                raise
+            factory, parameters = specification
+            self.materialized += 1
+            return factory(**parameters)
+
+    def store(self, agent):
+        self.agent_db.store(agent)
+
+    def prefetch(self, identifiers):
+        """
+        Forwards the request to the wrapped storage, if it supports it.
+        """
+        prefetch = getattr(self.agent_db, 'prefetch', None)
+        if prefetch is not None:
+            prefetch(identifiers)
+
+    def commit(self):
+        """
+        Forwards the request to the wrapped storage, if it supports it.
+        """
+        commit = getattr(self.agent_db, 'commit', None)
+        if commit is not None:
+            commit()
+
+    def records(self, serializer):
+        """
+        Forwards the request to the wrapped storage, if it supports it
+        (otherwise None is returned). Agents that were declared but
+        not created are not included.
+        """
+        records = getattr(self.agent_db, 'records', None)
+        if records is None:
+            return None
+        return records(serializer)
+
+
 try:
     import jsonpickle
-    from pymongo import MongoClient
+    from pymongo import MongoClient, UpdateOne
 except ImportError:
     pass
 else:
@@ -187,15 +834,59 @@ else:
             '--dbpath', dbfile])
         return p
 
+    _mongo_clients = {}
+
+    def get_mongo_client(host=None, port=None):
+        """
+        Return a MongoClient shared by all the callers using the
+        same host and port.
+
+        Every MongoClient keeps its own connection pool, so agents
+        should share one instead of creating their own.
+        """
+        try:
+            return _mongo_clients[host, port]
+        except KeyError:
+            client = _mongo_clients[host, port] = MongoClient(host, port)
+            return client
+
     class MongoAgentDB(HasTraits):
+        """
+        Stores agents in a MongoDB collection.
+
+        Stores are buffered and written with a single unordered bulk
+        operation when batch_size agents are pending or batch_seconds
+        have elapsed since the last write: a timer flushes the agents
+        stored after the last write, even if no other store arrives.
+        Agents that are about to be awakened can be loaded with a
+        single query using :meth:`prefetch`.
+        """
         implements(IAgentStorage)
 
         db_name = 'pynetsym_agents'
 
-        def __init__(self):
-            self.client = MongoClient()
-            self.client.drop_database(self.db_name)
+        def __init__(self, client=None, db_name=None, drop=True,
+                     batch_size=1000, batch_seconds=1.0):
+            """
+            :param client: the MongoClient to use; if None the one
+                returned by :func:`get_mongo_client` is used
+            :param db_name: the database name
+            :param drop: whether the database is dropped first
+            :param batch_size: maximum number of buffered stores
+            :param batch_seconds: maximum time a store is buffered
+            """
+            self.client = get_mongo_client() if client is None else client
+            if db_name is not None:
+                self.db_name = db_name
+            if drop:
+                self.client.drop_database(self.db_name)
             self.agents_db = self.client[self.db_name].agents
+            self.batch_size = batch_size
+            self.batch_seconds = batch_seconds
+            self._pending = {}
+            self._prefetched = {}
+            self._last_flush = time.time()
+            self._timer = None
 
         def _mktypename(self, obj):
             cls = type(obj)
@@ -206,21 +897,73 @@ else:
             state = node.__getstate__()
             del state['__traits_version__']
             state['__agenttype__'] = self._mktypename(node)
-            self.agents_db.update(
-                    dict(_id=node.id),
-                    {'$set': state},
-                    upsert=True)
+            self._prefetched.pop(node.id, None)
+            self._pending[node.id] = state
+            if (len(self._pending) >= self.batch_size or
+                    time.time() - self._last_flush >= self.batch_seconds):
+                self.flush()
+            elif self._timer is None:
+                self._timer = gevent.spawn_later(
+                    self.batch_seconds, self._timed_flush)
+
+        def _timed_flush(self):
+            self._timer = None
+            self.flush()
+
+        def flush(self):
+            """
+            Writes the buffered agents.
+            """
+            if self._pending:
+                self.agents_db.bulk_write(
+                    [UpdateOne(dict(_id=identifier), {'$set': state},
+                               upsert=True)
+                     for identifier, state in self._pending.iteritems()],
+                    ordered=False)
+                self._pending.clear()
+            self._last_flush = time.time()
+
+        def commit(self):
+            """
+            Writes the buffered agents (see :func:`flush`).
+            """
+            self.flush()
+
+        def close(self):
+            """
+            Writes the buffered agents and stops the timer. The client
+            is not closed, as it may be shared.
+            """
+            if self._timer is not None:
+                self._timer.kill(block=False)
+                self._timer = None
+            self.flush()
+
+        def prefetch(self, identifiers):
+            """
+            Loads the stored agents among identifiers with a single query,
+            so that recovering them does not require a round trip.
+
+            :param identifiers: the identifiers of the agents
+            """
+            missing = [int(identifier) for identifier in identifiers
+                       if int(identifier) not in self._pending and
+                       int(identifier) not in self._prefetched]
+            if missing:
+                for state in self.agents_db.find({'_id': {'$in': missing}}):
+                    self._prefetched[state['_id']] = state
 
         def recover(self, identifier):
             identifier = int(identifier)
-            state = self.agents_db.find_one({'_id': identifier})
+            if identifier in self._pending:
+                state = dict(self._pending[identifier])
+            else:
+                state = self._prefetched.pop(identifier, None)
+                if state is None:
+                    state = self.agents_db.find_one({'_id': identifier})
+                if state is None:
+                    raise MissingNode(identifier)
+                del state['_id']
             agent_type = \
                 jsonpickle.unpickler.loadclass(state.pop('__agenttype__'))
-            del state['_id']
             return agent_type(**state)
-
-
-
-
-
-
@@ -0,0 +1,469 @@
+"""
+Checkpoints of running simulations.
+
+A checkpoint is a directory holding the graph (graph.npz, in the
+format of :mod:`pynetsym.graph.snapshot`) and the rest of the state
+(state.pickle): the simulation parameters, every node (serialized
+with the serializer of the agent db), the messages waiting in the
+mailboxes, the state of the activator, of the clock, of the
+termination checker and of the additional agents, the
+:class:`pynetsym.node_state.NodeStateStore` and the states of the
+random and numpy.random generators.
+
+The state of an agent is consistent only when it is not processing a
+message (see :func:`pynetsym.core.busy_agents`), hence checkpoints are
+taken between two ticks, as soon as the activations of the previous
+tick are over. The state of agents other than nodes is their
+dictionary, without the values that cannot be pickled; agents can
+customize it defining get_state and set_state methods (as
+:class:`pynetsym.termination.TerminationChecker` does)::
+
+    class Simulation(pynetsym.Simulation):
+        checkpointer_type = PeriodicCheckpointer
+        checkpointer_parameters = dict(path='sir.checkpoint',
+                                       interval=600)
+
+    # after a crash
+    Simulation().resume('sir.checkpoint')
+"""
+
+import collections
+import itertools
+import os
+import random
+import shutil
+import time
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import gevent
+from gevent import event
+import numpy as np
+from traits.api import HasTraits, Instance, Str, Float, Int
+
+from pynetsym import addressing
+from pynetsym import core
+from pynetsym.agent_db import LazyAgentDB, MissingNode, SchemaPickler
+from pynetsym.configurators.basic import AbstractConfigurator
+from pynetsym.error import PyNetSymError
+from pynetsym.graph import snapshot as snapshot_module
+from pynetsym.node_manager import NodeManager
+from pynetsym.nodes import Node
+from pynetsym.util import picklable_sub_dictionary
+from pynetsym.util.component_builder import ComponentBuilder
+
+
+__all__ = [
+    'Checkpoint',
+    'CheckpointError',
+    'PeriodicCheckpointer',
+    'capture',
+    'read',
+    'restore',
+    'restore_graph',
+    'write',
+]
+
+
+GRAPH_FILE = 'graph.npz'
+STATE_FILE = 'state.pickle'
+
+# hibernated nodes are pickled in pieces, so that a background writer
+# releases control
+_RECORDS_PER_PICKLE = 10000
+
+# agents whose state is rebuilt by the simulation
+_NOT_SAVED = (core.Logger, NodeManager, AbstractConfigurator)
+
+
+class CheckpointError(PyNetSymError):
+    pass
+
+
+Checkpoint = collections.namedtuple('Checkpoint', 'snapshot state')
+
+
+def _agent_dbs(agent_db):
+    while agent_db is not None:
+        yield agent_db
+        agent_db = getattr(agent_db, 'agent_db', None)
+
+
+def _serializer(agent_db):
+    for db in _agent_dbs(agent_db):
+        pickling_module = getattr(db, 'pickling_module', None)
+        if pickling_module is not None:
+            return pickling_module
+    return SchemaPickler()
+
+
+def _lazy_agent_db(agent_db):
+    for db in _agent_dbs(agent_db):
+        if isinstance(db, LazyAgentDB):
+            return db
+    return None
+
+
+def wait_until_idle(max_pause):
+    """
+    Releases control until no agent is processing a message, except
+    the agent running in the current greenlet (if any).
+
+    :param max_pause: the maximum number of seconds to wait
+    :return: whether the agents are idle
+    """
+    current = gevent.getcurrent()
+    deadline = time.time() + max_pause
+    while 1:
+        if all(agent._greenlet is current for agent in core.busy_agents()):
+            return True
+        if time.time() >= deadline:
+            return False
+        gevent.sleep(0.001)
+
+
+def wait_until_quiet(simulation, max_pause):
+    """
+    Releases control until no agent of simulation is processing a
+    message or has messages waiting in its mailbox (except the agent
+    running in the current greenlet, if any).
+
+    :param max_pause: the maximum number of seconds to wait
+    :return: whether the agents are quiet
+    """
+    current = gevent.getcurrent()
+    deadline = time.time() + max_pause
+    address_book = simulation.address_book
+    while 1:
+        if all(agent._greenlet is current
+               for agent in core.busy_agents()):
+            agents = (address_book.resolve(identifier)
+                      for identifier in list(address_book.list_iter()))
+            if not any(agent._default_queue.qsize() for agent in agents
+                       if agent._greenlet is not current):
+                return True
+        if time.time() >= deadline:
+            return False
+        gevent.sleep(0.001)
+
+
+def _recover_hibernated(graph, agent_db, serializer, resident, lazy):
+    # for agent dbs that cannot copy their records (see
+    # pynetsym.agent_db.AgentDB.records)
+    pending = lazy['pending'] if lazy is not None else ()
+    hibernated = {}
+    for node in graph:
+        if node in resident or (node < len(pending) and pending[node]):
+            continue
+        try:
+            agent = agent_db.recover(node)
+        except MissingNode:
+            continue
+        hibernated[node] = serializer.dumps(agent)
+        agent_db.store(agent)
+    return hibernated
+
+
+def capture(simulation, max_pause=10.0):
+    """
+    Return a checkpoint of the running simulation, kept in memory.
+
+    The hibernated nodes are copied as they are stored by the agent db,
+    if it supports it (see :func:`pynetsym.agent_db.AgentDB.records`),
+    so that they are neither recovered nor serialized again.
+
+    :param max_pause: the maximum number of seconds to wait for the
+        agents to finish processing their messages
+    :raise CheckpointError: if the agents are still busy after
+        max_pause seconds
+    :rtype: Checkpoint
+    """
+    if not wait_until_idle(max_pause):
+        raise CheckpointError(
+            'Agents still busy after %s seconds.' % max_pause)
+    graph = simulation.graph
+    snapshot = snapshot_module.take(graph)
+    snapshot = snapshot._replace(indptr=np.array(snapshot.indptr),
+                                 indices=np.array(snapshot.indices))
+    agent_db = simulation.agent_db
+    serializer = _serializer(agent_db)
+
+    resident = {}
+    agents = {}
+    mailboxes = {}
+    address_book = simulation.address_book
+    for identifier in list(address_book.list_iter()):
+        agent = address_book.resolve(identifier)
+        if isinstance(agent, Node):
+            resident[identifier] = serializer.dumps(agent)
+        elif isinstance(agent, _NOT_SAVED):
+            continue
+        elif hasattr(agent, 'get_state'):
+            agents[identifier] = agent.get_state()
+        else:
+            state = agent.__getstate__()
+            state.pop('__traits_version__', None)
+            agents[identifier] = picklable_sub_dictionary(
+                state, exclude=(graph, ))
+        messages = [tuple(message)
+                    for message, _result in agent._default_queue.queue]
+        if messages:
+            mailboxes[identifier] = messages
+
+    lazy_agent_db = _lazy_agent_db(agent_db)
+    lazy = lazy_agent_db.get_state() if lazy_agent_db is not None else None
+    records = getattr(agent_db, 'records', None)
+    hibernated = records(serializer) if records is not None else None
+    if hibernated is None:
+        hibernated = _recover_hibernated(graph, agent_db, serializer,
+                                         resident, lazy)
+
+    store = simulation.node_state_store
+    state = dict(
+        graph_type=type(graph),
+        parameters=picklable_sub_dictionary(
+            simulation.get_parameters(), exclude=(graph, )),
+        resident=resident,
+        hibernated=hibernated,
+        lazy=lazy,
+        agents=agents,
+        mailboxes=mailboxes,
+        node_state_store=store.get_state() if store is not None else None,
+        random=random.getstate(),
+        numpy_random=np.random.get_state())
+    return Checkpoint(snapshot, state)
+
+
+def write(path, checkpoint, cooperate=False):
+    """
+    Writes checkpoint in the directory path.
+
+    The checkpoint is written in a temporary directory first, so that
+    a crash while writing does not damage the previous checkpoint. The
+    hibernated nodes are pickled in pieces after the rest of the state.
+
+    :param cooperate: release control while writing the state
+    """
+    path = os.path.abspath(path)
+    temporary = path + '.tmp'
+    if os.path.exists(temporary):
+        shutil.rmtree(temporary)
+    os.makedirs(temporary)
+    snapshot = checkpoint.snapshot
+    snapshot_module.write(
+        os.path.join(temporary, GRAPH_FILE), snapshot.indptr,
+        snapshot.indices, snapshot.nodes, snapshot.directed)
+    state = dict(checkpoint.state)
+    hibernated = state.pop('hibernated')
+    with open(os.path.join(temporary, STATE_FILE), 'wb') as state_file:
+        pickle.dump(state, state_file, pickle.HIGHEST_PROTOCOL)
+        records = hibernated.iteritems()
+        while 1:
+            if cooperate:
+                gevent.sleep()
+            piece = list(itertools.islice(records, _RECORDS_PER_PICKLE))
+            # the empty piece marks the end
+            pickle.dump(piece, state_file, pickle.HIGHEST_PROTOCOL)
+            if not piece:
+                break
+    previous = path + '.old'
+    if os.path.exists(path):
+        if os.path.exists(previous):
+            shutil.rmtree(previous)
+        os.rename(path, previous)
+        os.rename(temporary, path)
+        shutil.rmtree(previous)
+    else:
+        os.rename(temporary, path)
+
+
+def read(path):
+    """
+    Reads the checkpoint in the directory path.
+
+    If path does not exist but the previous checkpoint does (i.e.,
+    :func:`write` was interrupted while replacing it), the previous
+    checkpoint is read.
+
+    :rtype: Checkpoint
+    """
+    if not os.path.isdir(path) and os.path.isdir(path + '.old'):
+        path = path + '.old'
+    snapshot = snapshot_module.read(os.path.join(path, GRAPH_FILE))
+    with open(os.path.join(path, STATE_FILE), 'rb') as state_file:
+        state = pickle.load(state_file)
+        hibernated = {}
+        while 1:
+            piece = pickle.load(state_file)
+            if not piece:
+                break
+            hibernated.update(piece)
+        state['hibernated'] = hibernated
+    return Checkpoint(snapshot, state)
+
+
+def restore_graph(simulation, checkpoint):
+    """
+    Return the graph of checkpoint.
+
+    Graph types with a from_snapshot class method are rebuilt from the
+    snapshot. Graphs whose topology is read only and lives in its own
+    file (graph types with a true file_backed attribute, e.g.,
+    :class:`pynetsym.graph.BasicH5Graph`) are built as usual with the
+    graph component and the parameters of simulation (see
+    :func:`pynetsym.simulation.Simulation.setup`) and the nodes of the
+    checkpoint are added again.
+
+    :raise CheckpointError: if the graph can be restored in neither way
+    """
+    graph_type = checkpoint.state['graph_type']
+    from_snapshot = getattr(graph_type, 'from_snapshot', None)
+    if from_snapshot is not None:
+        try:
+            return from_snapshot(checkpoint.snapshot)
+        except NotImplementedError:
+            pass
+    if not getattr(graph_type, 'file_backed', False):
+        raise CheckpointError(
+            'Cannot restore a %s from a checkpoint.' % graph_type.__name__)
+    graph = ComponentBuilder(simulation, 'graph').build(
+        simulation.get_parameters())
+    if len(checkpoint.snapshot.nodes):
+        graph.add_nodes(len(checkpoint.snapshot.nodes))
+    return graph
+
+
+def restore(simulation, checkpoint, random_state=True, nodes_only=False):
+    """
+    Restores the agents, the nodes and the random generators of
+    checkpoint in simulation.
+
+    The graph, the service agents, the activator and the clock of
+    simulation must have been created (and the node manager started),
+    but the simulation must not be running yet (see
+    :func:`pynetsym.simulation.Simulation.resume`).
+
+    :param random_state: whether the states of the random generators
+        are restored too
+    :param nodes_only: restore only the nodes (with their messages),
+        the state of the agent db and the node state store, leaving
+        the service and simulation agents (e.g., the activator, the
+        clock and the termination checker) as they are
+    """
+    state = checkpoint.state
+    agent_db = simulation.agent_db
+    serializer = _serializer(agent_db)
+    address_book = simulation.address_book
+
+    if (state['node_state_store'] is not None and
+            simulation.node_state_store is not None):
+        simulation.node_state_store.set_state(state['node_state_store'])
+    lazy_agent_db = _lazy_agent_db(agent_db)
+    if state['lazy'] is not None and lazy_agent_db is not None:
+        lazy_agent_db.set_state(state['lazy'])
+    resident = state['resident']
+    for identifier, data in state['hibernated'].iteritems():
+        # records of nodes that were awake may be stale
+        if identifier not in resident:
+            agent_db.store(serializer.loads(data))
+
+    agents = {} if nodes_only else state['agents']
+    for identifier, agent_state in agents.iteritems():
+        try:
+            agent = address_book.resolve(identifier)
+        except addressing.AddressingError:
+            continue
+        if hasattr(agent, 'set_state'):
+            agent.set_state(agent_state)
+        else:
+            agent.trait_set(**agent_state)
+    for identifier, data in state['resident'].iteritems():
+        serializer.loads(data).start(address_book, agent_db, identifier)
+    for identifier, messages in state['mailboxes'].iteritems():
+        if nodes_only and identifier not in state['resident']:
+            continue
+        try:
+            agent = address_book.resolve(identifier)
+        except addressing.AddressingError:
+            continue
+        for message in messages:
+            agent.deliver(core.Message(*message), event.AsyncResult())
+
+    if random_state:
+        random.setstate(state['random'])
+        np.random.set_state(state['numpy_random'])
+
+
+class PeriodicCheckpointer(HasTraits):
+    """
+    Writes a checkpoint of the simulation every interval seconds.
+
+    The checkpointer is called by the clock before every tick (see
+    :func:`pynetsym.simulation.BaseClock.register_callback`). When a
+    checkpoint is due, the simulation waits for the agents to finish
+    processing their messages, at most max_pause seconds (otherwise
+    the checkpoint is postponed to the next tick); then the state is
+    captured in memory and written by a background greenlet while the
+    simulation goes on. The pauses (in seconds) of the last
+    checkpoints are kept in pauses.
+    """
+    path = Str
+    interval = Float(600.0)
+    max_pause = Float(1.0)
+
+    checkpoints = Int(0)
+    postponed = Int(0)
+    pauses = Instance(collections.deque)
+
+    def __init__(self, path, interval=600.0, max_pause=1.0, max_samples=100):
+        """
+        :param path: the directory of the checkpoint
+        :param interval: seconds between two checkpoints
+        :param max_pause: the maximum number of seconds to wait for
+            the agents before postponing a checkpoint
+        :param max_samples: how many pauses are kept
+        """
+        self.path = path
+        self.interval = interval
+        self.max_pause = max_pause
+        self.pauses = collections.deque(maxlen=max_samples)
+        self.simulation = None
+        self._last = time.time()
+        self._writer = None
+
+    def attach(self, simulation):
+        """
+        Starts checkpointing simulation at the ticks of its clock.
+        """
+        self.simulation = simulation
+        self._last = time.time()
+        simulation.clock.register_callback(self.tick)
+
+    def tick(self, _tick):
+        if time.time() - self._last < self.interval:
+            return
+        if self._writer is not None and not self._writer.ready():
+            return
+        start = time.time()
+        try:
+            checkpoint = capture(self.simulation, self.max_pause)
+        except CheckpointError:
+            self.postponed += 1
+            return
+        self._last = time.time()
+        self.pauses.append(self._last - start)
+        self._writer = gevent.spawn(self._write, checkpoint)
+
+    def _write(self, checkpoint):
+        write(self.path, checkpoint, cooperate=True)
+        self.checkpoints += 1
+
+    def join(self):
+        """
+        Waits until the checkpoint being written (if any) is on disk.
+        """
+        if self._writer is not None:
+            self._writer.get()
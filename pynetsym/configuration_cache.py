@@ -0,0 +1,161 @@
+"""
+Cache of configured networks.
+
+Configuring the network (see :class:`pynetsym.configurators.AbstractConfigurator`)
+sends a message for every node and for every edge. Parameter sweeps and
+replicates often start from the very same configuration: a
+:class:`ConfigurationCache` stores the configured network the first
+time (with the format of :mod:`pynetsym.checkpoint`) and the later
+simulations restore it in bulk, skipping the configuration::
+
+    cache = ConfigurationCache('configurations')
+
+    class Simulation(pynetsym.Simulation):
+        configuration_cache = cache
+
+The entries are keyed by the configurator class, the node class, the
+graph class and the values of the options of the configurator (and of
+the nodes it creates). Configurations whose options cannot be pickled
+are not cached.
+
+Only the graph, the nodes, the agent db and the node state store are
+restored: the service and simulation agents (e.g., the activator, the
+clock and the termination checker) are those of the simulation
+restoring the entry, and the messages the configuration sent them are
+not delivered again.
+
+.. warning::
+    the random generators are not advanced by a cached configuration,
+    and configurators drawing random numbers produce the same network
+    for all the simulations sharing an entry.
+"""
+
+import copy
+import hashlib
+import os
+import shutil
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from traits.api import HasTraits, Dict, Either, Int, Str
+
+from pynetsym import checkpoint
+from pynetsym.util import gather_from_ancestors
+
+
+__all__ = [
+    'ConfigurationCache',
+    'configuration_key',
+]
+
+
+def _qualified_name(cls):
+    if cls is None:
+        return None
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+def configuration_key(simulation):
+    """
+    Return the key of the configuration of simulation, or None if the
+    values of the options cannot be pickled.
+
+    :rtype: str
+    """
+    configurator_type = simulation.configurator_type
+    options = gather_from_ancestors(configurator_type, 'options', set)
+    options.discard('full_parameters')
+    options.update(getattr(configurator_type, 'node_options', None) or ())
+    parameters = simulation.get_parameters()
+    values = [(name, parameters.get(name)) for name in sorted(options)]
+    description = (
+        _qualified_name(configurator_type),
+        _qualified_name(getattr(configurator_type, 'node_type', None)),
+        _qualified_name(simulation.graph_type),
+        getattr(configurator_type, 'lazy_nodes', False),
+        values)
+    try:
+        data = pickle.dumps(description, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError):
+        return None
+    return hashlib.sha1(data).hexdigest()
+
+
+class ConfigurationCache(HasTraits):
+    """
+    Stores configured networks, in the directory path or, if path is
+    None, in memory (to be shared by the simulations of a single
+    process).
+    """
+    path = Either(None, Str)
+    hits = Int(0)
+    misses = Int(0)
+    entries = Dict(transient=True)
+
+    def __init__(self, path=None):
+        """
+        :param path: the directory of the entries
+        """
+        super(ConfigurationCache, self).__init__(path=path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, simulation):
+        """
+        Return the configuration of simulation, if cached.
+
+        :rtype: :class:`pynetsym.checkpoint.Checkpoint` | None
+        """
+        key = configuration_key(simulation)
+        if key is None:
+            return None
+        if self.path is None:
+            cached = self.entries.get(key)
+            if cached is not None:
+                # graphs, stores and agent dbs may use the arrays of the
+                # entry as they are and modify them
+                cached = copy.deepcopy(cached)
+        elif os.path.isdir(self._entry_path(key)):
+            cached = checkpoint.read(self._entry_path(key))
+        else:
+            cached = None
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def store(self, simulation, max_pause=10.0):
+        """
+        Stores the configuration of simulation, which has just been
+        configured.
+
+        The messages of the configuration are processed first, so that
+        they are not processed again by the simulations restoring it;
+        if they are not over after max_pause seconds, the messages
+        still waiting are stored with the configuration.
+
+        :param max_pause: the maximum number of seconds to wait for the
+            agents to process the messages of the configuration
+        """
+        key = configuration_key(simulation)
+        if key is None:
+            return
+        checkpoint.wait_until_quiet(simulation, max_pause)
+        configuration = checkpoint.capture(simulation, max_pause)
+        if self.path is None:
+            self.entries[key] = configuration
+        else:
+            checkpoint.write(self._entry_path(key), configuration)
+
+    def clear(self):
+        """
+        Removes all the entries.
+        """
+        self.entries.clear()
+        if self.path is not None and os.path.isdir(self.path):
+            shutil.rmtree(self.path)
@@ -4,6 +4,15 @@ __all__ = (
     'AbstractConfigurator',
     'BasicConfigurator',
     'BasicH5Configurator',
+    'AbstractBulkConfigurator',
+    'BulkConfigurator',
+    'GeneratorConfigurator',
+    'GNMConfigurator',
+    'GNPConfigurator',
+    'RingLatticeConfigurator',
+    'WattsStrogatzConfigurator',
+    'BarabasiAlbertConfigurator',
+    'ConfigurationModelConfigurator',
     'NXGraphConfigurator'
 )
 
@@ -12,5 +21,10 @@ from .interface import IConfigurator
 from .basic import AbstractConfigurator, BasicConfigurator
 from .h5_configurator import BasicH5Configurator
 from .nx_configurator import NXGraphConfigurator
+from .bulk_configurator import AbstractBulkConfigurator, BulkConfigurator
+from .generator_configurators import (
+    GeneratorConfigurator, GNMConfigurator, GNPConfigurator,
+    RingLatticeConfigurator, WattsStrogatzConfigurator,
+    BarabasiAlbertConfigurator, ConfigurationModelConfigurator)
 
 
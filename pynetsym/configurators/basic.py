@@ -2,7 +2,7 @@ from traits.has_traits import implements
 from traits.trait_types import Dict, Str, Int, Any, Type, Set, false
 
 from .. import core
-from ..util import extract_sub_dictionary, SequenceAsyncResult
+from ..util import extract_sub_dictionary
 from ..node_manager import NodeManager
 from .interface import IConfigurator
 
@@ -21,6 +21,13 @@ class AbstractConfigurator(core.Agent):
     node_identifiers = Any
     full_parameters = Dict(key_trait=Str)
 
+    lazy_nodes = false
+    """
+    If true, node agents are created only when they receive their first
+    message (see :func:`NodeManager.declare_nodes`). Initializing the
+    nodes creates them all.
+    """
+
     def _start(self):
         self.create_nodes()
         self.create_edges()
@@ -32,6 +39,19 @@ class AbstractConfigurator(core.Agent):
     def create_edges(self):
         raise NotImplementedError()
 
+    def create_node_agents(self, how_many):
+        """
+        Asks the :class:`NodeManager` to create how_many nodes of type
+        node_type with parameters node_arguments.
+
+        :return: the identifiers of the nodes
+        """
+        return self.sync_send(
+            NodeManager.name,
+            'declare_nodes' if self.lazy_nodes else 'create_nodes',
+            cls=self.node_type, how_many=how_many,
+            parameters=self.node_arguments)
+
     def do_initialize(self):
         for identifier in self.node_identifiers:
             self.send(identifier, 'initialize')
@@ -63,8 +83,5 @@ class BasicConfigurator(AbstractConfigurator):
     def create_nodes(self):
         self.node_arguments = extract_sub_dictionary(
                 self.full_parameters, self.node_options)
-        node_ids = SequenceAsyncResult(
-            [self.send(NodeManager.name, 'create_node',
-                       cls=self.node_type, parameters=self.node_arguments)
-            for _r in xrange(self.starting_network_size)])
-        self.node_identifiers = node_ids.get()
\ No newline at end of file
+        self.node_identifiers = self.create_node_agents(
+            self.starting_network_size)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+from traits.api import Any, Bool, Either, Instance, Int, Str, Type
+
+from pynetsym.graph import IGraph, snapshot
+from pynetsym.util import extract_sub_dictionary
+from .basic import AbstractConfigurator
+
+
+_MASK = (1 << 64) - 1
+
+
+def _edge_hashes(sources, targets):
+    # uint64 arithmetic wraps around
+    hashes = (sources.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) ^
+              targets.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F))
+    hashes ^= hashes >> np.uint64(29)
+    return hashes * np.uint64(0x94D049BB133111EB)
+
+
+class AbstractBulkConfigurator(AbstractConfigurator):
+    """
+    Sets up a network adding the edges straight to the graph, chunk_size
+    edges at a time (see :func:`pynetsym.graph.IGraph.add_edge_chunks`),
+    instead of sending an 'accept_link' message per edge.
+
+    Subclasses create the nodes and define edge_chunks.
+
+    Nodes are not told about their links, unless node_type has an
+    edges_loaded method: then every node receives an 'edges_loaded'
+    message when all the edges are in the graph, and the configuration
+    ends when they have all processed it.
+    """
+
+    options = {'graph'}
+
+    graph = Instance(IGraph)
+
+    chunk_size = Int(1 << 16)
+
+    node_type = Type
+    node_options = Instance(set)
+
+    def create_edges(self):
+        """
+        Adds the edges to the graph.
+        """
+        self.graph.add_edge_chunks(self._cooperating(self.edge_chunks()))
+        if hasattr(self.node_type, 'edges_loaded'):
+            # the messages are processed concurrently: only their end
+            # is awaited
+            self.sync_send_all(self.node_identifiers, 'edges_loaded')
+
+    def _cooperating(self, chunks):
+        for chunk in chunks:
+            yield chunk
+            self.cooperate()
+
+    def edge_chunks(self):
+        """
+        Yields the edges in chunks, as pairs of arrays (sources, targets)
+        of node identifiers.
+        """
+        raise NotImplementedError()
+
+
+class BulkConfigurator(AbstractBulkConfigurator):
+    """
+    Sets up a network from a starting network, adding its edges straight
+    to the graph (see :class:`AbstractBulkConfigurator`).
+
+    The `starting_network` option is either a NetworkX graph or the path
+    of a file:
+
+        1. snapshots (.npz or HDF5 files, see
+           :mod:`pynetsym.graph.snapshot`);
+        2. text edge lists, whose name ends in one of text_extensions,
+           with an edge per line: the first two columns (separated by
+           delimiter, whitespace if None) are the nodes and lines
+           starting with '#' are comments. If the graph is undirected
+           and the file lists every edge in both directions (as many
+           SNAP data sets do), only the lines with source <= target
+           are loaded.
+
+    Files are streamed, so that the memory used does not depend on the
+    number of edges; their nodes are the integers from 0 to the
+    largest node in the file (or, for snapshots, the nodes it stores).
+    """
+
+    options = {'starting_network'}
+
+    starting_network = Any
+
+    delimiter = Either(None, Str)
+    symmetric_text = Bool(False)
+    text_extensions = ('.txt', '.edges', '.edgelist', '.csv', '.tsv')
+
+    def create_nodes(self):
+        self.node_arguments = extract_sub_dictionary(
+            self.full_parameters, self.node_options)
+        network = self.starting_network
+        if isinstance(network, nx.Graph):
+            labels = network.nodes()
+            identifiers = self.create_node_agents(len(labels))
+            self.node_map = dict(itertools.izip(labels, identifiers))
+        else:
+            if self._is_text(network):
+                size, symmetric = self._scan_text(network)
+                self.symmetric_text = (
+                    symmetric and not self.graph.is_directed())
+                labels = np.arange(size)
+            else:
+                labels, size, _directed = snapshot.read_nodes(network)
+            identifiers = self.create_node_agents(len(labels))
+            self.node_map = np.empty(size, dtype=np.int64)
+            self.node_map[labels] = identifiers
+        self.node_identifiers = identifiers
+
+    def edge_chunks(self):
+        network = self.starting_network
+        if isinstance(network, nx.Graph):
+            node_map = self.node_map
+            edges = network.edges_iter()
+            while 1:
+                chunk = list(itertools.islice(edges, self.chunk_size))
+                if not chunk:
+                    break
+                yield (np.array([node_map[u] for u, _v in chunk]),
+                       np.array([node_map[v] for _u, v in chunk]))
+        else:
+            chunks = (self._text_chunks(network) if self._is_text(network)
+                      else snapshot.iter_edges(network, self.chunk_size))
+            for sources, targets in chunks:
+                if self._is_text(network) and self.symmetric_text:
+                    keep = sources <= targets
+                    sources, targets = sources[keep], targets[keep]
+                yield self.node_map[sources], self.node_map[targets]
+
+    def _is_text(self, path):
+        return str(path).lower().endswith(self.text_extensions)
+
+    def _text_chunks(self, path):
+        with open(path) as stream:
+            while 1:
+                lines = list(itertools.islice(stream, self.chunk_size))
+                if not lines:
+                    break
+                pairs = [line.split(self.delimiter)[:2] for line in lines
+                         if line.strip() and not line.lstrip().startswith('#')]
+                if pairs:
+                    edges = np.array(pairs, dtype=np.int64)
+                    yield edges[:, 0], edges[:, 1]
+
+    def _scan_text(self, path):
+        """
+        Return the number of nodes of the text edge list in path and
+        whether every edge is listed in both directions.
+
+        The edges with source < target and the reversed edges with
+        source > target are compared by their number and by the sum of
+        a hash of every edge, so that the file is read only once.
+        """
+        size = 0
+        counts = [0, 0]
+        hashes = [0, 0]
+        for sources, targets in self._text_chunks(path):
+            size = max(size, sources.max() + 1, targets.max() + 1)
+            for position, (lower, upper) in enumerate(
+                    ((sources, targets), (targets, sources))):
+                keep = lower < upper
+                counts[position] += int(keep.sum())
+                hashes[position] = (hashes[position] + int(
+                    _edge_hashes(lower[keep], upper[keep]).sum())) & _MASK
+        symmetric = counts[0] > 0 and counts == counts[::-1] and \
+            hashes[0] == hashes[1]
+        return size, symmetric
@@ -0,0 +1,135 @@
+import numpy as np
+from traits.api import Any, Int, Range
+
+from pynetsym.graph import generators
+from pynetsym.util import extract_sub_dictionary
+from .bulk_configurator import AbstractBulkConfigurator
+
+
+class GeneratorConfigurator(AbstractBulkConfigurator):
+    """
+    Sets up a random starting network of starting_network_size nodes,
+    generated with the vectorized generators of
+    :mod:`pynetsym.graph.generators` and added straight to the graph
+    (see :class:`AbstractBulkConfigurator`).
+
+    The `seed` option makes the network reproducible; if it is None,
+    the global numpy generator is used.
+
+    To write large networks to a file instead (e.g., for
+    :class:`pynetsym.graph.BasicH5Graph`), use the generators with
+    :func:`pynetsym.graph.snapshot.write_edges`.
+    """
+
+    options = {'starting_network_size', 'seed'}
+
+    starting_network_size = Int(1000)
+    seed = Any
+
+    def network_size(self):
+        return self.starting_network_size
+
+    def create_nodes(self):
+        self.node_arguments = extract_sub_dictionary(
+            self.full_parameters, self.node_options)
+        self.node_identifiers = self.create_node_agents(self.network_size())
+        self.node_map = np.asarray(self.node_identifiers, dtype=np.int64)
+
+    def edge_chunks(self):
+        for sources, targets in self.generate(self.seed):
+            yield self.node_map[sources], self.node_map[targets]
+
+    def generate(self, seed):
+        """
+        Return the chunks of edges among the nodes 0, ...,
+        network_size() - 1 (see :mod:`pynetsym.graph.generators`).
+        """
+        raise NotImplementedError()
+
+
+class GNMConfigurator(GeneratorConfigurator):
+    """
+    G(n, m) starting network with `number_of_edges` edges.
+    """
+    options = {'number_of_edges'}
+    number_of_edges = Int
+
+    def generate(self, seed):
+        return generators.gnm_edges(
+            self.network_size(), self.number_of_edges, seed,
+            self.chunk_size)
+
+
+class GNPConfigurator(GeneratorConfigurator):
+    """
+    G(n, p) starting network where every edge is present with
+    probability `edge_probability`.
+    """
+    options = {'edge_probability'}
+    edge_probability = Range(low=0.0, high=1.0)
+
+    def generate(self, seed):
+        return generators.gnp_edges(
+            self.network_size(), self.edge_probability, seed,
+            self.chunk_size)
+
+
+class RingLatticeConfigurator(GeneratorConfigurator):
+    """
+    Ring lattice where every node is linked to its
+    `lattice_connections` clockwise neighbors.
+    """
+    options = {'lattice_connections'}
+    lattice_connections = Int
+
+    def generate(self, seed):
+        return generators.watts_strogatz_edges(
+            self.network_size(), self.lattice_connections, 0.0, seed,
+            self.chunk_size)
+
+
+class WattsStrogatzConfigurator(RingLatticeConfigurator):
+    """
+    Ring lattice whose edges are rewired with probability
+    `rewiring_probability`.
+    """
+    options = {'rewiring_probability'}
+    rewiring_probability = Range(low=0.0, high=1.0)
+
+    def generate(self, seed):
+        return generators.watts_strogatz_edges(
+            self.network_size(), self.lattice_connections,
+            self.rewiring_probability, seed, self.chunk_size)
+
+
+class BarabasiAlbertConfigurator(GeneratorConfigurator):
+    """
+    Barabasi-Albert starting network, where every node (except the
+    first `starting_edges`) links to `starting_edges` nodes chosen
+    with preferential attachment; nodes are added in batches (see
+    :func:`pynetsym.graph.generators.barabasi_albert_edges`).
+    """
+    options = {'starting_edges'}
+    starting_edges = Int
+
+    def generate(self, seed):
+        return generators.barabasi_albert_edges(
+            self.network_size(), self.starting_edges, seed,
+            self.chunk_size)
+
+
+class ConfigurationModelConfigurator(GeneratorConfigurator):
+    """
+    Starting network with the degrees in `degree_sequence` (node i has
+    degree degree_sequence[i], but for the erased self loops and
+    multiple edges).
+    """
+    options = {'degree_sequence'}
+    degree_sequence = Any
+
+    def network_size(self):
+        return len(self.degree_sequence)
+
+    def generate(self, seed):
+        return generators.configuration_model_edges(
+            self.degree_sequence, seed, self.chunk_size)
@@ -1,9 +1,8 @@
 from traits.trait_types import Instance, Type
-from pynetsym import node_manager
 
 import h5py
 
-from pynetsym.util import extract_sub_dictionary, SequenceAsyncResult
+from pynetsym.util import extract_sub_dictionary
 from .basic import AbstractConfigurator
 
 class BasicH5Configurator(AbstractConfigurator):
@@ -31,13 +30,7 @@ class BasicH5Configurator(AbstractConfigurator):
         
         self.node_arguments = extract_sub_dictionary(
                 self.full_parameters, self.node_options)
-        node_manager_id = node_manager.NodeManager.name
-
-        answers = [self.send(node_manager_id, 'create_node',
-                       cls=self.node_type, parameters=self.node_arguments)
-                       for _ in xrange(max_node)]
-        SequenceAsyncResult(answers).get()
-        self.node_identifiers = xrange(max_node)
+        self.node_identifiers = self.create_node_agents(max_node)
 
 
     
\ No newline at end of file
@@ -1,11 +1,10 @@
 from traits.trait_types import Instance, Class, Type
-from pynetsym import node_manager
 
 
 import itertools
 import networkx as nx
 
-from pynetsym.util import extract_sub_dictionary, SequenceAsyncResult
+from pynetsym.util import extract_sub_dictionary
 from .basic import AbstractConfigurator
 
 
@@ -41,18 +40,12 @@ class NXGraphConfigurator(AbstractConfigurator):
         """
         self.node_arguments = extract_sub_dictionary(
                 self.full_parameters, self.node_options)
-        node_manager_id = node_manager.NodeManager.name
         graph = self.starting_graph
         assert isinstance(graph, nx.Graph)
 
-        self.node_map = {}
         # create all the nodes
-        nit_1, nit_2 = itertools.tee(graph.nodes_iter())
-        answers = [self.send(node_manager_id, 'create_node',
-                       cls=self.node_type, parameters=self.node_arguments)
-                       for _node in nit_1]
-        self.node_map = {node: identifier for node, identifier
-            in itertools.izip(nit_2,
-                SequenceAsyncResult(answers).get())}
+        nodes = graph.nodes()
+        identifiers = self.create_node_agents(len(nodes))
+        self.node_map = dict(itertools.izip(nodes, identifiers))
         self.node_identifiers = self.node_map.viewvalues()
 
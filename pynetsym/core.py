@@ -38,6 +38,20 @@ class AgentError(PyNetSymError):
 
 _M = collections.namedtuple('Message', 'sender payload parameters')
 
+# agents that are processing a message
+_busy_agents = set()
+
+
+def busy_agents():
+    """
+    Return the agents that are processing a message (possibly waiting
+    for answers of other agents inside the handler).
+
+    When no agent is busy, the state of every agent is consistent and
+    the simulation can be checkpointed.
+    """
+    return frozenset(_busy_agents)
+
 
 class Message(_M):
     """
@@ -245,7 +259,26 @@ class Agent(t.HasTraits):
         self._node_db.store(self)
         self._revert_start(self._greenlet)
 
+    def handle(self, identifier):
+        """
+        Return a handle to the agent with the specified identifier.
+
+        Handles can be passed to :func:`Agent.send` instead of identifiers
+        and avoid resolving the identifier at every message; they are
+        meant for agents that are messaged often (e.g., the activator
+        or a recorder). Keep them in transient attributes.
+
+        :param identifier: the identifier of the agent
+        :rtype: :class:`addressing.AgentHandle`
+        """
+        return self._address_book.handle(identifier)
+
     def _resolve(self, identifier):
+        if isinstance(identifier, addressing.AgentHandle):
+            receiver = identifier.agent
+            if receiver is not None:
+                return receiver
+            identifier = identifier.identifier
         try:
             receiver = self._address_book.resolve(identifier)
         except addressing.AddressingError, e:
@@ -273,8 +306,9 @@ class Agent(t.HasTraits):
         """
         Send a message to the specified agent.
 
-        :param receiver_id: the id of the receiving agent
-        :type receiver_id: int|str
+        :param receiver_id: the id of the receiving agent (or a handle
+            obtained with :func:`Agent.handle`)
+        :type receiver_id: int|str|:class:`addressing.AgentHandle`
         :param message_name: the name of the receiving agent method
         :type message_name: str
         :param `**additional_parameters`: additional parameters to be passed
@@ -368,16 +402,40 @@ class Agent(t.HasTraits):
 
         """
         action_name = message.payload
+        entered = self not in _busy_agents
+        if entered:
+            _busy_agents.add(self)
         try:
-            bound_method = getattr(self, action_name)
-        except AttributeError:
-            value = self.unsupported_message(
-                action_name, **message.parameters)
-        else:
-            value = bound_method(**message.parameters)
-            del bound_method
+            try:
+                bound_method = getattr(self, action_name)
+            except AttributeError:
+                value = self.unsupported_message(
+                    action_name, **message.parameters)
+            else:
+                value = bound_method(**message.parameters)
+                del bound_method
+        finally:
+            if entered:
+                _busy_agents.discard(self)
         result.set(value)
 
+    def process_pending(self):
+        """
+        Processes the messages already received, without waiting
+        for new ones.
+
+        This is useful for agents that run long loops inside a message
+        and should still answer the other agents.
+        """
+        while 1:
+            try:
+                message, result = self._default_queue.get(block=False)
+            except queue.Empty:
+                return
+            if getattr(self, 'DEBUG_RECEIVE', False):
+                self.log_received(message)
+            self.process(message, result)
+
     def can_be_collected(self):
         """
         Override this if the Agent should not be collected (i.e., serialized
@@ -385,6 +443,25 @@ class Agent(t.HasTraits):
         """
         return False
 
+    def should_hibernate(self):
+        """
+        Called when the agent is idle and can be collected: return
+        whether it should be collected now.
+
+        The default implementation always returns True.
+        """
+        return True
+
+    def wait_idle(self):
+        """
+        Called when the agent is idle and can be collected, but should
+        not hibernate now: return when it should check again for
+        messages and for hibernation.
+
+        The default implementation returns at once (i.e., the agent
+        polls its mailbox).
+        """
+
     def _start(self):
         """
         Override to customize the agent's behavior.
@@ -407,9 +484,15 @@ class Agent(t.HasTraits):
                 self.process(message, result)
                 del message, result
             except NoMessage:
+                if self._default_queue.qsize():
+                    # a message was put while the read was timing out:
+                    # the agent is not idle
+                    continue
                 if self.can_be_collected():
-                    self._store_agent()
-                    return self
+                    if self.should_hibernate():
+                        self._store_agent()
+                        return self
+                    self.wait_idle()
             finally:
                 self.cooperate()
 
@@ -19,8 +19,6 @@ def select_uniform(graph):
     return graph.random_selector.random_node()
 
 class Node(Node):
-    MAX_TRIALS = 10
-
     death_probability = Float
 
     criterion = Trait('uniform',
@@ -31,20 +29,12 @@ class Node(Node):
         return True
 
     def introduction(self):
-        with self.graph.handle as graph:
-            neighbors = graph.neighbors(self.id)
-            if len(neighbors) > 1:
-                for _ in xrange(self.MAX_TRIALS):
-                    node_a, node_b = random.sample(neighbors, 2)
-                    if not graph.has_edge(node_a, node_b):
-                        self.send(node_a, 'introduce_to', target_node=node_b)
-                        break
-                else:
-                    self.link_to(self.criterion_)
-            else:
-                self.link_to(self.criterion_)
-
-
+        open_triad = self.graph.sample_open_triad(self.id)
+        if open_triad is None:
+            self.link_to(self.criterion_)
+        else:
+            node_a, node_b = open_triad
+            self.send(node_a, 'introduce_to', target_node=node_b)
 
     def activate(self):
         if random.random() < self.death_probability:
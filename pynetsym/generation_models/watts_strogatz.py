@@ -7,7 +7,8 @@ Watts DJ, Strogatz S (1998) Collective dynamics of small-world networks. Nature
 import random
 
 from traits.api import Range, Int
-from pynetsym import Node, Activator, Simulation, BasicConfigurator
+from pynetsym import Node, Activator, Simulation
+from pynetsym.configurators import RingLatticeConfigurator
 
 
 class Node(Node):
@@ -30,10 +31,6 @@ class Node(Node):
         return range(self.id + 1,
                      self.id + self.lattice_connections + 1)
 
-    def initialize(self):
-        for index in self.lattice_cw_neighbors():
-            self.link_to(index % self.starting_network_size)
-
 
 class Activator(Activator):
     options = {'starting_network_size'}
@@ -54,16 +51,13 @@ class WS(Simulation):
 
     activator_type = Activator
 
-    class configurator_type(BasicConfigurator):
+    class configurator_type(RingLatticeConfigurator):
         node_type = Node
         node_options = {
                 "rewiring_probability",
                 "lattice_connections",
                 "starting_network_size"}
 
-        def initialize_nodes(self):
-            self.do_initialize()
-
 if __name__ == '__main__':
     sim = WS()
     sim.run()
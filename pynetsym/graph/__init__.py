@@ -6,6 +6,7 @@ __all__ = (
     'NxGraph',
     'ScipyGraph',
     'DirectedScipyGraph',
+    'CSRGraph',
     'BasicH5Graph'
 )
 
@@ -34,6 +35,7 @@ except ImportError:
     warnings.warn("Scipy not installed.")
 else:
     from scipy_impl import ScipyGraph, DirectedScipyGraph
+    from csr_impl import CSRGraph
     register('scipy')
 
 try:
@@ -1,7 +1,8 @@
-
+import numpy as np
 from traits.api import HasTraits, Instance
 
 from pynetsym import identifiers_manager
+from pynetsym.graph import _util, snapshot
 from pynetsym.graph._util import IndexMapper
 
 class AbstractGraph(HasTraits):
@@ -37,11 +38,54 @@ class AbstractGraph(HasTraits):
             raise ValueError('%d is not a valid node index' % node_index)
 
     def add_nodes(self, how_many):
-        return [self.add_node() for _index in xrange(how_many)]
+        node_indexes = self.index_store.take_many(how_many)
+        if node_indexes:
+            self._add_nodes_sure(node_indexes)
+        return node_indexes
+
+    def _add_nodes_sure(self, node_indexes):
+        raise NotImplementedError()
+
+    def add_edges_from(self, sources, targets):
+        for source, target in zip(sources, targets):
+            self.add_edge(source, target)
+
+    def add_edge_chunks(self, chunks):
+        for sources, targets in chunks:
+            self.add_edges_from(sources, targets)
+
+    def count_open_triads(self, node):
+        return _util.count_open_triads(self, node)
+
+    def sample_open_triad(self, node):
+        return _util.sample_open_triad(self, node)
+
+    def save(self, path, compression=None):
+        snapshot.save(self, path, compression)
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """
+        Loads a graph saved with :meth:`save`.
+
+        See :func:`pynetsym.graph.snapshot.read`.
+        """
+        return cls.from_snapshot(snapshot.read(path, mmap))
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        raise NotImplementedError()
+
+    def _reserve_identifiers(self, nodes):
+        size = nodes[-1] + 1 if len(nodes) else 0
+        self.index_store.take_many(size)
+        self.index_store.free_many(
+            np.setdiff1d(np.arange(size), nodes).tolist())
 
     def remove_node(self, node):
         if node in self:
             self._remove_node_sure(node)
+            self.index_store.free(node)
         else:
             raise ValueError('Node %s not in the graph' % node)
 
@@ -1,4 +1,5 @@
 import collections
+import random
 from numpy import fromiter, ndarray
 from scipy import sparse
 
@@ -36,4 +37,93 @@ class IndexMapper(object):
                     yield self.index_map[el]
                 except Exception:
                     pass
-        return fromiter(seq_generator(), dtype=int)
\ No newline at end of file
+        return fromiter(seq_generator(), dtype=int)
+
+def _linked_nodes(graph, node):
+    if graph.is_directed():
+        linked = set(graph.successors(node))
+        linked.update(graph.predecessors(node))
+    else:
+        linked = set(graph.neighbors(node))
+    linked.discard(node)
+    return linked
+
+
+def _neighborhood(graph, node):
+    neighbors = set(int(other) for other in graph.neighbors(node))
+    neighbors.discard(node)
+    return list(neighbors)
+
+
+def count_open_triads(graph, node):
+    """
+    Counts the pairs of neighbors of node that are not linked.
+
+    Instead of testing every pair with has_edge, the neighbor set of
+    each neighbor is intersected with the neighborhood of node, so the
+    cost is linear in the sum of the degrees of the neighbors.
+    """
+    neighbors = _neighborhood(graph, node)
+    neighbor_set = set(neighbors)
+    size = len(neighbors)
+    closed = sum(len(neighbor_set.intersection(_linked_nodes(graph, other)))
+                 for other in neighbors)
+    return size * (size - 1) // 2 - closed // 2
+
+
+def sample_open_triad(graph, node, trials=10):
+    """
+    Return a pair of neighbors of node that are not linked, chosen
+    uniformly at random, or None if no such pair exists.
+
+    A few random pairs are tried first, which is constant expected time
+    unless the neighborhood is almost a clique. Then the first node of
+    the pair is drawn, at most twice the number of neighbors times, and
+    accepted with probability proportional to its open triads; the
+    links of a neighbor are read at most once and the choice stays
+    uniform. If no draw is accepted, the remaining neighbors are
+    examined and the choice is made exactly.
+
+    With k neighbors, the worst case (e.g., the neighborhood is a
+    clique and None is returned) costs O(k ** 2) plus the sum of the
+    degrees of the neighbors.
+    """
+    neighbors = _neighborhood(graph, node)
+    size = len(neighbors)
+    if size < 2:
+        return None
+    for _ in xrange(trials):
+        node_a, node_b = random.sample(neighbors, 2)
+        if not (graph.has_edge(node_a, node_b) or
+                (graph.is_directed() and graph.has_edge(node_b, node_a))):
+            return node_a, node_b
+
+    neighbor_set = set(neighbors)
+    unlinked_nodes = {}
+
+    def unlinked(node_a):
+        try:
+            return unlinked_nodes[node_a]
+        except KeyError:
+            found = neighbor_set.difference(_linked_nodes(graph, node_a))
+            found.discard(node_a)
+            found = unlinked_nodes[node_a] = list(found)
+            return found
+
+    for _ in xrange(2 * size):
+        if len(unlinked_nodes) == size:
+            break
+        node_a = random.choice(neighbors)
+        others = unlinked(node_a)
+        if random.randrange(size - 1) < len(others):
+            return node_a, random.choice(others)
+
+    candidates = [(node_a, unlinked(node_a)) for node_a in neighbors]
+    total = sum(len(others) for _node, others in candidates)
+    if not total:
+        return None
+    position = random.randrange(total)
+    for node_a, others in candidates:
+        if position < len(others):
+            return node_a, others[position]
+        position -= len(others)
@@ -1,6 +1,7 @@
 from traits.api import HasTraits, implements
 from .error import GraphError
 from .interface import IGraph
+from . import _util, snapshot
 from ._util import function_to_map
 
 import numpy as np
@@ -25,6 +26,10 @@ class BasicH5Graph(HasTraits):
     """
     implements(IGraph)
 
+    # the topology is read from h5_file again when a checkpoint is
+    # restored (see pynetsym.checkpoint.restore_graph)
+    file_backed = True
+
     def __init__(self, h5_file):
         self.h5 = h5py.File(h5_file)
         self.indices = self.h5['indices']
@@ -52,7 +57,11 @@ class BasicH5Graph(HasTraits):
         :param how_many: The number of nodes to create
         :return: the sequence of indexes of the created nodes.
         """
-        return [self.add_node() for _index in xrange(how_many)]
+        if self._added_nodes + how_many >= self.indptr.len():
+            raise GraphError("Too many agents!")
+        start = self._added_nodes
+        self._added_nodes += how_many
+        return range(start, self._added_nodes)
 
     def remove_node(self, node):
         """
@@ -78,6 +87,26 @@ class BasicH5Graph(HasTraits):
         """
         raise GraphError('Cannot add or remove edges.')
 
+    def add_edges_from(self, sources, targets):
+        """
+        Adds the edges sources[i]-targets[i] to the graph.
+
+        :param sources: the nodes from where the edges start
+        :type sources: sequence of int
+        :param targets: the nodes to which the edges arrive
+        :type targets: sequence of int
+        """
+        raise GraphError('Cannot add or remove edges.')
+
+    def add_edge_chunks(self, chunks):
+        """
+        Adds the edges of every (sources, targets) pair in chunks.
+
+        :param chunks: the edges, as pairs of sequences of int
+        :type chunks: iterable
+        """
+        raise GraphError('Cannot add or remove edges.')
+
     def remove_edge(self, source, target):
         """
         Removes edge from the graph
@@ -106,7 +135,7 @@ class BasicH5Graph(HasTraits):
         return False
 
     def __iter__(self):
-        return xrange(self._added_nodes)
+        return iter(xrange(self._added_nodes))
 
     def has_node(self, node_index):
         """
@@ -197,6 +226,28 @@ class BasicH5Graph(HasTraits):
         """
         return self.degree(node)
 
+    def count_open_triads(self, node):
+        """
+        Return the number of pairs of neighbors of node that are not
+        linked to each other.
+
+        :param node: a node
+        :return: the number of open triads centered in node
+        :rtype: int
+        """
+        return _util.count_open_triads(self, node)
+
+    def sample_open_triad(self, node):
+        """
+        Return a pair of neighbors of node that are not linked to each
+        other, chosen uniformly at random.
+
+        :param node: a node
+        :return: the pair of nodes or None if there is no such pair
+        :rtype: (int, int) | None
+        """
+        return _util.sample_open_triad(self, node)
+
     def number_of_nodes(self):
         """
         Return the number of nodes in the network.
@@ -273,6 +324,18 @@ class BasicH5Graph(HasTraits):
         return function_to_map(lambda x: x)
 
 
+    def save(self, path, compression=None):
+        """
+        Saves the graph in the binary format described in
+        :mod:`pynetsym.graph.snapshot`.
+
+        :param path: the file to write (HDF5 unless the name ends
+            in .npz)
+        :param compression: the compression filter to use
+        """
+        snapshot.write(path, self.indptr[...], self.indices[...],
+                       compression=compression)
+
     def to_nx(self, copy=False):
         """
         Return corresponding NetworkX graph.
@@ -324,14 +387,12 @@ class BasicH5Graph(HasTraits):
         if minimize==True:
             raise NotImplementedError()
         sparse_type = 'csr' if sparse_type is None else sparse_type
-        indptr = np.array(self.indptr.shape, dtype=self.indptr.shape)
-        self.indptr.read_direct(indptr)
-        indices = np.array(self.indices.shape,
-                dtype=self.indices.shape)
-        self.indices.read_direct(indices)
+        indptr = self.indptr[...]
+        indices = self.indices[...]
         data = np.ones(self.indices.shape, dtype=np.int8)
+        size = len(indptr) - 1
         M = sparse.csr_matrix((data, indices, indptr),
-            shape=(self.number_of_nodes, self.number_of_nodes))
+            shape=(size, size))
         return M.asformat(sparse_type)
 
     def to_numpy(self, minimize=False):
@@ -0,0 +1,329 @@
+import random
+
+from contextlib import contextmanager
+
+import numpy as np
+from scipy import sparse
+
+from traits.api import HasTraits, Instance, implements
+
+from .interface import IGraph
+from ._abstract import AbstractGraph
+from .error import GraphError
+from .random_selector import IRandomSelector, AliasTable
+from pynetsym.graph import has
+
+
+class CSRRandomSelector(HasTraits):
+    """
+    Random selector for a :class:`CSRGraph`.
+
+    Since the topology never changes, preferential attachment
+    is served by an alias table built only once.
+    """
+    implements(IRandomSelector)
+
+    graph_container = Instance(IGraph)
+
+    def __init__(self, graph_container):
+        self.graph_container = graph_container
+        self._preferential_table = None
+
+    def random_node(self):
+        nodes = self.graph_container.ITN
+        return int(nodes[random.randrange(len(nodes))])
+
+    def random_edge(self):
+        indptr = self.graph_container.indptr
+        indices = self.graph_container.indices
+        index = random.randrange(len(indices))
+        source = indptr.searchsorted(index, side='right') - 1
+        return int(source), int(indices[index])
+
+    def preferential_attachment(self):
+        if self._preferential_table is None:
+            self.prepare_preferential_attachment()
+        return int(self._preferential_table.sample())
+
+    def prepare_preferential_attachment(self):
+        nodes = self.graph_container.ITN
+        degrees = self.graph_container.degrees()[nodes]
+        self._preferential_table = AliasTable(nodes, degrees + 1)
+
+
+class CSRGraph(AbstractGraph):
+    """
+    Read-only graph stored in compressed sparse row format.
+
+    This backend is meant for simulations that never change the
+    topology after the configuration. The structure is just a pair of
+    arrays (indptr and indices), so a large network requires a small
+    fraction of the memory NetworkX would need; neighbors are returned
+    as slices of the indices array without any copy.
+
+    Undirected graphs store every edge in both directions, as
+    :class:`ScipyGraph` does.
+
+    Nodes are all present from the start: :meth:`add_node` merely
+    hands out the nodes of the topology, in order, so that
+    configurators can bind them to agents.
+    """
+    implements(IGraph)
+
+    def __init__(self, indptr, indices, nodes=None, directed=False,
+                 random_selector=None):
+        """
+        :param indptr: row pointers (length is the number of rows + 1)
+        :param indices: column indices; rows need not be sorted
+        :param nodes: the nodes actually in the graph; if None, every row
+            is a node
+        :param directed: whether the graph is directed
+        """
+        self.indptr = np.asanyarray(indptr)
+        self.indices = np.asanyarray(indices)
+        self.directed = directed
+        self._sort_rows()
+
+        size = len(self.indptr) - 1
+        if nodes is None:
+            self._nodes = np.arange(size, dtype=np.int64)
+        else:
+            self._nodes = np.unique(np.asarray(nodes, dtype=np.int64))
+            if len(self._nodes) and self._nodes[-1] >= size:
+                raise GraphError('Node %d has no row.' % self._nodes[-1])
+        self._present = np.zeros(size, dtype=bool)
+        self._present[self._nodes] = True
+        self._claimed = 0
+        self._transposed = None
+
+        self.random_selector = (CSRRandomSelector(self)
+                                if random_selector is None
+                                else random_selector)
+
+    @classmethod
+    def from_scipy(cls, matrix, nodes=None, directed=False):
+        matrix = sparse.csr_matrix(matrix)
+        matrix.sum_duplicates()
+        return cls(matrix.indptr, matrix.indices, nodes, directed)
+
+    @classmethod
+    def from_edges(cls, sources, targets, number_of_nodes=None,
+                   directed=False):
+        """
+        Builds the graph from two parallel arrays of endpoints.
+
+        Duplicated edges are merged; undirected edges are stored
+        in both directions.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if number_of_nodes is None:
+            number_of_nodes = (max(sources.max(), targets.max()) + 1
+                               if len(sources) else 0)
+        if not directed:
+            sources, targets = (np.concatenate([sources, targets]),
+                                np.concatenate([targets, sources]))
+        data = np.ones(len(sources), dtype=bool)
+        matrix = sparse.coo_matrix(
+            (data, (sources, targets)),
+            shape=(number_of_nodes, number_of_nodes)).tocsr()
+        return cls.from_scipy(matrix, directed=directed)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Freezes any other :class:`IGraph` implementation.
+        """
+        nodes = np.sort(np.fromiter(iter(graph), dtype=np.int64))
+        size = nodes[-1] + 1 if len(nodes) else 0
+        rows = [np.empty(0, dtype=np.int64)] * size
+        for node in nodes:
+            rows[node] = np.asarray(graph.successors(node), dtype=np.int64)
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = (np.concatenate(rows).astype(np.int32)
+                   if size else np.empty(0, dtype=np.int32))
+        return cls(indptr, indices, nodes, graph.is_directed())
+
+    @classmethod
+    def from_h5(cls, h5_file):
+        """
+        Loads the graph in memory from an HDF5 file with the same layout
+        :class:`BasicH5Graph` uses.
+        """
+        return cls.load(h5_file)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Builds the graph from a :class:`pynetsym.graph.snapshot.Snapshot`;
+        the arrays are used as they are, so that a memory mapped
+        snapshot stays mapped.
+        """
+        return cls(snapshot.indptr, snapshot.indices, snapshot.nodes,
+                   snapshot.directed)
+
+    def _sort_rows(self):
+        matrix = sparse.csr_matrix(
+            (np.ones(len(self.indices), dtype=bool),
+             self.indices, self.indptr),
+            shape=(len(self.indptr) - 1, len(self.indptr) - 1))
+        if not matrix.has_sorted_indices:
+            matrix.sort_indices()
+            self.indices = matrix.indices
+
+    def add_node(self):
+        if self._claimed >= len(self._nodes):
+            raise GraphError('Cannot add nodes to a CSRGraph.')
+        node = self._nodes[self._claimed]
+        self._claimed += 1
+        return int(node)
+
+    def add_nodes(self, how_many):
+        if self._claimed + how_many > len(self._nodes):
+            raise GraphError('Cannot add nodes to a CSRGraph.')
+        nodes = self._nodes[self._claimed:self._claimed + how_many]
+        self._claimed += how_many
+        return nodes.tolist()
+
+    def remove_node(self, node):
+        raise GraphError('Cannot remove nodes from a CSRGraph.')
+
+    def add_edge(self, source, target):
+        raise GraphError('Cannot add or remove edges.')
+
+    def add_edges_from(self, sources, targets):
+        raise GraphError('Cannot add or remove edges.')
+
+    def remove_edge(self, source, target):
+        raise GraphError('Cannot add or remove edges.')
+
+    def __contains__(self, node_index):
+        try:
+            return bool(0 <= node_index < len(self._present)
+                        and self._present[node_index])
+        except (TypeError, IndexError):
+            return False
+
+    def __iter__(self):
+        return iter(self._nodes.tolist())
+
+    def has_edge(self, source, target):
+        self._valid_nodes(source, target)
+        row = self.neighbors(source)
+        position = row.searchsorted(target)
+        return bool(position < len(row) and row[position] == target)
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    successors = neighbors
+
+    def predecessors(self, node):
+        if not self.directed:
+            return self.neighbors(node)
+        indptr, indices = self._transpose()
+        return indices[indptr[node]:indptr[node + 1]]
+
+    def _transpose(self):
+        if self._transposed is None:
+            matrix = self.to_scipy('csr').tocsc()
+            matrix.sort_indices()
+            self._transposed = matrix.indptr, matrix.indices
+        return self._transposed
+
+    def degrees(self):
+        """
+        Return the degree of every row as an array.
+        """
+        out_degrees = np.diff(self.indptr)
+        if self.directed:
+            return out_degrees + np.diff(self._transpose()[0])
+        else:
+            return out_degrees
+
+    def degree(self, node):
+        if self.directed:
+            return self.in_degree(node) + self.out_degree(node)
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def in_degree(self, node):
+        if not self.directed:
+            return self.degree(node)
+        indptr = self._transpose()[0]
+        return int(indptr[node + 1] - indptr[node])
+
+    def out_degree(self, node):
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def number_of_nodes(self):
+        return len(self._nodes)
+
+    def number_of_edges(self):
+        if self.directed:
+            return len(self.indices)
+        else:
+            return len(self.indices) // 2
+
+    def is_directed(self):
+        return self.directed
+
+    @property
+    def ITN(self):
+        return self._nodes
+
+    def to_nx(self, copy=False):
+        if has('networkx'):
+            import networkx
+
+            graph = networkx.DiGraph() if self.directed else networkx.Graph()
+            graph.add_nodes_from(self._nodes.tolist())
+            sources = np.repeat(np.arange(len(self.indptr) - 1),
+                                np.diff(self.indptr))
+            graph.add_edges_from(
+                zip(sources.tolist(), self.indices.tolist()))
+            return graph
+        else:
+            raise NotImplementedError()
+
+    def to_scipy(self, sparse_type=None, minimize=False):
+        sparse_type = 'csr' if sparse_type is None else sparse_type
+        size = len(self.indptr) - 1
+        matrix = sparse.csr_matrix(
+            (np.ones(len(self.indices), dtype=bool),
+             self.indices, self.indptr),
+            shape=(size, size))
+        if minimize:
+            index_to_node = self.ITN
+            node_to_index = self.make_NTI(index_to_node)
+            matrix = matrix[index_to_node, :][:, index_to_node]
+            return (matrix.asformat(sparse_type),
+                    node_to_index, index_to_node)
+        else:
+            return matrix.asformat(sparse_type)
+
+    def to_numpy(self, minimize=False):
+        if minimize:
+            matrix, node_to_index, index_to_node = self.to_scipy(
+                minimize=minimize)
+            return matrix.toarray(), node_to_index, index_to_node
+        else:
+            return self.to_scipy().toarray()
+
+    def apply(self, func, *args, **kwargs):
+        return func(self.to_scipy(), *args, **kwargs)
+
+    @property
+    @contextmanager
+    def handle(self):
+        yield self.to_scipy()
+
+    @property
+    @contextmanager
+    def handle_copy(self):
+        yield self.to_scipy().copy()
+
+    def _valid_nodes(self, *nodes):
+        for node in nodes:
+            if node not in self:
+                raise GraphError('%s node not in graph.' % node)
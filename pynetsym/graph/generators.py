@@ -0,0 +1,224 @@
+"""
+Vectorized generators of random graphs.
+
+Every generator yields the edges of an undirected simple graph on the
+nodes 0, ..., n-1 as pairs of arrays (sources, targets), at most
+chunk_size edges at a time, so that the edges can be added to a graph
+(see :func:`pynetsym.graph.IGraph.add_edges_from`) or written to a
+file (see :func:`pynetsym.graph.snapshot.write_edges`) as they are
+generated.
+
+The generators draw from seed, which is either a seed or a
+numpy.random.RandomState (None uses the global numpy generator): the
+same seed yields the same graph.
+"""
+
+import numpy as np
+
+from .error import GraphError
+
+
+__all__ = [
+    'random_state',
+    'gnm_edges',
+    'gnp_edges',
+    'watts_strogatz_edges',
+    'barabasi_albert_edges',
+    'configuration_model_edges',
+]
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def random_state(seed=None):
+    """
+    Return a numpy.random.RandomState seeded with seed; a RandomState
+    is returned as it is and None gives the global one.
+    """
+    if isinstance(seed, np.random.RandomState):
+        return seed
+    if seed is None:
+        return np.random.mtrand._rand
+    return np.random.RandomState(seed)
+
+
+def _chunks(sources, targets, chunk_size):
+    for start in xrange(0, len(sources), chunk_size):
+        yield (sources[start:start + chunk_size],
+               targets[start:start + chunk_size])
+
+
+def _pairs(codes):
+    """
+    Decodes the indexes of the pairs u < v, numbered v * (v - 1) / 2 + u.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    v = ((1 + np.sqrt(1 + 8 * codes.astype(np.float64))) / 2).astype(np.int64)
+    # fix the rounding errors of large indexes
+    v -= v * (v - 1) // 2 > codes
+    v += (v + 1) * v // 2 <= codes
+    return codes - v * (v - 1) // 2, v
+
+
+def _redraw_collisions(sources, targets, candidates, draw, n):
+    """
+    Draws again the targets of the candidate edges that are self loops
+    or duplicates of other edges, until there are none.
+    """
+    while 1:
+        codes = (np.minimum(sources, targets) * n +
+                 np.maximum(sources, targets))
+        # edges that cannot be redrawn come first, and are kept
+        order = np.lexsort((candidates, codes))
+        duplicates = np.zeros(len(codes), dtype=bool)
+        duplicates[order[1:]] = codes[order[1:]] == codes[order[:-1]]
+        bad = ((sources == targets) | duplicates) & candidates
+        if not bad.any():
+            return targets
+        targets[bad] = draw(bad.sum())
+
+
+def gnm_edges(n, m, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the edges of a G(n, m) graph: m edges chosen uniformly
+    among the n * (n - 1) / 2 possible ones.
+
+    :raise GraphError: if there are less than m possible edges
+    """
+    possible = n * (n - 1) // 2
+    if m > possible:
+        raise GraphError('Cannot put %d edges in %d nodes.' % (m, n))
+    rs = random_state(seed)
+    if 2 * m > possible:
+        codes = rs.choice(possible, m, replace=False)
+    else:
+        codes = np.empty(0, dtype=np.int64)
+        while len(codes) < m:
+            missing = m - len(codes)
+            codes = np.union1d(
+                codes, rs.randint(0, possible, missing + missing // 8 + 16))
+        if len(codes) > m:
+            codes = rs.choice(codes, m, replace=False)
+    codes.sort()
+    return (_pairs(chunk)
+            for chunk, _chunk in _chunks(codes, codes, chunk_size))
+
+
+def gnp_edges(n, p, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the edges of a G(n, p) graph: every edge is present with
+    probability p.
+
+    The edges are found skipping the missing ones with geometric
+    jumps (Batagelj and Brandes), so that the cost is proportional to
+    the edges and not to n ** 2.
+    """
+    possible = n * (n - 1) // 2
+    if p <= 0 or not possible:
+        return
+    if p >= 1:
+        for start in xrange(0, possible, chunk_size):
+            yield _pairs(np.arange(start, min(start + chunk_size, possible)))
+        return
+    rs = random_state(seed)
+    position = -1
+    while 1:
+        codes = position + np.cumsum(rs.geometric(p, chunk_size))
+        if codes[-1] >= possible:
+            codes = codes[codes < possible]
+            if len(codes):
+                yield _pairs(codes)
+            return
+        yield _pairs(codes)
+        position = codes[-1]
+
+
+def watts_strogatz_edges(n, k, p, seed=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the edges of a Watts-Strogatz graph: a ring lattice where
+    every node is linked to its k clockwise neighbors, whose edges are
+    rewired to a uniformly chosen node with probability p (avoiding
+    self loops and duplicate edges).
+
+    :raise GraphError: if the lattice does not fit in n nodes
+    """
+    if 2 * k >= n:
+        raise GraphError(
+            'Cannot link %d nodes to %d neighbors.' % (n, 2 * k))
+    rs = random_state(seed)
+    sources = np.repeat(np.arange(n, dtype=np.int64), k)
+    targets = (sources + np.tile(np.arange(1, k + 1), n)) % n
+    rewired = rs.random_sample(len(sources)) < p
+    targets[rewired] = rs.randint(0, n, rewired.sum())
+    targets = _redraw_collisions(
+        sources, targets, rewired, lambda size: rs.randint(0, n, size), n)
+    return _chunks(sources, targets, chunk_size)
+
+
+def barabasi_albert_edges(n, m, seed=None,
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the edges of a Barabasi-Albert graph: starting from m
+    isolated nodes, every new node is linked to m distinct nodes chosen
+    with probability proportional to their degree.
+
+    Nodes are added in batches of at most chunk_size / m nodes (and no
+    more than the nodes already in the graph): the nodes of a batch
+    choose according to the degrees before the batch, and do not link
+    to each other.
+
+    :raise GraphError: unless 1 <= m < n
+    """
+    if not 1 <= m < n:
+        raise GraphError(
+            'Cannot link %d nodes to %d nodes each.' % (n, m))
+    return _barabasi_albert_edges(n, m, random_state(seed), chunk_size)
+
+
+def _barabasi_albert_edges(n, m, rs, chunk_size):
+    # every node appears once for every edge
+    repeated = np.empty(2 * m * (n - m), dtype=np.int64)
+    targets = np.arange(m, dtype=np.int64)
+    sources = np.repeat(np.int64(m), m)
+    size = 0
+    node = m
+    while 1:
+        yield sources, targets
+        repeated[size:size + len(sources)] = sources
+        repeated[size + len(sources):size + 2 * len(sources)] = targets
+        size += 2 * len(sources)
+        node += len(sources) // m
+        if node >= n:
+            return
+        batch = min(max(chunk_size // m, 1), node, n - node)
+        sources = np.repeat(np.arange(node, node + batch), m)
+        draw = lambda count, size=size: repeated[rs.randint(0, size, count)]
+        targets = _redraw_collisions(
+            sources, draw(len(sources)),
+            np.ones(len(sources), dtype=bool), draw, n)
+
+
+def configuration_model_edges(degrees, seed=None,
+                              chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the edges of a graph with the given degree sequence: the
+    stubs of the nodes are matched at random, then self loops and
+    multiple edges are erased (hence some degrees may be lower).
+
+    :raise GraphError: if the sum of the degrees is odd
+    """
+    degrees = np.asarray(degrees, dtype=np.int64)
+    if degrees.sum() % 2:
+        raise GraphError('The sum of the degrees must be even.')
+    rs = random_state(seed)
+    stubs = np.repeat(np.arange(len(degrees), dtype=np.int64), degrees)
+    rs.shuffle(stubs)
+    sources, targets = stubs[0::2], stubs[1::2]
+    codes = (np.minimum(sources, targets) * len(degrees) +
+             np.maximum(sources, targets))
+    _codes, first = np.unique(codes, return_index=True)
+    first = first[sources[first] != targets[first]]
+    first.sort()
+    return _chunks(sources[first], targets[first], chunk_size)
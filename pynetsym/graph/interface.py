@@ -46,6 +46,28 @@ class IGraph(Interface):
             directed or undirected
         """
 
+    def add_edges_from(self, sources, targets):
+        """
+        Adds the edges sources[i]-targets[i] to the graph at once,
+        like add_edge does for each of them.
+
+        :param sources: the nodes from where the edges start
+        :type sources: sequence of int
+        :param targets: the nodes to which the edges arrive
+        :type targets: sequence of int
+        :raise GraphError: if some node is not in the graph
+        """
+
+    def add_edge_chunks(self, chunks):
+        """
+        Adds the edges of every (sources, targets) pair in chunks, like
+        add_edges_from does for each of them.
+
+        :param chunks: the edges, as pairs of sequences of int
+        :type chunks: iterable
+        :raise GraphError: if some node is not in the graph
+        """
+
     def remove_edge(self, source, target):
         """
         Removes edge from the graph
@@ -152,6 +174,27 @@ class IGraph(Interface):
         :rtype: int
         """
 
+    def count_open_triads(self, node):
+        """
+        Return the number of pairs of neighbors of node that are not
+        linked to each other.
+
+        :param node: a node
+        :return: the number of open triads centered in node
+        :rtype: int
+        """
+
+    def sample_open_triad(self, node):
+        """
+        Return a pair of neighbors of node that are not linked to each
+        other, chosen uniformly at random.
+
+        :param node: a node
+        :return: the pair of nodes or None if the neighbors of node
+            form a clique
+        :rtype: (int, int) | None
+        """
+
     def number_of_nodes(self):
         """
         Return the number of nodes in the network.
@@ -230,6 +273,16 @@ class IGraph(Interface):
         It also accepts some forms of advanced indexing.
         """
 
+    def save(self, path, compression=None):
+        """
+        Saves the graph in the binary format described in
+        :mod:`pynetsym.graph.snapshot`.
+
+        :param path: the file to write (HDF5 unless the name ends
+            in .npz)
+        :param compression: the compression filter to use
+        """
+
     def to_nx(self, copy=False):
         """
         Return corresponding NetworkX graph.
@@ -14,6 +14,7 @@ from traits.trait_types import DelegatesTo
 
 from ._abstract import AbstractGraph
 from .error import GraphError
+from . import snapshot as snapshot_module
 from pynetsym.util import classproperty
 from .random_selector import IRandomSelector, RepeatedNodesRandomSelector
 from .import interface
@@ -51,23 +52,53 @@ class NxGraph(AbstractGraph):
         self.random_selector = (NxRandomSelector(graph_container=self)
                                 if random_selector is None else random_selector)
 
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Builds the graph from a :class:`pynetsym.graph.snapshot.Snapshot`.
+        """
+        graph = nx.DiGraph() if snapshot.directed else nx.Graph()
+        graph.add_nodes_from(np.asarray(snapshot.nodes).tolist())
+        sources, targets = snapshot_module.edge_arrays(snapshot)
+        graph.add_edges_from(zip(sources.tolist(), targets.tolist()))
+        instance = cls(graph)
+        instance._reserve_identifiers(snapshot.nodes)
+        return instance
+
     def add_node(self):
         node_index = self.index_store.take()
         self.nx_graph.add_node(node_index)
         self.random_selector.add_node(node_index)
         return node_index
 
-    # remove_node is defined in AbstractGraph
+    # add_nodes and remove_node are defined in AbstractGraph
+
+    def _add_nodes_sure(self, node_indexes):
+        self.nx_graph.add_nodes_from(node_indexes)
+        self.random_selector.add_nodes(node_indexes)
 
     def _remove_node_sure(self, node):
+        if self.nx_graph.is_directed():
+            incident_nodes = (self.nx_graph.successors(node) +
+                              self.nx_graph.predecessors(node))
+        else:
+            incident_nodes = self.nx_graph.neighbors(node)
         self.nx_graph.remove_node(node)
-        self.random_selector.remove_node(node)
+        self.random_selector.remove_node(node, incident_nodes)
 
     def add_edge(self, source, target):
         self._valid_nodes(source, target)
         self.nx_graph.add_edge(source, target)
         self.random_selector.add_edge(source, target)
 
+    def add_edges_from(self, sources, targets):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        self._valid_nodes(*np.unique(np.concatenate((sources, targets))))
+        self.nx_graph.add_edges_from(
+            zip(sources.tolist(), targets.tolist()))
+        self.random_selector.add_edges(sources, targets)
+
     def remove_edge(self, source, target):
         try:
             self.nx_graph.remove_edge(source, target)
@@ -124,24 +155,22 @@ class NxGraph(AbstractGraph):
         return matrix, node_to_index, index_to_node
 
     def _to_scipy_not_minimize(self, sparse_type):
-        edges_array = array(self.nx_graph.edges(), dtype=int).T
+        edges_array = array(self.nx_graph.edges(), dtype=int).reshape(-1, 2).T
+        max_node = max(self.nx_graph.nodes_iter()) if self.nx_graph else -1
+        shape = max_node + 1, max_node + 1
 
         if self.nx_graph.is_directed():
             multiplier = 1
             sources = edges_array[0, :]
             targets = edges_array[1, :]
-            max_node = max(self.nx_graph.nodes_iter())
-            shape = max_node + 1, max_node + 1
         else:
             multiplier = 2
             sources = edges_array.flat
             targets = edges_array[::-1, :].flat
-            shape = None
 
         M = sparse.coo_matrix(
-            (type('.', (object, ),
-                  {'__len__': lambda _: self.nx_graph.number_of_edges() * multiplier,
-                   '__getitem__': lambda _, __: True})(),
+            (np.ones(self.nx_graph.number_of_edges() * multiplier,
+                     dtype=bool),
              (sources, targets)),
             dtype=bool, shape=shape)
 
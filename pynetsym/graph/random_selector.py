@@ -2,7 +2,7 @@ import random
 import numpy as np
 from traits.api import Interface
 from traits.api import HasTraits, implements
-from traits.api import false
+from traits.api import false, Int, Property
 from traits.trait_numeric import Array
 from traits.trait_types import Instance
 from pynetsym.graph import IGraph
@@ -66,34 +66,145 @@ class AbstractRandomSelector(HasTraits):
         raise NotImplementedError()
 
 class RepeatedNodesRandomSelector(AbstractRandomSelector):
+    """
+    Preferential attachment is implemented extracting uniformly from
+    an array where every node appears once per incident edge plus one.
 
-    repeated_nodes = Array(dtype=np.int32, shape=(None, ))
+    The array is kept in a buffer that grows geometrically, so that
+    adding nodes and edges costs amortized constant time; removals
+    update the array in place instead of discarding it.
+    """
+
+    _buffer = Array(dtype=np.int32, shape=(None, ))
+    _size = Int(0)
+
+    repeated_nodes = Property
+
+    def _get_repeated_nodes(self):
+        return self._buffer[:self._size]
+
+    def _set_repeated_nodes(self, value):
+        self._buffer = np.asarray(value, dtype=np.int32)
+        self._size = len(self._buffer)
 
     def extract_preferential_attachment(self):
         return random.choice(self.repeated_nodes)
 
+    def _append(self, values):
+        values = np.asarray(values, dtype=np.int32)
+        new_size = self._size + len(values)
+        if new_size > len(self._buffer):
+            grown = np.empty(max(new_size, 2 * len(self._buffer)),
+                             dtype=np.int32)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+        self._buffer[self._size:new_size] = values
+        self._size = new_size
+
+    def _drop(self, node=None, occurrences=()):
+        """
+        Removes every occurrence of node and exactly one occurrence
+        of each element of occurrences (repeated elements are removed
+        as many times as they appear).
+        """
+        current = self.repeated_nodes
+        if node is not None:
+            keep = current != node
+        else:
+            keep = np.ones(len(current), dtype=bool)
+        if len(occurrences):
+            values, inverse = np.unique(occurrences, return_inverse=True)
+            counts = np.bincount(inverse)
+            candidates = np.flatnonzero(np.in1d(current, values))
+            candidate_values = current[candidates]
+            order = np.argsort(candidate_values, kind='mergesort')
+            candidates = candidates[order]
+            candidate_values = candidate_values[order]
+            rank = (np.arange(len(candidates)) -
+                    candidate_values.searchsorted(candidate_values))
+            allowed = counts[values.searchsorted(candidate_values)]
+            keep[candidates[rank < allowed]] = False
+        kept = current[keep]
+        self._size = len(kept)
+        self._buffer[:self._size] = kept
+
     def add_edge(self, source, target):
         if self._initialized_preferential_attachment:
-            # this is embarassingly inefficient! Fix somehow!
-            self.repeated_nodes = np.append(self.repeated_nodes, [source, target])
+            self._append([source, target])
+
+    def add_edges(self, sources, targets):
+        if self._initialized_preferential_attachment:
+            self._append(np.column_stack((sources, targets)).ravel())
 
     def remove_edge(self, source, target):
         if self._initialized_preferential_attachment:
-            self.repeated_nodes.sort()
-            # algorithm supposes source and target are in the array!
-            source_index = self.repeated_nodes.searchsorted(source)
-            target_index = self.repeated_nodes.searchsorted(target)
-            min_index = min(source_index, target_index)
-            max_index = max(source_index, target_index)
-            self.repeated_nodes = np.hstack(
-                [self.repeated_nodes[:min_index],
-                 self.repeated_nodes[min_index + 1:max_index],
-                 self.repeated_nodes[max_index + 1:]])
-
-    def remove_node(self, node):
-        self._initialized_preferential_attachment = False
-        self.repeated_nodes = np.zeros(0, dtype=np.int32)
+            self._drop(occurrences=[source, target])
+
+    def remove_node(self, node, neighbors=()):
+        """
+        Removes node from the selector.
+
+        :param node: the removed node
+        :param neighbors: the nodes that were linked to node, once per
+            edge; their weight is decreased accordingly
+        """
+        if self._initialized_preferential_attachment:
+            self._drop(node, neighbors)
 
     def add_node(self, node):
         if self._initialized_preferential_attachment:
-            self.repeated_nodes = np.append(self.repeated_nodes, node)
+            self._append([node])
+
+    def add_nodes(self, nodes):
+        if self._initialized_preferential_attachment:
+            self._append(nodes)
+
+
+class AliasTable(object):
+    """
+    Walker/Vose alias table for O(1) extraction from a fixed discrete
+    distribution.
+
+    Building the table is linear in the number of outcomes; afterwards
+    every extraction costs a couple of random numbers.
+    """
+
+    def __init__(self, outcomes, weights):
+        """
+        :param outcomes: the values that are returned by :meth:`sample`
+        :type outcomes: numpy.ndarray
+        :param weights: the (not necessarily normalized) weights of
+            the outcomes
+        :type weights: numpy.ndarray
+        """
+        self.outcomes = np.asarray(outcomes)
+        weights = np.asarray(weights, dtype=np.float64)
+        size = len(weights)
+        self.probability = np.ones(size, dtype=np.float64)
+        self.alias = np.arange(size, dtype=np.int64)
+        if size == 0:
+            return
+        scaled = weights * (size / weights.sum())
+        small = np.flatnonzero(scaled < 1.0).tolist()
+        large = np.flatnonzero(scaled >= 1.0).tolist()
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def sample(self):
+        if not len(self.outcomes):
+            raise IndexError('Cannot sample from an empty distribution.')
+        index = random.randrange(len(self.outcomes))
+        if random.random() >= self.probability[index]:
+            index = self.alias[index]
+        return self.outcomes[index]
@@ -4,7 +4,7 @@ import random
 import numpy as np
 from numpy import flatnonzero, fromiter, hstack, append
 from scipy import sparse
-from traits.api import implements, Callable, Instance
+from traits.api import implements, Callable, Instance, Int
 from traits.trait_types import DelegatesTo
 
 from .interface import IGraph
@@ -71,6 +71,9 @@ class ScipyGraph(AbstractGraph):
 
     random_selector_factory = Callable(ScipyRandomSelector)
 
+    #: the number of edges add_edge_chunks applies at a time
+    edge_batch_size = Int(1 << 20)
+
     def _max_nodes(self):
         return self.matrix.shape[0]
 
@@ -99,6 +102,25 @@ class ScipyGraph(AbstractGraph):
         else:
             raise ValueError('Bad parameters %s' % (locals(), ))
 
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Builds the graph from a :class:`pynetsym.graph.snapshot.Snapshot`.
+        """
+        size = len(snapshot.indptr) - 1
+        matrix = sparse.csr_matrix(
+            (np.ones(len(snapshot.indices), dtype=bool),
+             snapshot.indices, snapshot.indptr),
+            shape=(size, size))
+        graph = cls(matrix=matrix.tolil(),
+                    nodes=set(np.asarray(snapshot.nodes).tolist()))
+        if graph.is_directed() != snapshot.directed:
+            raise GraphError('Cannot load a %s graph in a %s.' % (
+                'directed' if snapshot.directed else 'undirected',
+                cls.__name__))
+        graph._reserve_identifiers(snapshot.nodes)
+        return graph
+
     def add_node(self):
         node_index = self.index_store.take()
         if node_index >= self._max_nodes():
@@ -108,11 +130,29 @@ class ScipyGraph(AbstractGraph):
         self.random_selector.add_node(node_index)
         return node_index
 
+    def _add_nodes_sure(self, node_indexes):
+        if node_indexes[-1] >= self._max_nodes():
+            self._enlarge(node_indexes[-1])
+        self._nodes.update(node_indexes)
+        self.random_selector.add_nodes(node_indexes)
+
     def _remove_node_sure(self, node):
+        incident_nodes = self._incident_nodes(node)
+        for other in incident_nodes:
+            self.matrix[other, node] = False
+        self._clear_row(node)
         self._nodes.remove(node)
-        self.matrix[node, :] = False
-        self.matrix[:, node] = False
-        self.random_selector.remove_node(node)
+        self.random_selector.remove_node(node, incident_nodes)
+
+    def _incident_nodes(self, node):
+        return self.neighbors(node)
+
+    def _clear_row(self, node):
+        if self.matrix.getformat() == 'lil':
+            self.matrix.rows[node] = []
+            self.matrix.data[node] = []
+        else:
+            self.matrix[node, :] = False
 
     def add_edge(self, source, target):
         self._valid_nodes(source, target)
@@ -120,6 +160,47 @@ class ScipyGraph(AbstractGraph):
         self.matrix[target, source] = True
         self.random_selector.add_edge(source, target)
 
+    def add_edges_from(self, sources, targets):
+        self.add_edge_chunks([(sources, targets)])
+
+    def add_edge_chunks(self, chunks):
+        """
+        Adds the edges of every (sources, targets) pair in chunks.
+
+        The chunks are collected in batches of edge_batch_size edges
+        (a batch ends with the chunk that fills it): the matrix is
+        converted to csr (and back) once per batch, and only one batch
+        of edges is held in memory besides the matrix.
+        """
+        present = np.zeros(self._max_nodes(), dtype=bool)
+        present[fromiter(self._nodes, dtype=np.int64,
+                         count=len(self._nodes))] = True
+        batch_sources, batch_targets, batch_size = [], [], 0
+        for sources, targets in chunks:
+            sources = np.asarray(sources, dtype=np.int64)
+            targets = np.asarray(targets, dtype=np.int64)
+            self._valid_node_array(present, sources)
+            self._valid_node_array(present, targets)
+            batch_sources.append(sources)
+            batch_targets.append(targets)
+            batch_size += len(sources)
+            if batch_size >= self.edge_batch_size:
+                self._add_edge_batch(batch_sources, batch_targets)
+                batch_sources, batch_targets, batch_size = [], [], 0
+        if batch_size:
+            self._add_edge_batch(batch_sources, batch_targets)
+
+    def _add_edge_batch(self, batch_sources, batch_targets):
+        sources = np.concatenate(batch_sources)
+        targets = np.concatenate(batch_targets)
+        added = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=bool), (sources, targets)),
+            shape=self.matrix.shape)
+        if not self.is_directed():
+            added = added + added.T
+        self.matrix = self.matrix_factory(
+            (self.matrix.tocsr() + added).astype(bool))
+        self.random_selector.add_edges(sources, targets)
 
     def number_of_nodes(self):
         return len(self._nodes)
@@ -146,6 +227,8 @@ class ScipyGraph(AbstractGraph):
         return False
 
     def neighbors(self, node):
+        if self.matrix.getformat() == 'lil':
+            return list(self.matrix.rows[node])
         A = self.matrix.getrow(node).toarray()
         return flatnonzero(A).tolist()
 
@@ -240,13 +323,23 @@ class ScipyGraph(AbstractGraph):
         return graph
 
     def _enlarge(self, node_index):
-        self.matrix.reshape((node_index, node_index))
+        # doubling, so that adding nodes one at a time stays amortized
+        size = max(node_index + 1, 2 * self._max_nodes())
+        self.matrix.resize((size, size))
 
     def _valid_nodes(self, *nodes):
         for node in nodes:
             if node not in self._nodes:
                 raise GraphError('%s node not in graph.' % node)
 
+    def _valid_node_array(self, present, nodes):
+        outside = (nodes < 0) | (nodes >= len(present))
+        missing = nodes[outside]
+        if not len(missing):
+            missing = nodes[~present[nodes]]
+        if len(missing):
+            raise GraphError('%s node not in graph.' % missing[0])
+
 
 class DirectedScipyGraph(ScipyGraph):
     """
@@ -275,6 +368,9 @@ class DirectedScipyGraph(ScipyGraph):
     def is_directed(self):
         return True
 
+    def _incident_nodes(self, node):
+        return self.successors(node) + self.predecessors(node)
+
     def predecessors(self, identifier):
         A = self.matrix.getcol(identifier).toarray()
         return flatnonzero(A).tolist()
@@ -0,0 +1,391 @@
+"""
+Binary snapshots of graphs.
+
+A snapshot stores the adjacency matrix in compressed sparse row format:
+the ``indptr`` and ``indices`` arrays are the same that
+:class:`BasicH5Graph` and :class:`BasicH5Configurator` read. Two more
+fields are stored: ``nodes``, the nodes actually present in the graph
+(rows of removed nodes are empty), and ``directed``. Files without
+them (e.g., those created by examples/make_er.py) are read as
+undirected graphs where every row is a node.
+
+Undirected graphs store every edge in both directions.
+
+Files whose name ends in ``.npz`` are numpy archives; every other
+file is an HDF5 file.
+"""
+
+import collections
+import contextlib
+import zipfile
+
+import numpy as np
+from numpy.lib import format as npy_format
+from scipy import sparse
+
+from .error import GraphError
+
+
+Snapshot = collections.namedtuple(
+    'Snapshot', 'indptr indices nodes directed')
+
+
+def _is_npz(path):
+    return str(path).endswith('.npz')
+
+
+def save(graph, path, compression=None):
+    """
+    Saves graph to path.
+
+    :param graph: the graph to save
+    :type graph: IGraph
+    :param path: the file to write
+    :param compression: the HDF5 compression filter (e.g., 'gzip' or
+        'lzf'); for npz archives any true value uses zip compression
+    """
+    snapshot = take(graph)
+    write(path, snapshot.indptr, snapshot.indices, snapshot.nodes,
+          snapshot.directed, compression)
+
+
+def take(graph):
+    """
+    Return a snapshot of graph, without writing it.
+
+    :param graph: the graph
+    :type graph: IGraph
+    :rtype: Snapshot
+    """
+    nodes = np.fromiter(iter(graph), dtype=np.int64)
+    nodes.sort()
+    size = nodes[-1] + 1 if len(nodes) else 0
+    matrix = sparse.csr_matrix(graph.to_scipy('csr'))
+    if matrix.shape != (size, size):
+        entries = matrix.tocoo()
+        keep = (entries.row < size) & (entries.col < size)
+        matrix = sparse.csr_matrix(
+            (entries.data[keep], (entries.row[keep], entries.col[keep])),
+            shape=(size, size))
+    matrix.sum_duplicates()
+    return Snapshot(matrix.indptr, matrix.indices, nodes,
+                    graph.is_directed())
+
+
+def write(path, indptr, indices, nodes=None, directed=False,
+          compression=None):
+    """
+    Writes the CSR arrays of a graph to path.
+
+    :param indptr: row pointers
+    :param indices: column indices (sorted within every row)
+    :param nodes: the nodes in the graph; if None every row is a node
+    :param directed: whether the graph is directed
+    :param compression: see :func:`save`
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int32)
+    if nodes is None:
+        nodes = np.arange(len(indptr) - 1, dtype=np.int64)
+    nodes = np.asarray(nodes, dtype=np.int64)
+
+    if _is_npz(path):
+        savez = np.savez_compressed if compression else np.savez
+        savez(path, indptr=indptr, indices=indices, nodes=nodes,
+              directed=np.array(directed))
+    else:
+        import h5py
+
+        with h5py.File(path, 'w') as h5:
+            for name, array in (('indptr', indptr),
+                                ('indices', indices),
+                                ('nodes', nodes)):
+                h5.create_dataset(
+                    name, data=array,
+                    compression=compression if len(array) else None)
+            h5.attrs['directed'] = directed
+
+
+def write_edges(path, number_of_nodes, edge_chunks, directed=False,
+                max_entries=1 << 24, compression=None):
+    """
+    Writes the graph with nodes 0, ..., number_of_nodes - 1 and the
+    edges yielded by edge_chunks. HDF5 files are written one block of
+    rows at a time, without holding all the edges in memory; numpy
+    archives (.npz) cannot be written incrementally, hence the whole
+    array of column indices (4 bytes per entry, i.e., per edge of a
+    directed graph and per direction of an undirected edge) is built
+    in memory before writing it.
+
+    edge_chunks is called (with no arguments) once to count the edges
+    of every node and then once for every block of rows, which must
+    not have more than max_entries column indices (with a single
+    block when the graph is small enough): it must yield the same
+    edges every time, as pairs of arrays (sources, targets). The
+    generators of :mod:`pynetsym.graph.generators` with a fixed seed
+    do, e.g.::
+
+        write_edges('er.h5', n, lambda: gnm_edges(n, m, seed=42))
+
+    Undirected edges are written in both directions and must be
+    yielded only once; edges must not be repeated.
+
+    :param path: the file to write (see :func:`write`)
+    :param compression: see :func:`save`
+    """
+    degrees = np.zeros(number_of_nodes, dtype=np.int64)
+    for sources, targets in edge_chunks():
+        degrees += np.bincount(sources, minlength=number_of_nodes)
+        if not directed:
+            degrees += np.bincount(targets, minlength=number_of_nodes)
+    indptr = np.zeros(number_of_nodes + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    blocks = [0]
+    while blocks[-1] < number_of_nodes:
+        start = blocks[-1]
+        end = indptr.searchsorted(
+            indptr[start] + max_entries, side='right') - 1
+        blocks.append(min(max(end, start + 1), number_of_nodes))
+
+    if _is_npz(path):
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        for start, end in zip(blocks[:-1], blocks[1:]):
+            indices[indptr[start]:indptr[end]] = _rows(
+                edge_chunks, start, end, directed)
+        write(path, indptr, indices, None, directed, compression)
+        return
+
+    import h5py
+
+    with h5py.File(path, 'w') as h5:
+        h5.create_dataset('indptr', data=indptr)
+        h5.create_dataset('nodes', data=np.arange(number_of_nodes,
+                                                  dtype=np.int64))
+        indices = h5.create_dataset(
+            'indices', shape=(indptr[-1], ), dtype=np.int32,
+            compression=compression if indptr[-1] else None)
+        for start, end in zip(blocks[:-1], blocks[1:]):
+            if indptr[end] > indptr[start]:
+                indices[indptr[start]:indptr[end]] = _rows(
+                    edge_chunks, start, end, directed)
+        h5.attrs['directed'] = directed
+
+
+def _rows(edge_chunks, start, end, directed):
+    """
+    Return the column indices of the rows from start to end, sorted.
+    """
+    rows, columns = [], []
+    for sources, targets in edge_chunks():
+        pairs = [(sources, targets)]
+        if not directed:
+            pairs.append((targets, sources))
+        for row, column in pairs:
+            keep = (row >= start) & (row < end)
+            rows.append(row[keep])
+            columns.append(column[keep])
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    columns = (np.concatenate(columns) if columns
+               else np.empty(0, dtype=np.int64))
+    return columns[np.lexsort((columns, rows))]
+
+
+def read(path, mmap=False):
+    """
+    Reads a snapshot.
+
+    :param path: the file to read
+    :param mmap: map the arrays in memory instead of reading them;
+        only HDF5 files with uncompressed (contiguous) datasets can
+        be mapped
+    :return: the snapshot
+    :rtype: Snapshot
+    :raise GraphError: if the file cannot be mapped
+    """
+    if _is_npz(path):
+        if mmap:
+            raise GraphError('Cannot map npz archives in memory.')
+        archive = np.load(path)
+        try:
+            indptr = archive['indptr']
+            indices = archive['indices']
+            nodes = (archive['nodes'] if 'nodes' in archive.files
+                     else None)
+            directed = (bool(archive['directed'])
+                        if 'directed' in archive.files else False)
+        finally:
+            archive.close()
+    else:
+        import h5py
+
+        with h5py.File(path, 'r') as h5:
+            load_array = _map_dataset if mmap else _read_dataset
+            indptr = load_array(path, h5['indptr'])
+            indices = load_array(path, h5['indices'])
+            nodes = (load_array(path, h5['nodes'])
+                     if 'nodes' in h5 else None)
+            directed = bool(h5.attrs.get('directed', False))
+    if nodes is None:
+        nodes = np.arange(len(indptr) - 1, dtype=np.int64)
+    return Snapshot(indptr, indices, nodes, directed)
+
+
+def _read_dataset(_path, dataset):
+    return dataset[...]
+
+
+def _map_dataset(path, dataset):
+    offset = dataset.id.get_offset()
+    if dataset.chunks is not None or offset is None:
+        raise GraphError(
+            'Dataset %s is chunked or compressed and cannot be mapped.'
+            % dataset.name)
+    return np.memmap(path, mode='r', dtype=dataset.dtype,
+                     shape=dataset.shape, offset=offset)
+
+
+def load(path, graph_type=None, mmap=False):
+    """
+    Loads a graph from path.
+
+    :param path: the file to read
+    :param graph_type: the class of the returned graph, which must
+        provide a from_snapshot class method; if None a
+        :class:`CSRGraph` is built, which uses the arrays as they are
+    :param mmap: see :func:`read`
+    :return: the graph
+    :rtype: IGraph
+    """
+    if graph_type is None:
+        from .csr_impl import CSRGraph
+        graph_type = CSRGraph
+    return graph_type.from_snapshot(read(path, mmap))
+
+
+def edge_arrays(snapshot):
+    """
+    Return the sources and the targets of the edges in snapshot.
+
+    Undirected edges are returned only once, with source <= target.
+    """
+    sources = np.repeat(np.arange(len(snapshot.indptr) - 1),
+                        np.diff(snapshot.indptr))
+    targets = np.asarray(snapshot.indices)
+    if not snapshot.directed:
+        keep = sources <= targets
+        sources, targets = sources[keep], targets[keep]
+    return sources, targets
+
+
+def read_nodes(path):
+    """
+    Reads the nodes of the snapshot in path, without the edges.
+
+    :return: the nodes, the number of rows and whether the graph is
+        directed
+    :rtype: (numpy.ndarray, int, bool)
+    """
+    with _open_arrays(path) as (arrays, directed):
+        size = arrays.length('indptr') - 1
+        if arrays.has('nodes'):
+            nodes = arrays.read('nodes')
+        else:
+            nodes = np.arange(size, dtype=np.int64)
+    return nodes, size, directed
+
+
+def iter_edges(path, chunk_size=1 << 16):
+    """
+    Yields the edges of the snapshot in path as pairs of arrays
+    (sources, targets), reading at most chunk_size column indices at a
+    time: only indptr is read whole, so that large graphs can be
+    loaded with memory proportional to the number of nodes.
+
+    Undirected edges are yielded only once, with source <= target.
+    """
+    with _open_arrays(path) as (arrays, directed):
+        indptr = arrays.read('indptr')
+        start = 0
+        for targets in arrays.chunks('indices', chunk_size):
+            positions = np.arange(start, start + len(targets))
+            sources = indptr.searchsorted(positions, side='right') - 1
+            start += len(targets)
+            targets = targets.astype(np.int64)
+            if not directed:
+                keep = sources <= targets
+                sources, targets = sources[keep], targets[keep]
+            yield sources, targets
+
+
+@contextlib.contextmanager
+def _open_arrays(path):
+    if _is_npz(path):
+        with contextlib.closing(zipfile.ZipFile(path)) as archive:
+            arrays = _NpzArrays(archive)
+            directed = (bool(arrays.read('directed'))
+                        if arrays.has('directed') else False)
+            yield arrays, directed
+    else:
+        import h5py
+
+        with h5py.File(path, 'r') as h5:
+            yield _H5Arrays(h5), bool(h5.attrs.get('directed', False))
+
+
+class _H5Arrays(object):
+    def __init__(self, h5):
+        self.h5 = h5
+
+    def has(self, name):
+        return name in self.h5
+
+    def length(self, name):
+        return len(self.h5[name])
+
+    def read(self, name):
+        return self.h5[name][...]
+
+    def chunks(self, name, chunk_size):
+        dataset = self.h5[name]
+        for start in xrange(0, len(dataset), chunk_size):
+            yield dataset[start:start + chunk_size]
+
+
+class _NpzArrays(object):
+    """
+    Reads the members of a npz archive (compressed or not) as streams.
+    """
+    def __init__(self, archive):
+        self.archive = archive
+
+    def has(self, name):
+        return name + '.npy' in self.archive.namelist()
+
+    @contextlib.contextmanager
+    def _open(self, name):
+        with contextlib.closing(self.archive.open(name + '.npy')) as member:
+            version = npy_format.read_magic(member)
+            if version == (1, 0):
+                header = npy_format.read_array_header_1_0(member)
+            else:
+                header = npy_format.read_array_header_2_0(member)
+            yield member, header
+
+    def length(self, name):
+        with self._open(name) as (_member, (shape, _fortran, _dtype)):
+            return shape[0]
+
+    def read(self, name):
+        with self._open(name) as (member, (shape, _fortran, dtype)):
+            count = int(np.prod(shape))
+            data = member.read(count * dtype.itemsize)
+        return np.frombuffer(data, dtype=dtype).reshape(shape).copy()
+
+    def chunks(self, name, chunk_size):
+        with self._open(name) as (member, (shape, _fortran, dtype)):
+            remaining = shape[0]
+            while remaining:
+                count = min(chunk_size, remaining)
+                data = member.read(count * dtype.itemsize)
+                remaining -= count
+                yield np.frombuffer(data, dtype=dtype)
@@ -0,0 +1,239 @@
+"""
+Policies deciding when idle nodes are hibernated.
+
+A node that has no messages to process may be stored in the agent db
+(and removed from memory) if its class allows it
+(:func:`pynetsym.core.Agent.can_be_collected`). Without a policy every
+idle node is hibernated as soon as possible; a
+:class:`MemoryBudgetPolicy` instead keeps nodes resident as long as
+the process is within its memory budget and, when it is not,
+hibernates the least recently active ones::
+
+    class Simulation(pynetsym.Simulation):
+        hibernation_policy_type = MemoryBudgetPolicy
+        hibernation_policy_parameters = dict(max_rss=2 ** 30)
+"""
+
+import collections
+import heapq
+import operator
+import os
+import time
+
+from traits.api import HasTraits, Interface, Instance, Either, Int, Float
+from traits.api import implements
+
+
+__all__ = [
+    'IHibernationPolicy',
+    'MemoryBudgetPolicy',
+    'current_rss',
+]
+
+
+def current_rss():
+    """
+    Return the resident set size of the process in bytes.
+
+    /proc/self/statm is used if available, then psutil; otherwise the
+    peak resident set size is returned.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on OS X, kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+    else:
+        return psutil.Process(os.getpid()).memory_info().rss
+
+
+class IHibernationPolicy(Interface):
+    def activity(self, agent):
+        """
+        Records that agent is processing a message.
+        """
+
+    def should_hibernate(self, agent):
+        """
+        Return whether agent, which is idle and can be collected,
+        should be hibernated now.
+        """
+
+    def idle(self, agent):
+        """
+        Records that agent, which should not hibernate now, is waiting
+        for messages. When it should hibernate, the policy wakes it up
+        calling its wake_up method.
+        """
+
+    def forget(self, agent):
+        """
+        Stops tracking agent (e.g., because it was killed).
+        """
+
+    def hibernate_all(self):
+        """
+        From now on, every idle agent should be hibernated (e.g.,
+        because the simulation ended).
+        """
+
+
+class MemoryBudgetPolicy(HasTraits):
+    """
+    Hibernates the least recently active nodes when memory is scarce.
+
+    The budget is either a number of resident agents (max_agents) or
+    the resident set size of the process (max_rss), or both. When the
+    budget is exceeded, idle agents are hibernated, least recently
+    active first, until the resident agents are back to low_water times
+    the budget.
+
+    Memory freed by hibernated agents is usually reused by the
+    interpreter rather than returned to the system, so when the RSS
+    exceeds max_rss the policy derives a cap on the resident agents
+    from the current ratio of memory per agent; the cap is lowered
+    again only if the RSS keeps growing, and removed when the RSS falls
+    below low_water times max_rss.
+
+    The memory is sampled at most once every sample_interval seconds,
+    when an agent goes idle; the samples (time, rss, resident agents)
+    are kept in samples. Idle agents that are kept resident wait for
+    messages without polling and are woken up when they are chosen
+    for hibernation.
+    """
+    implements(IHibernationPolicy)
+
+    max_agents = Either(None, Int)
+    max_rss = Either(None, Int)
+    low_water = Float(0.9)
+    sample_interval = Float(0.1)
+
+    hibernations = Int(0)
+    samples = Instance(collections.deque)
+
+    def __init__(self, max_agents=None, max_rss=None, low_water=0.9,
+                 sample_interval=0.1, max_samples=10000):
+        """
+        :param max_agents: maximum number of resident agents
+        :param max_rss: maximum resident set size in bytes
+        :param low_water: fraction of the budget that is restored when
+            the budget is exceeded
+        :param sample_interval: seconds between two memory samples
+        :param max_samples: how many samples are kept
+        """
+        self.max_agents = max_agents
+        self.max_rss = max_rss
+        self.low_water = low_water
+        self.sample_interval = sample_interval
+        self.samples = collections.deque(maxlen=max_samples)
+        self._last_active = {}
+        self._ticks = 0
+        self._victims = set()
+        self._idle = {}
+        self._last_sample = None
+        self._rss_cap = None
+        self._rss_at_cap = 0
+        self._hibernate_all = False
+        self._draining = False
+
+    @property
+    def resident(self):
+        """
+        The number of tracked resident agents.
+        """
+        return len(self._last_active)
+
+    def metrics(self):
+        """
+        Return a dictionary with the current state of the policy.
+        """
+        return dict(
+            resident=self.resident,
+            hibernations=self.hibernations,
+            rss=self.samples[-1][1] if self.samples else None,
+            rss_cap=self._rss_cap)
+
+    def activity(self, agent):
+        self._ticks += 1
+        self._last_active[agent.id] = self._ticks
+        self._idle.pop(agent.id, None)
+
+    def idle(self, agent):
+        self._idle[agent.id] = agent
+
+    def forget(self, agent):
+        self._last_active.pop(agent.id, None)
+        self._victims.discard(agent.id)
+        self._idle.pop(agent.id, None)
+
+    def hibernate_all(self):
+        self._hibernate_all = True
+        idle, self._idle = self._idle, {}
+        for agent in idle.itervalues():
+            agent.wake_up()
+
+    def should_hibernate(self, agent):
+        self._sample()
+        identifier = agent.id
+        if self._hibernate_all or identifier in self._victims:
+            self._victims.discard(identifier)
+            self._last_active.pop(identifier, None)
+            self.hibernations += 1
+            return True
+        return False
+
+    def _sample(self):
+        now = time.time()
+        if (self._last_sample is not None and
+                now - self._last_sample < self.sample_interval):
+            return
+        self._last_sample = now
+        resident = len(self._last_active)
+        rss = current_rss() if self.max_rss is not None else None
+        self.samples.append((now, rss, resident))
+
+        cap = self.max_agents
+        if rss is not None:
+            self._update_rss_cap(rss, resident)
+            if self._rss_cap is not None:
+                cap = (self._rss_cap if cap is None
+                       else min(cap, self._rss_cap))
+        if cap is None:
+            self._draining = False
+        elif resident > cap:
+            self._draining = True
+        elif resident <= int(cap * self.low_water):
+            self._draining = False
+        if self._draining:
+            excess = resident - int(cap * self.low_water)
+            self._victims = set(
+                identifier for identifier, _tick in heapq.nsmallest(
+                    excess, self._last_active.iteritems(),
+                    key=operator.itemgetter(1)))
+            for identifier in self._victims:
+                agent = self._idle.pop(identifier, None)
+                if agent is not None:
+                    agent.wake_up()
+        else:
+            self._victims = set()
+
+    def _update_rss_cap(self, rss, resident):
+        if rss > self.max_rss:
+            if self._rss_cap is None or rss > self._rss_at_cap:
+                cap = int(resident * float(self.max_rss) / rss)
+                self._rss_cap = (cap if self._rss_cap is None
+                                 else min(cap, self._rss_cap))
+                self._rss_at_cap = rss
+        elif rss < self.low_water * self.max_rss:
+            self._rss_cap = None
+            self._rss_at_cap = 0
@@ -1,20 +1,26 @@
-from bisect import bisect_left
 from heapq import heappop, heappush
-import itertools as it
+
 
 class IntIdentifierStore(object):
     """
     An free identifier store can be queried for the smallest free identifier.
+
+    Identifiers below the upper bound that have been freed are kept in a
+    min-heap; a set mirrors the heap for membership queries. Entries that
+    become stale (because the upper bound regressed below them) are
+    discarded lazily, so :meth:`take`, :meth:`free` and :meth:`peek` run
+    in O(log n) amortized time.
     """
 
     def __init__(self):
         self._upper_identifier = 0
         self._holes = []
+        self._hole_set = set()
 
-    def _clean_holes(self):
-        self._holes = list(it.takewhile(
-            lambda x: x < self._upper_identifier,
-            self._holes))
+    def _discard_stale_holes(self):
+        holes = self._holes
+        while holes and holes[0] not in self._hole_set:
+            heappop(holes)
 
     def take(self):
         """
@@ -23,13 +29,35 @@ class IntIdentifierStore(object):
         :return: the lowest possible index
         :rtype: int
         """
+        self._discard_stale_holes()
         if self._holes:
-            return heappop(self._holes)
+            identifier = heappop(self._holes)
+            self._hole_set.remove(identifier)
+            return identifier
         else:
             tmp = self._upper_identifier
             self._upper_identifier += 1
             return tmp
 
+    def take_many(self, how_many):
+        """
+        Takes how_many identifiers at once.
+
+        Free identifiers below the upper bound are used first (lowest
+        first), the remaining ones are a contiguous range.
+
+        :param how_many: the number of identifiers to take
+        :return: the identifiers in increasing order
+        :rtype: list
+        """
+        identifiers = []
+        while len(identifiers) < how_many and self._hole_set:
+            identifiers.append(self.take())
+        start = self._upper_identifier
+        self._upper_identifier += how_many - len(identifiers)
+        identifiers.extend(xrange(start, self._upper_identifier))
+        return identifiers
+
     def peek(self):
         """
         Return the lowest available index.
@@ -37,21 +65,12 @@ class IntIdentifierStore(object):
         :return: the lowest possible index
         :rtype: int
         """
+        self._discard_stale_holes()
         if self._holes:
             return self._holes[0]
         else:
             return self._upper_identifier
 
-    def _is_in_holes(self, identifier):
-        if not self._holes:
-            return False
-        possible_index = bisect_left(self._holes, identifier)
-        if (possible_index < len(self._holes)
-            and self._holes[possible_index] == identifier):
-            return True
-        else:
-            return False
-
     def free(self, identifier):
         """
         Frees the identifier.
@@ -62,13 +81,24 @@ class IntIdentifierStore(object):
             raise ValueError(
                 "Identifier should be > 0 (%s instead)" % identifier)
         elif (identifier < self._upper_identifier
-              and not self._is_in_holes(identifier)):
+              and identifier not in self._hole_set):
+            self._hole_set.add(identifier)
             heappush(self._holes, identifier)
             self._try_regress_upper()
+            if len(self._holes) > 2 * len(self._hole_set) + 64:
+                # too many stale entries: a sorted list is a valid heap
+                self._holes = sorted(self._hole_set)
 
-    def _try_regress_upper(self):
-        while self._holes and self._holes[-1] == self._upper_identifier - 1:
-            del self._holes[-1]
-            self._upper_identifier -= 1
+    def free_many(self, identifiers):
+        """
+        Frees all the identifiers.
 
+        :param identifiers: the identifiers to mark as free
+        """
+        for identifier in sorted(identifiers):
+            self.free(identifier)
 
+    def _try_regress_upper(self):
+        while (self._upper_identifier - 1) in self._hole_set:
+            self._upper_identifier -= 1
+            self._hole_set.remove(self._upper_identifier)
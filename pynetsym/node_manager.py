@@ -1,7 +1,10 @@
+import itertools
+
 from gevent.pool import Group
 from traits.trait_types import   Instance
 
 from pynetsym import core
+from pynetsym import addressing
 
 from pynetsym.identifiers_manager import IntIdentifierStore
 
@@ -15,29 +18,53 @@ class NodeManager(core.Agent):
     the registered name in the :class:`addressing.AddressBook`
     """
 
-    def __init__(self, graph):
+    def __init__(self, graph, state_store=None, hibernation_policy=None):
         """
         Creates a new node_manager
 
         :param graph: the graph to pass to the agents
         :type graph: storage.GraphWrapper
+        :param state_store: where the nodes keep their columns
+        :type state_store: :class:`pynetsym.node_state.NodeStateStore`
+        :param hibernation_policy: decides when idle nodes hibernate;
+            if None they hibernate as soon as they are idle
+        :type hibernation_policy:
+            :class:`pynetsym.hibernation.IHibernationPolicy`
         """
         self.graph = graph
+        self.state_store = state_store
+        self.hibernation_policy = hibernation_policy
         self.failures = []
         self.group = Group()
 
     def setup_node(self, node, greenlet):
         greenlet.link_value(node.deactivate_node)
         node.graph = self.graph
+        if self.state_store is not None:
+            node.bind_state_store(self.state_store)
+        if self.hibernation_policy is not None:
+            node.hibernation_policy = self.hibernation_policy
+            self.hibernation_policy.activity(node)
         self.group.add(greenlet)
 
     def unset_node(self, node, greenlet):
-        del node.graph
         self.group.discard(greenlet)
+        if node._greenlet is not None and node._greenlet is not greenlet:
+            # the very same node object was awakened again (e.g., from
+            # a CachedAgentDB) before this callback was run
+            return
+        del node.graph
 
         if isinstance(greenlet.value, core.GreenletExit):
             self.graph.remove_node(node.id)
-            print 'Removing', node.id
+            if self.state_store is not None:
+                self.state_store.remove_row(node.id)
+            if self.hibernation_policy is not None:
+                self.hibernation_policy.forget(node)
+            try:
+                self._address_book.unregister(node.id)
+            except addressing.AddressingError:
+                pass
 
     def create_node(self, cls, parameters):
         """
@@ -55,7 +82,74 @@ class NodeManager(core.Agent):
         node.start(self._address_book, self._node_db, identifier)
         return identifier
 
+    def create_nodes(self, cls, how_many, parameters):
+        """
+        Creates how_many nodes of the same kind.
+
+        Identifiers are allocated at once with the graph add_nodes,
+        which is much faster than sending a create_node message for
+        every node.
+
+        :param cls: the factory creating the new nodes.
+        :type cls: callable
+        :param how_many: the number of nodes to create
+        :type how_many: int
+        :param parameters: the parameters that are forwarded to every node
+        :type parameters: dict
+        :return: the identifiers of the nodes
+        :rtype: list
+        """
+        return self.create_nodes_from(
+            itertools.repeat((cls, parameters), how_many))
+
+    def create_nodes_from(self, specifications):
+        """
+        Creates a node for each (cls, parameters) pair in specifications.
+
+        :param specifications: the factories and the parameters of the
+            nodes to create
+        :type specifications: iterable
+        :return: the identifiers of the nodes, in the same order
+        :rtype: list
+        """
+        specifications = list(specifications)
+        identifiers = self.graph.add_nodes(len(specifications))
+        address_book, node_db = self._address_book, self._node_db
+        for (cls, parameters), identifier in itertools.izip(
+                specifications, identifiers):
+            node = cls(**parameters)
+            node.start(address_book, node_db, identifier)
+        return identifiers
+
+    def declare_nodes(self, cls, how_many, parameters):
+        """
+        Like :func:`NodeManager.create_nodes`, but the agents are created
+        only when the first message addressed to them is sent.
+
+        The nodes are added to the graph (and to the state store)
+        immediately. This requires an agent db supporting lazy
+        creation (e.g., :class:`pynetsym.agent_db.LazyAgentDB`);
+        otherwise the nodes are created at once.
+
+        :return: the identifiers of the nodes
+        :rtype: list
+        """
+        if not hasattr(self._node_db, 'add_factory'):
+            return self.create_nodes(cls, how_many, parameters)
+        identifiers = self.graph.add_nodes(how_many)
+        if self.state_store is not None:
+            self.state_store.declare(cls)
+            self.state_store.add_rows(identifiers)
+        self._node_db.add_factory(identifiers, cls, parameters)
+        return identifiers
+
     def simulation_ended(self):
+        if self.hibernation_policy is not None:
+            self.hibernation_policy.hibernate_all()
         self.group.join()
+        # e.g., the last batch of an SQLiteAgentDB
+        commit = getattr(self._node_db, 'commit', None)
+        if commit is not None:
+            commit()
 
 
@@ -0,0 +1,316 @@
+"""
+Columnar storage for the state of the nodes.
+
+Attributes declared as :class:`Column` traits do not live in the node
+objects: the values of all the nodes are kept in a :class:`NodeStateStore`,
+one NumPy array per attribute, indexed by node identifier. Nodes are
+just views on their row, so that aggregates over the whole network
+can be computed with vectorized reductions::
+
+    class Node(pynetsym.Node):
+        state = Column('S', values=('S', 'I', 'R'))
+        infection_rate = Column(1.0)
+
+    class Simulation(pynetsym.Simulation):
+        node_state_store_type = NodeStateStore
+
+    ...
+    infected = simulation.node_state_store.count('state', 'I')
+
+If no store is configured, columns behave as ordinary attributes.
+"""
+
+import collections
+
+import numpy as np
+
+from traits.api import HasTraits, TraitType, TraitError, Dict, Int
+
+
+__all__ = [
+    'Column',
+    'NodeStateStore',
+]
+
+
+class Column(TraitType):
+    """
+    A node attribute stored in a column of a :class:`NodeStateStore`.
+
+    Numeric columns use the dtype of the default value (or the dtype
+    argument); enumerated columns store the position of the value among
+    values in the smallest suitable unsigned type.
+    """
+
+    def __init__(self, default_value=0, dtype=None, values=None,
+                 **metadata):
+        """
+        :param default_value: the value of rows never written
+        :param dtype: the numpy dtype of the column
+        :param values: the admissible values of an enumerated column
+        """
+        if values is not None:
+            values = tuple(values)
+            if default_value not in values:
+                default_value = values[0]
+            self.values = values
+            self.codes = dict(
+                (value, code) for code, value in enumerate(values))
+            self.dtype = np.min_scalar_type(len(values) - 1)
+            self.fill = self.codes[default_value]
+        else:
+            self.values = None
+            self.dtype = np.dtype(
+                type(default_value) if dtype is None else dtype)
+            self.fill = default_value
+        metadata.setdefault('transient', True)
+        super(Column, self).__init__(default_value, **metadata)
+
+    def encode(self, obj, name, value):
+        if self.values is None:
+            return value
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError):
+            self.error(obj, name, value)
+
+    def get(self, obj, name):
+        store = obj.state_store
+        if store is None:
+            return obj._column_values.get(name, self.default_value)
+        code = store.column(name, self)[obj.id]
+        if self.values is None:
+            return code.item()
+        return self.values[code]
+
+    def set(self, obj, name, value):
+        code = self.encode(obj, name, value)
+        store = obj.state_store
+        if store is None:
+            obj._column_values[name] = value
+        else:
+            try:
+                store.write(name, self, obj.id, code)
+            except (ValueError, TypeError):
+                raise TraitError(
+                    'The %r column cannot hold %r.' % (name, value))
+
+
+class NodeStateStore(HasTraits):
+    """
+    Keeps the :class:`Column` attributes of the nodes in NumPy arrays.
+
+    Rows are indexed by node identifier; only rows of nodes that are
+    in the simulation (possibly hibernated) are marked as alive.
+    Arrays grow geometrically, so the arrays returned by :meth:`column`
+    must not be kept across node creations.
+
+    The number of alive nodes having each value of a column can be
+    maintained as nodes change (see :meth:`track`), so that counting
+    costs O(1); values written directly in the arrays returned by
+    :meth:`column` are not tracked.
+    """
+    capacity = Int(0)
+    columns = Dict
+
+    def __init__(self, capacity=1024):
+        self._columns = {}
+        self._fills = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._declared = set()
+        self._tracked = {}
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity)
+        for name, array in self._columns.iteritems():
+            self._columns[name] = self._resize(
+                array, capacity, self._fills[name])
+        self._alive = self._resize(self._alive, capacity, False)
+        self.capacity = capacity
+
+    def _resize(self, array, capacity, fill):
+        resized = np.empty(capacity, dtype=array.dtype)
+        resized[:len(array)] = array
+        resized[len(array):] = fill
+        return resized
+
+    def column(self, name, column=None):
+        """
+        Return the array holding the column name.
+
+        :param name: the name of the attribute
+        :param column: the :class:`Column` trait, used to create
+            the array the first time
+        :raise KeyError: if the column does not exist and no trait
+            was specified
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            if column is None:
+                raise
+            array = np.empty(self.capacity, dtype=column.dtype)
+            array[:] = column.fill
+            self._columns[name] = array
+            self._fills[name] = column.fill
+            self.columns[name] = column
+            if name in self._tracked:
+                self._recount(name)
+            return array
+
+    def get_state(self):
+        """
+        Return the arrays of the store (e.g., for a checkpoint).
+        """
+        return dict(
+            columns=dict((name, array.copy())
+                         for name, array in self._columns.iteritems()),
+            fills=dict(self._fills),
+            traits=dict(self.columns),
+            alive=self._alive.copy(),
+            tracked=list(self._tracked))
+
+    def set_state(self, state):
+        """
+        Replaces the arrays of the store with those returned by
+        :meth:`get_state`.
+        """
+        self._columns = dict((name, array.copy())
+                             for name, array in state['columns'].iteritems())
+        self._fills = dict(state['fills'])
+        self.columns = dict(state['traits'])
+        self._alive = state['alive'].copy()
+        self.capacity = len(self._alive)
+        self._declared = set()
+        self._tracked = {}
+        for name in state['tracked']:
+            self.track(name)
+
+    def write(self, name, column, node, code):
+        """
+        Writes the (encoded) value of column name for node.
+        """
+        array = self.column(name, column)
+        counts = self._tracked.get(name)
+        if counts is None or not self._alive[node]:
+            array[node] = code
+        else:
+            previous = array[node].item()
+            array[node] = code
+            counts[previous] -= 1
+            counts[array[node].item()] += 1
+
+    def track(self, name):
+        """
+        Maintains the number of alive nodes having each value of
+        column name, so that :meth:`count` and :meth:`distribution`
+        do not scan the column.
+
+        The column need not exist yet.
+        """
+        if name not in self._tracked:
+            self._tracked[name] = collections.Counter()
+            if name in self._columns:
+                self._recount(name)
+
+    def _recount(self, name):
+        codes, counts = np.unique(self.values(name), return_counts=True)
+        self._tracked[name] = collections.Counter(
+            dict(zip(codes.tolist(), counts.tolist())))
+
+    def _count_rows(self, nodes, sign):
+        for name, counts in self._tracked.iteritems():
+            if name in self._columns:
+                codes, how_many = np.unique(
+                    self._columns[name][nodes], return_counts=True)
+                for code, count in zip(codes.tolist(), how_many.tolist()):
+                    counts[code] += sign * count
+
+    def declare(self, cls):
+        """
+        Creates the arrays for all the :class:`Column` traits of cls.
+        """
+        if cls not in self._declared:
+            for name, trait in cls.class_traits().iteritems():
+                if isinstance(trait.trait_type, Column):
+                    self.column(name, trait.trait_type)
+            self._declared.add(cls)
+
+    def add_row(self, node):
+        """
+        Marks the row of node as alive.
+        """
+        if node >= self.capacity:
+            self._grow(node + 1)
+        if not self._alive[node]:
+            self._alive[node] = True
+            if self._tracked:
+                self._count_rows([node], 1)
+
+    def add_rows(self, nodes):
+        """
+        Marks the rows of all the nodes as alive.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if len(nodes):
+            self._grow(int(nodes.max()) + 1)
+            if self._tracked:
+                fresh = np.unique(nodes[~self._alive[nodes]])
+                self._count_rows(fresh, 1)
+            self._alive[nodes] = True
+
+    def remove_row(self, node):
+        """
+        Resets the row of node to the default values.
+        """
+        if self._tracked and self._alive[node]:
+            self._count_rows([node], -1)
+        self._alive[node] = False
+        for name, array in self._columns.iteritems():
+            array[node] = self._fills[name]
+
+    @property
+    def alive(self):
+        """
+        Boolean mask of the rows of nodes in the simulation.
+        """
+        return self._alive
+
+    def values(self, name):
+        """
+        Return the raw values of the alive nodes for column name.
+
+        Enumerated columns are returned as codes.
+        """
+        return self._columns[name][self._alive]
+
+    def count(self, name, value):
+        """
+        Counts the alive nodes whose attribute name equals value.
+        """
+        code = self.columns[name].encode(None, name, value)
+        counts = self._tracked.get(name)
+        if counts is not None:
+            return counts[code]
+        return int(np.count_nonzero(self.values(name) == code))
+
+    def distribution(self, name):
+        """
+        Return a dictionary from each value of attribute name to the
+        number of alive nodes having it.
+        """
+        tracked = self._tracked.get(name)
+        if tracked is not None:
+            pairs = [(code, count) for code, count in tracked.iteritems()
+                     if count]
+        else:
+            codes, counts = np.unique(self.values(name),
+                                      return_counts=True)
+            pairs = zip(codes.tolist(), counts.tolist())
+        column = self.columns[name]
+        if column.values is not None:
+            pairs = [(column.values[code], count) for code, count in pairs]
+        return dict(pairs)
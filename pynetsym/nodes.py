@@ -1,8 +1,11 @@
+import gevent.event as event
 import traits.api as t
 
 import pynetsym.core as core
 from pynetsym import graph
 from pynetsym.node_manager import NodeManager
+from pynetsym.node_state import NodeStateStore
+from pynetsym.hibernation import IHibernationPolicy
 
 __all__ = [
     'Node'
@@ -16,6 +19,10 @@ class Node(core.Agent):
 
     graph = t.Trait(graph.IGraph, transient=True, allow_none=False)
     _node_manager = t.Trait(NodeManager, transient=True, allow_none=False)
+    state_store = t.Instance(NodeStateStore, transient=True)
+    _column_values = t.Dict(transient=True)
+    hibernation_policy = t.Instance(IHibernationPolicy, transient=True)
+    _wake_up = t.Instance(event.Event, transient=True)
 
     #_ = t.Disallow()
 
@@ -26,7 +33,25 @@ class Node(core.Agent):
         :type graph: storage.GraphWrapper
         :return: the Node
         """
-        self.set(**attributes)
+        self.trait_set(**attributes)
+
+    def __getstate__(self):
+        state = super(Node, self).__getstate__()
+        if self.state_store is None:
+            state.update(self._column_values)
+        return state
+
+    def bind_state_store(self, state_store):
+        """
+        Moves the :class:`pynetsym.node_state.Column` attributes of this
+        node to its row in state_store.
+        """
+        state_store.declare(type(self))
+        state_store.add_row(self.id)
+        self.state_store = state_store
+        column_values, self._column_values = self._column_values, {}
+        for name, value in column_values.iteritems():
+            setattr(self, name, value)
 
     def deactivate_node(self, greenlet):
         self._node_manager.unset_node(self, greenlet)
@@ -109,3 +134,37 @@ class Node(core.Agent):
             you are doing.
         """
         return True
+
+    def should_hibernate(self):
+        policy = self.hibernation_policy
+        return policy is None or policy.should_hibernate(self)
+
+    def wait_idle(self):
+        """
+        Blocks until a message arrives or the hibernation policy wakes
+        the node up (see :func:`Node.wake_up`).
+        """
+        policy = self.hibernation_policy
+        if policy is None:
+            return
+        self._wake_up = event.Event()
+        policy.idle(self)
+        self._wake_up.wait()
+        self._wake_up = None
+
+    def wake_up(self):
+        """
+        Makes an idle node check again whether it should hibernate.
+        """
+        if self._wake_up is not None:
+            self._wake_up.set()
+
+    def deliver(self, message, result):
+        super(Node, self).deliver(message, result)
+        self.wake_up()
+
+    def process(self, message, result):
+        policy = self.hibernation_policy
+        if policy is not None:
+            policy.activity(self)
+        return super(Node, self).process(message, result)
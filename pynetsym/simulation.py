@@ -1,9 +1,21 @@
+import collections
 import sys
 import operator
+import numbers
+import time
+from heapq import heappop, heappush
 
 import gevent
+try:
+    from gevent.lock import Semaphore
+except ImportError:
+    # gevent < 1.0
+    from gevent.coros import Semaphore
 from gevent.greenlet import LinkedCompleted
 
+from traits.api import Callable
+from traits.api import Either
+from traits.api import Float
 from traits.api import Int
 from traits.api import List
 from traits.api import true
@@ -13,15 +25,15 @@ from traits.api import Instance
 from pynetsym import addressing, Logger
 from pynetsym import graph
 from pynetsym import agent_db
+from pynetsym import checkpoint
 from pynetsym import configuration
 from pynetsym import core
 from pynetsym import termination
 from pynetsym import timing
 
-from pynetsym.util import SequenceAsyncResult
 from pynetsym.util import gather_from_ancestors
 
-from pynetsym.agent_db import JSONPickler
+from pynetsym.agent_db import SchemaPickler
 from pynetsym.node_manager import NodeManager
 from pynetsym.termination import TerminationChecker
 from pynetsym.util.component_builder import ComponentBuilder
@@ -31,7 +43,10 @@ __all__ = [
     'Simulation',
     'Activator',
     'AsyncClock',
-    'Clock'
+    'Clock',
+    'FastClock',
+    'ScheduledActivator',
+    'WindowedActivator',
 ]
 
 
@@ -55,9 +70,26 @@ class Activator(core.Agent):
         the nodes chosen by :func:`Activator.nodes_to_activate`.
         """
         node_ids = self.nodes_to_activate()
+        if hasattr(self._node_db, 'prefetch'):
+            node_ids = list(node_ids)
+            self.prefetch_nodes(node_ids)
         for node_id in node_ids:
             self.send(node_id, 'activate')
 
+    def prefetch_nodes(self, node_ids):
+        """
+        Asks the agent db to load at once the hibernated nodes
+        among node_ids, so that they are not recovered one by one.
+        """
+        hibernated = []
+        for node_id in node_ids:
+            try:
+                self._address_book.resolve(node_id)
+            except addressing.AddressingError:
+                hibernated.append(node_id)
+        if hibernated:
+            self._node_db.prefetch(hibernated)
+
     def destroy_nodes(self):
         """
         At each step is called to send the `kill` message to
@@ -80,12 +112,13 @@ class Activator(core.Agent):
         The collection of nodes just created is kept in an
         attribute named `fresh_nodes`.
         """
-        to_create = self.nodes_to_create()
-        node_ids = SequenceAsyncResult(
-            [self.send(NodeManager.name, 'create_node',
-                       cls=node_class, parameters=node_parameters)
-             for node_class, node_parameters in to_create])
-        self.fresh_nodes = node_ids.get()
+        to_create = list(self.nodes_to_create())
+        if not to_create:
+            self.fresh_nodes = []
+            return
+        self.fresh_nodes = self.sync_send(
+            NodeManager.name, 'create_nodes_from',
+            specifications=to_create)
 
     def simulation_ended(self):
         """
@@ -113,6 +146,37 @@ class Activator(core.Agent):
         self.create_nodes()
         self.activate_nodes()
 
+    def run_ticks(self, requester, ticks_per_quantum=1, callbacks=(),
+                  first_tick=0):
+        """
+        Runs the whole simulation inside this message (see
+        :class:`FastClock`).
+
+        Before every tick the messages received in the meantime are
+        processed and the callbacks are called with the number of the
+        tick; after every tick the termination conditions are checked
+        in-process. Control is released every ticks_per_quantum ticks.
+
+        :param requester: the agent notified of the termination
+        :param first_tick: the number of ticks already run (e.g., before
+            a checkpoint)
+        :return: the number of ticks
+        """
+        checker = self._resolve(TerminationChecker.name)
+        ticks = first_tick
+        while 1:
+            for _tick in xrange(ticks_per_quantum):
+                self.process_pending()
+                ticks += 1
+                for callback in callbacks:
+                    callback(ticks)
+                self.tick()
+                if checker.check(requester):
+                    # the checker is still waiting for messages
+                    self.send(TerminationChecker.name, 'stop')
+                    return ticks
+            self.cooperate()
+
     def signal_termination(self, reason):
         self.send(TerminationChecker.name, 'require_termination',
                   reason=reason).get()
@@ -157,6 +221,170 @@ class SyncActivator(Activator):
             done.get()
 
 
+class WindowedActivator(Activator):
+    """
+    This Activator variant keeps at most window activations in flight.
+
+    With a window of 1 it behaves as :class:`SyncActivator`; larger
+    windows let the activated nodes interleave, trading fidelity (the
+    order in which the activations take effect) for throughput. A
+    window of None does not limit the activations of a tick. In any
+    case, all the activations of a tick are completed before the tick
+    ends.
+
+    For every tick the number of activations and the elapsed time
+    are appended to samples (the last max_samples ticks are kept):
+    :func:`WindowedActivator.metrics` summarizes them.
+    """
+    window = Either(None, Int, default=8)
+    max_samples = Int(10000)
+    samples = Instance(collections.deque, transient=True)
+
+    def __init__(self, **traits):
+        super(WindowedActivator, self).__init__(**traits)
+        self.samples = collections.deque(maxlen=self.max_samples)
+
+    def activate_nodes(self):
+        node_ids = self.nodes_to_activate()
+        if hasattr(self._node_db, 'prefetch'):
+            node_ids = list(node_ids)
+            self.prefetch_nodes(node_ids)
+        start = time.time()
+        if self.window is None:
+            answers = [self.send(node_id, 'activate')
+                       for node_id in node_ids]
+        else:
+            window = Semaphore(self.window)
+            release = lambda _answer: window.release()
+            answers = []
+            for node_id in node_ids:
+                window.acquire()
+                answer = self.send(node_id, 'activate')
+                answer.rawlink(release)
+                answers.append(answer)
+        for answer in answers:
+            try:
+                answer.get()
+            except addressing.AddressingError:
+                pass
+        self.samples.append((len(answers), time.time() - start))
+
+    def metrics(self):
+        """
+        Return a dictionary with the number of recorded ticks, the
+        activations, the mean latency of a tick (in seconds) and the
+        throughput (activations per second) over the recorded ticks.
+        """
+        activations = sum(sample[0] for sample in self.samples)
+        elapsed = sum(sample[1] for sample in self.samples)
+        ticks = len(self.samples)
+        return dict(
+            ticks=ticks,
+            activations=activations,
+            latency=elapsed / ticks if ticks else None,
+            throughput=activations / elapsed if elapsed else None)
+
+
+class ScheduledActivator(Activator):
+    """
+    Activator that activates the nodes at the times they asked to be
+    woken up.
+
+    Every node has at most one pending wake-up time: scheduling a node
+    again replaces the previous time. At each tick the activator moves
+    current_time to the earliest wake-up time and activates all the
+    nodes due at that time, so that the cost of a step depends only on
+    the events that actually happen (as in next-event or Gillespie
+    simulations). Times can be integers or real numbers.
+
+    A node can ask to be woken up either by sending a 'schedule'
+    message to the activator or by returning the delay (a number)
+    from its activate method; activations are waited for before moving
+    on, so the new times are known before the next tick (hence, nodes
+    must not wait for answers of the activator while activated). When
+    there are no more events, the termination of the simulation is
+    required.
+    """
+    current_time = Float(0.0)
+
+    def __init__(self, **traits):
+        super(ScheduledActivator, self).__init__(**traits)
+        self._events = []
+        self._scheduled = {}
+        self._sequence = 0
+
+    def schedule(self, node, delay=None, at=None):
+        """
+        Wakes node up at time at or delay after the current time;
+        if neither is specified, at the next unit of time.
+
+        Times in the past are moved to the current time.
+        """
+        if at is None:
+            at = self.current_time + (1 if delay is None else delay)
+        at = max(at, self.current_time)
+        self._sequence += 1
+        self._scheduled[node] = self._sequence
+        heappush(self._events, (at, self._sequence, node))
+
+    def unschedule(self, node):
+        """
+        Removes the pending wake-up time of node, if any.
+        """
+        self._scheduled.pop(node, None)
+
+    def _discard_stale_events(self):
+        events = self._events
+        while events and self._scheduled.get(events[0][2]) != events[0][1]:
+            heappop(events)
+
+    def next_event_time(self):
+        """
+        Return the earliest wake-up time, or None if nothing is scheduled.
+        """
+        self._discard_stale_events()
+        return self._events[0][0] if self._events else None
+
+    def pending_events(self):
+        """
+        Return the number of nodes waiting to be woken up.
+        """
+        return len(self._scheduled)
+
+    def tick(self):
+        next_time = self.next_event_time()
+        if next_time is None:
+            self.signal_termination('No more events')
+        else:
+            self.current_time = next_time
+            super(ScheduledActivator, self).tick()
+
+    def nodes_to_activate(self):
+        due = []
+        events = self._events
+        while events and events[0][0] <= self.current_time:
+            _at, sequence, node = heappop(events)
+            if self._scheduled.get(node) == sequence:
+                del self._scheduled[node]
+                due.append(node)
+        return due
+
+    def activate_nodes(self):
+        node_ids = self.nodes_to_activate()
+        if hasattr(self._node_db, 'prefetch'):
+            self.prefetch_nodes(node_ids)
+        answers = [(node_id, self.send(node_id, 'activate'))
+                   for node_id in node_ids]
+        for node_id, answer in answers:
+            try:
+                delay = answer.get()
+            except addressing.AddressingError:
+                continue
+            if (isinstance(delay, numbers.Real) and
+                    not isinstance(delay, bool)):
+                self.schedule(node_id, delay=delay)
+
+
 class BaseClock(core.Agent):
     """
     Basic clock.
@@ -173,6 +401,8 @@ class BaseClock(core.Agent):
 
     active = true(transient=True)
     observers = List
+    ticks = Int(0)
+    callbacks = List(Callable, transient=True)
 
     def register_observer(self, name):
         self.observers.append(name)
@@ -180,6 +410,18 @@ class BaseClock(core.Agent):
     def unregister_observer(self, name):
         self.observers.remove(name)
 
+    def register_callback(self, callback):
+        """
+        callback is called with the number of the tick before every tick.
+
+        Callbacks are called only by clocks that wait for the ticks
+        (i.e., not by :class:`AsyncClock`).
+        """
+        self.callbacks.append(callback)
+
+    def unregister_callback(self, callback):
+        self.callbacks.remove(callback)
+
     def join(self):
         try:
             return super(BaseClock, self).join()
@@ -239,6 +481,10 @@ class Clock(BaseClock):
     """
     def clock_loop(self):
         while self.active:
+            tick = self.ticks + 1
+            for callback in self.callbacks:
+                callback(tick)
+            self.ticks = tick
             waiting = self.send_tick()
             waiting.get()
             should_terminate = self.ask_to_terminate()
@@ -247,6 +493,45 @@ class Clock(BaseClock):
             self.simulation_end()
 
 
+class FastClock(BaseClock):
+    """
+    Synchronous Clock without per tick messages.
+
+    The whole loop runs inside the activator (see
+    :func:`Activator.run_ticks`): ticks and termination checks are
+    plain method calls, so models with cheap steps are not dominated by
+    the messaging overhead. Ticks happen in the same order as with
+    :class:`Clock`.
+
+    Observers registered with :func:`BaseClock.register_observer` still
+    receive a ticked message; cheaper observers can be registered with
+    :func:`BaseClock.register_callback`.
+
+    With ticks_per_quantum greater than one, the other agents (e.g.,
+    the activated nodes) run only every ticks_per_quantum ticks.
+    """
+    ticks_per_quantum = Int(1)
+
+    def _count_tick(self, tick):
+        self.ticks = tick
+
+    def _notify_observers(self, _tick):
+        for observer in self.observers:
+            self.send(observer, 'ticked')
+
+    def clock_loop(self):
+        callbacks = list(self.callbacks)
+        if self.observers:
+            callbacks.insert(0, self._notify_observers)
+        callbacks.append(self._count_tick)
+        self.send(Activator.name, 'run_ticks',
+                  requester=self.name,
+                  ticks_per_quantum=self.ticks_per_quantum,
+                  callbacks=callbacks,
+                  first_tick=self.ticks).get()
+        self.simulation_end()
+
+
 class AdditionalAgentComponentBuilder(ComponentBuilder):
     """
     Utility class that the :class:`Simulation` uses to create
@@ -343,13 +628,22 @@ class Simulation(object):
     logger_type = Logger
     termination_checker_type = TerminationChecker
     configurator_type = None
-    agent_db_type = agent_db.AgentDB
+    agent_db_type = agent_db.CachedAgentDB
+    node_state_store_type = None
+    hibernation_policy_type = None
+    checkpointer_type = None
+    configuration_cache = None
+    """
+    A :class:`pynetsym.configuration_cache.ConfigurationCache` shared by
+    the simulations that start from the same configuration, or None.
+    """
 
     @property
     def agent_db_parameters(self):
         return dict(
-            pickling_module=JSONPickler(),
-            storage=dict())
+            agent_db=agent_db.AgentDB(
+                pickling_module=SchemaPickler(),
+                storage=dict()))
 
     @property
     def termination_checker_conditions(self):
@@ -459,7 +753,7 @@ class Simulation(object):
         Use address_book_type to customize the kind.
         Use address_book_options to specify which arguments need to be passed.
         """
-        node_address_book = addressing.FlatAddressBook()
+        node_address_book = addressing.IntAddressBook()
         main_address_book = addressing.FlatAddressBook()
         self.address_book = addressing.AutoResolvingAddressBook(
             main=main_address_book, node=node_address_book)
@@ -513,7 +807,16 @@ class Simulation(object):
 
         The graph must have been created before calling this.
         """
-        self.node_manager = NodeManager(self.graph)
+        if self.node_state_store_type is None:
+            self.node_state_store = None
+        else:
+            ComponentBuilder(self, 'node_state_store').build(set_=True)
+        if self.hibernation_policy_type is None:
+            self.hibernation_policy = None
+        else:
+            ComponentBuilder(self, 'hibernation_policy').build(set_=True)
+        self.node_manager = NodeManager(
+            self.graph, self.node_state_store, self.hibernation_policy)
 
     def create_service_agents(self):
         """
@@ -595,13 +898,28 @@ class Simulation(object):
             else:
                 component.start(self.address_book, self.agent_db)
 
+    def create_checkpointer(self):
+        """
+        Creates the checkpointer, if checkpointer_type is not None,
+        and attaches it to the clock.
+
+        See :class:`pynetsym.checkpoint.PeriodicCheckpointer`.
+        """
+        if self.checkpointer_type is None:
+            self.checkpointer = None
+        else:
+            ComponentBuilder(self, 'checkpointer').build(set_=True)
+            self.checkpointer.attach(self)
+
     def create_simulation_agents(self):
         """
-        Creates the Activator, the Clock and the additional agents.
+        Creates the Activator, the Clock, the additional agents and
+        the checkpointer.
         """
         self.create_activator()
         self.create_clock()
         self.create_additional_agents()
+        self.create_checkpointer()
 
     def start_simulation(self):
         self.clock.start_clock()
@@ -638,20 +956,114 @@ class Simulation(object):
             self.update_parameters(kwargs)
 
         self.setup()
+        configuration = self.cached_configuration()
 
         print 'Initial setup...'
         self.create_service_agents()
         self.create_simulation_agents()
         print 'Configuring network...'
         with timing.Timer(self.callback):
-            self.pre_configure_network()
+            if configuration is None:
+                self.pre_configure_network()
+                if self.configuration_cache is not None:
+                    self.configuration_cache.store(self)
+            else:
+                self.restore_configuration(configuration)
         print 'Starting simulation...'
         with timing.Timer(self.callback):
-            self.start_simulation()
-            self.clock.join()
+            return self.run_simulation()
+
+    def cached_configuration(self):
+        """
+        Looks up the configuration of the network in the configuration
+        cache. If it is there, the graph is replaced with the cached
+        one and the configuration is returned, to be restored by
+        :func:`Simulation.restore_configuration` instead of configuring
+        the network.
+
+        :rtype: :class:`pynetsym.checkpoint.Checkpoint` | None
+        """
+        if self.configuration_cache is None:
+            return None
+        configuration = self.configuration_cache.get(self)
+        if configuration is not None:
+            self._simulation_parameters['graph'] = checkpoint.restore_graph(
+                self, configuration)
+        return configuration
+
+    def restore_configuration(self, configuration):
+        """
+        Starts the NodeManager and restores the nodes, the agent db and
+        the node state store of a cached configuration. The service and
+        simulation agents of this simulation (and the random generators)
+        are left alone, so that they keep the parameters of this run.
+        """
+        self.node_manager.start(self.address_book, self.agent_db)
+        checkpoint.restore(self, configuration, random_state=False,
+                           nodes_only=True)
+
+    def run_simulation(self):
+        """
+        Starts the clock and waits for the end of the simulation.
+        """
+        self.start_simulation()
+        self.clock.join()
+        checkpointer = getattr(self, 'checkpointer', None)
+        if checkpointer is not None:
+            checkpointer.join()
+
+        self.logger.join()
+        return self
+
+    def checkpoint(self, path, max_pause=10.0):
+        """
+        Writes a checkpoint of the running simulation in the directory
+        path (see :mod:`pynetsym.checkpoint`).
+
+        Call it between two ticks (e.g., from a callback of the clock):
+        it waits for the agents to finish processing their messages.
+
+        :param max_pause: the maximum number of seconds to wait
+        :raise CheckpointError: if the agents are still busy after
+            max_pause seconds
+        """
+        checkpoint.write(path, checkpoint.capture(self, max_pause))
+
+    def resume(self, path, **kwargs):
+        """
+        Runs the simulation from the checkpoint in path.
 
-            self.logger.join()
-            return self
+        The parameters are those of the checkpointed simulation,
+        overridden by kwargs. :func:`Simulation.setup` is not called and
+        the network is not configured: the graph, the nodes and the
+        other agents are restored from the checkpoint.
+
+        .. note::
+            the agents are built with the parameters and then restored,
+            hence kwargs do not change their state (e.g., steps does not
+            change the conditions of the termination checker): they only
+            affect the components that are not in the checkpoint, such
+            as a file backed graph or the checkpointer.
+
+        Returns:
+            The current simulation so that it is easier to create one-liners
+        """
+        saved = checkpoint.read(path)
+        self._set_parameters = True
+        self.update_parameters(saved.state['parameters'])
+        self.update_parameters(kwargs)
+        self.graph = checkpoint.restore_graph(self, saved)
+
+        print 'Initial setup...'
+        self.create_service_agents()
+        self.create_simulation_agents()
+        print 'Restoring checkpoint...'
+        with timing.Timer(self.callback):
+            self.node_manager.start(self.address_book, self.agent_db)
+            checkpoint.restore(self, saved)
+        print 'Starting simulation...'
+        with timing.Timer(self.callback):
+            return self.run_simulation()
 
     def exception_hook(self, node):
         raise node.exception
@@ -0,0 +1,396 @@
+"""
+Replicates and parameter sweeps run in parallel.
+
+A :class:`Sweep` runs a :class:`pynetsym.simulation.Simulation`
+subclass once for every combination of parameters and replicate, in a
+pool of local processes, and stores the results of every run in a
+single HDF5 file, one column per quantity::
+
+    sweep = Sweep(BA, parameter_grid(dict(starting_edges=[2, 5, 11],
+                                          steps=[10000])),
+                  replicates=10, path='ba.h5', metrics=degree_metrics)
+    sweep.run()
+    columns = read('ba.h5')
+
+Every run has its own seed, derived from the seed of the sweep, the
+parameters and the replicate: the random and numpy.random generators
+of the process running it are seeded with it. Runs are identified by
+the same data, hence running a sweep again with the same path only
+performs the runs that are not in the file yet (e.g., after a crash,
+or after adding parameters or replicates).
+
+The columns of the file are:
+
+    1. key, replicate, seed, motive and elapsed (seconds);
+    2. a column for each parameter (parameters that are not numbers
+       are stored as their repr);
+    3. for each metric, a ragged column (metrics/<name>/data and
+       metrics/<name>/offsets: the array of run i is
+       data[offsets[i]:offsets[i + 1]]);
+    4. if graphs are saved, the snapshots of the final graphs (see
+       :mod:`pynetsym.graph.snapshot`) as ragged columns in graphs/.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import numbers
+import random
+import time
+import traceback
+
+import numpy as np
+from traits.api import HasTraits, Any, Bool, Callable, Dict, Either, Int
+from traits.api import List, Str
+
+from pynetsym.graph import snapshot
+
+
+__all__ = [
+    'Sweep',
+    'Run',
+    'parameter_grid',
+    'load_parameters',
+    'read',
+]
+
+
+def parameter_grid(grid):
+    """
+    Return the parameters of every combination of the values in grid.
+
+    :param grid: a dictionary from parameter names to the sequences of
+        their values
+    :rtype: list of dict
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*[grid[name] for name in names])]
+
+
+def load_parameters(path):
+    """
+    Reads the parameters of a sweep from a JSON file, which holds
+    either a grid (see :func:`parameter_grid`) or a list of
+    dictionaries of parameters.
+
+    :rtype: list of dict
+    """
+    with open(path) as stream:
+        parameters = json.load(stream)
+    if isinstance(parameters, dict):
+        return parameter_grid(parameters)
+    return parameters
+
+
+class Run(object):
+    """
+    A run of a sweep: the parameters, the replicate and the seed.
+    """
+    def __init__(self, parameters, replicate, sweep_seed):
+        self.parameters = parameters
+        self.replicate = replicate
+        description = json.dumps(
+            [sorted((name, repr(value))
+                    for name, value in parameters.iteritems()),
+             replicate, sweep_seed])
+        digest = hashlib.sha1(description).hexdigest()
+        self.key = digest
+        self.seed = int(digest[:8], 16) & 0x7fffffff
+
+    def __repr__(self):
+        return 'Run(%r, %d)' % (self.parameters, self.replicate)
+
+
+def _execute(simulation_type, run, metrics, save_graph, seed_parameter):
+    """
+    Performs a run (in a process of the pool).
+    """
+    random.seed(run.seed)
+    np.random.seed(run.seed)
+    parameters = dict(run.parameters)
+    if seed_parameter is not None:
+        parameters[seed_parameter] = run.seed
+    start = time.time()
+    try:
+        sim = simulation_type()
+        sim.run(args=[], **parameters)
+        result = dict(
+            motive=sim.motive,
+            elapsed=time.time() - start,
+            metrics=metrics(sim) if metrics is not None else {},
+            graph=snapshot.take(sim.graph) if save_graph else None)
+    except Exception:
+        return run, None, traceback.format_exc()
+    return run, result, None
+
+
+class _ColumnFile(object):
+    """
+    Appends rows to the resizable datasets of an HDF5 file.
+
+    Rows are complete when the key column is written (last); the
+    other columns are truncated to the complete rows when the file is
+    opened again. Ragged columns that were not written in a row get an
+    empty array for it.
+    """
+    def __init__(self, path):
+        import h5py
+
+        self.h5 = h5py.File(path, 'a')
+        self.rows = len(self.h5['key']) if 'key' in self.h5 else 0
+        self._truncate()
+
+    def keys(self):
+        if 'key' not in self.h5:
+            return set()
+        return set(self.h5['key'][:self.rows])
+
+    def _datasets(self):
+        datasets = []
+        self.h5.visititems(
+            lambda name, item: datasets.append(name)
+            if hasattr(item, 'shape') else None)
+        return datasets
+
+    def _truncate(self):
+        for name in self._datasets():
+            if name.endswith('/data'):
+                offsets = self.h5[name[:-len('data')] + 'offsets']
+                end = offsets[self.rows] if len(offsets) > self.rows else 0
+                self.h5[name].resize((end, ))
+            elif name.endswith('/offsets'):
+                self.h5[name].resize((self.rows + 1, ))
+            else:
+                self.h5[name].resize((self.rows, ))
+
+    def _dataset(self, name, dtype, length):
+        import h5py
+
+        if name not in self.h5:
+            if dtype is str:
+                dtype = h5py.special_dtype(vlen=unicode)
+            self.h5.create_dataset(name, shape=(length, ), dtype=dtype,
+                                   maxshape=(None, ), chunks=True)
+        return self.h5[name]
+
+    def append_value(self, name, value, dtype):
+        dataset = self._dataset(name, dtype, self.rows)
+        dataset.resize((self.rows + 1, ))
+        dataset[self.rows] = value
+
+    def append_array(self, name, array):
+        array = np.ravel(array)
+        data = self._dataset(name + '/data', array.dtype, 0)
+        offsets = self._dataset(name + '/offsets', np.int64, self.rows + 1)
+        start = offsets[self.rows] if self.rows else 0
+        data.resize((start + len(array), ))
+        data[start:] = array
+        offsets.resize((self.rows + 2, ))
+        offsets[self.rows + 1] = start + len(array)
+
+    def _pad_ragged(self):
+        for name in self._datasets():
+            if (name.endswith('/offsets') and
+                    len(self.h5[name]) == self.rows + 1):
+                column = name[:-len('/offsets')]
+                self.append_array(
+                    column, np.zeros(0, self.h5[column + '/data'].dtype))
+
+    def end_row(self, key):
+        self._pad_ragged()
+        self.append_value('key', key, str)
+        self.rows += 1
+        self.h5.flush()
+
+    def close(self):
+        self.h5.close()
+
+
+def _parameter_dtype(values):
+    if all(isinstance(value, (bool, numbers.Integral))
+           for value in values):
+        return np.int64
+    if all(isinstance(value, numbers.Real) for value in values):
+        return np.float64
+    return str
+
+
+class Sweep(HasTraits):
+    """
+    Runs simulation_type once for every element of parameters and
+    replicate, in a pool of processes, storing the results in path.
+
+    The parameters of a run are passed to :func:`Simulation.run`;
+    seed_parameter, if not None, is the name of a further parameter
+    with the seed of the run. metrics is a function of the simulation
+    (run after the end of the simulation, in the process of the run)
+    returning a dictionary from names to arrays; both simulation_type
+    and metrics must be defined at the top level of a module, so that
+    they can be pickled. processes is the size of the pool (None for
+    the number of CPUs); with processes=0 the runs are performed in
+    the current process.
+
+    The runs that fail are retried when the sweep is run again; their
+    tracebacks are kept in errors.
+    """
+    simulation_type = Any
+    parameters = List(Dict)
+    replicates = Int(1)
+    path = Str('sweep.h5')
+    processes = Either(None, Int)
+    seed = Int(0)
+    metrics = Either(None, Callable)
+    save_graphs = Bool(False)
+    seed_parameter = Either(None, Str)
+
+    errors = List
+
+    def __init__(self, simulation_type, parameters=({}, ), replicates=1,
+                 path='sweep.h5', **traits):
+        """
+        :param simulation_type: the Simulation subclass
+        :param parameters: a list of dictionaries of parameters (see
+            :func:`parameter_grid`) or the path of a JSON file (see
+            :func:`load_parameters`)
+        :param replicates: the number of runs for every element of
+            parameters
+        :param path: the HDF5 file of the results
+        """
+        if isinstance(parameters, basestring):
+            parameters = load_parameters(parameters)
+        super(Sweep, self).__init__(
+            simulation_type=simulation_type, parameters=list(parameters),
+            replicates=replicates, path=path, **traits)
+
+    def runs(self):
+        """
+        Return all the runs of the sweep.
+
+        :rtype: list of :class:`Run`
+        """
+        return [Run(parameters, replicate, self.seed)
+                for parameters in self.parameters
+                for replicate in xrange(self.replicates)]
+
+    def pending(self):
+        """
+        Return the runs whose results are not in path yet.
+        """
+        columns = _ColumnFile(self.path)
+        try:
+            done = columns.keys()
+        finally:
+            columns.close()
+        return [run for run in self.runs() if run.key not in done]
+
+    def _tasks(self, runs):
+        return [(self.simulation_type, run, self.metrics, self.save_graphs,
+                 self.seed_parameter) for run in runs]
+
+    def _results(self, runs):
+        tasks = self._tasks(runs)
+        if self.processes == 0:
+            return (_execute(*task) for task in tasks), None
+        # workers forked later (e.g., with maxtasksperchild) would be
+        # forked by a thread of the pool, where gevent cannot run
+        pool = multiprocessing.Pool(self.processes)
+        return pool.imap_unordered(_execute_task, tasks), pool
+
+    def run(self):
+        """
+        Performs the pending runs.
+
+        :return: the number of runs performed
+        """
+        runs = self.pending()
+        if not runs:
+            return 0
+        names = sorted(set(name for run in self.runs()
+                           for name in run.parameters))
+        dtypes = dict(
+            (name, _parameter_dtype([run.parameters[name]
+                                     for run in self.runs()
+                                     if name in run.parameters]))
+            for name in names)
+        columns = _ColumnFile(self.path)
+        results, pool = self._results(runs)
+        performed = 0
+        try:
+            for run, result, error in results:
+                if error is not None:
+                    self.errors.append((run, error))
+                    continue
+                self._write(columns, run, result, names, dtypes)
+                performed += 1
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            columns.close()
+        return performed
+
+    def _write(self, columns, run, result, names, dtypes):
+        columns.append_value('replicate', run.replicate, np.int64)
+        columns.append_value('seed', run.seed, np.int64)
+        columns.append_value('motive', unicode(result['motive']), str)
+        columns.append_value('elapsed', result['elapsed'], np.float64)
+        for name in names:
+            dtype = dtypes[name]
+            value = run.parameters.get(name)
+            if dtype is str:
+                value = unicode(repr(value) if value is not None else '')
+            elif value is None:
+                value = np.nan if dtype is np.float64 else -1
+            columns.append_value('parameters/' + name, value, dtype)
+        for name, array in sorted(result['metrics'].iteritems()):
+            columns.append_array('metrics/' + name, np.asarray(array))
+        graph = result['graph']
+        if graph is not None:
+            columns.append_array('graphs/indptr', graph.indptr)
+            columns.append_array('graphs/indices', graph.indices)
+            columns.append_array('graphs/nodes', graph.nodes)
+            columns.append_value('graphs/directed', graph.directed, np.bool_)
+        columns.end_row(run.key)
+
+
+def _execute_task(task):
+    return _execute(*task)
+
+
+def read(path):
+    """
+    Reads the results of a sweep.
+
+    :return: a dictionary from the names of the columns to arrays;
+        ragged columns (metrics/<name>) are lists of arrays and the
+        final graphs (if saved) are in 'graphs', a list of
+        :class:`pynetsym.graph.snapshot.Snapshot`
+    """
+    import h5py
+
+    columns = {}
+    with h5py.File(path, 'r') as h5:
+        rows = len(h5['key']) if 'key' in h5 else 0
+
+        def ragged(group):
+            data, offsets = group['data'][...], group['offsets'][...]
+            return [data[offsets[row]:offsets[row + 1]]
+                    for row in xrange(rows)]
+
+        for name in ('key', 'replicate', 'seed', 'motive', 'elapsed'):
+            if name in h5:
+                columns[name] = h5[name][:rows]
+        for name in h5.get('parameters', {}):
+            columns[name] = h5['parameters'][name][:rows]
+        for name in h5.get('metrics', {}):
+            columns['metrics/' + name] = ragged(h5['metrics'][name])
+        if 'graphs' in h5:
+            graphs = h5['graphs']
+            columns['graphs'] = [
+                snapshot.Snapshot(indptr, indices, nodes, bool(directed))
+                for indptr, indices, nodes, directed in zip(
+                    ragged(graphs['indptr']), ragged(graphs['indices']),
+                    ragged(graphs['nodes']), graphs['directed'][:rows])]
+    return columns
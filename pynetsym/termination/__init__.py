@@ -2,8 +2,11 @@ __all__ = [
     'TerminationChecker',
     'make_condition',
     'count_down',
+    'counter_condition',
+    'graph_size',
     'ICondition'
 ]
 
 from checkers import TerminationChecker
 from conditions import make_condition, count_down, ICondition
+from conditions import counter_condition, graph_size
@@ -1,4 +1,6 @@
 from pynetsym import core
+from pynetsym.termination.conditions import always_true
+from pynetsym.util import picklable_sub_dictionary
 
 
 class TerminationChecker(core.Agent):
@@ -11,6 +13,8 @@ class TerminationChecker(core.Agent):
         self.graph = graph
         self.conditions = list(conditions)
         self.active = True
+        self.checks = 0
+        self._fingerprints = {}
 
     def add_condition(self, condition):
         """
@@ -21,12 +25,27 @@ class TerminationChecker(core.Agent):
         """
         self.conditions.append(condition)
 
+    def require_termination(self, reason):
+        """
+        An agent can send this message to make the simulation stop
+        at the next check.
+
+        :param reason: the motive of the termination
+        """
+        self.add_condition(always_true(reason))
+
     def check(self, requester):
         """
         An agent can send a message to require that the conditions for
         termination are met.
+
+        Conditions that are not due (see
+        :class:`pynetsym.termination.conditions.ICondition`) are skipped.
         """
+        self.checks += 1
         for condition in self.conditions:
+            if not self._due(condition):
+                continue
             check = condition.check(self.graph)
             if check:
                 self.motive = condition.motive
@@ -38,6 +57,52 @@ class TerminationChecker(core.Agent):
         else:
             return False
 
+    def stop(self):
+        """
+        Makes the checker stop receiving messages (e.g., after the
+        termination was detected calling :func:`TerminationChecker.check`
+        in-process).
+        """
+        self.active = False
+
+    def get_state(self):
+        """
+        Return the number of checks and the state of the conditions
+        (e.g., for a checkpoint).
+
+        The state of a condition is its dictionary, without the
+        values that cannot be pickled (e.g., lambdas).
+        """
+        return dict(
+            checks=self.checks,
+            conditions=[
+                picklable_sub_dictionary(getattr(condition, '__dict__', {}))
+                for condition in self.conditions])
+
+    def set_state(self, state):
+        """
+        Restores the state returned by :func:`TerminationChecker.get_state`
+        into the conditions, which are matched by position.
+        """
+        self.checks = state['checks']
+        for condition, condition_state in zip(
+                self.conditions, state['conditions']):
+            if condition_state:
+                vars(condition).update(condition_state)
+
+    def _due(self, condition):
+        period = getattr(condition, 'period', 1)
+        if period > 1 and self.checks % period:
+            return False
+        fingerprint = getattr(condition, 'fingerprint', None)
+        if fingerprint is not None:
+            value = fingerprint(self.graph)
+            if (condition in self._fingerprints and
+                    self._fingerprints[condition] == value):
+                return False
+            self._fingerprints[condition] = value
+        return True
+
     def _start(self):
         self.setup()
         while self.active:
@@ -10,29 +10,89 @@ from functools import partial
 class ICondition(object):
     """
     Condition interface.
+
+    Expensive conditions need not be evaluated at every check. The
+    checker evaluates a condition only once every period checks and,
+    if the condition has a fingerprint method, only when the value it
+    returns (a cheap summary of what the condition depends on, e.g.,
+    the number of edges) changed since the last evaluation.
     """
+    period = 1
+    fingerprint = None
+
     def check(self, graph):
         pass
 
 
 class _FuncCondition(ICondition):
-    def __init__(self, func, motive):
+    def __init__(self, func, motive, period=1, fingerprint=None):
         self.func = func
         self.motive = motive
+        self.period = period
+        self.fingerprint = fingerprint
 
     def check(self, graph):
         return self.func(graph)
 
 
-def make_condition(func, motive):
+def make_condition(func, motive, period=1, fingerprint=None):
     """
     Return a condition that is true when func evaluates to true.
     Motive is the motive that will be set when this condition evaluates
     to true.
 
     func is a function taking a graph wrapper and returning a boolean.
+
+    :param period: func is evaluated only once every period checks
+    :param fingerprint: a function taking the graph wrapper; func is
+        evaluated only if the value fingerprint returns changed since
+        the last evaluation (see :func:`graph_size`)
+    """
+    return _FuncCondition(func, motive, period, fingerprint)
+
+
+def graph_size(graph):
+    """
+    Fingerprint for conditions depending only on the topology: the
+    number of nodes and edges.
+
+    Both are maintained counters in the scipy, CSR and HDF5 backends;
+    NetworkX computes the number of edges from the degrees.
+    """
+    return graph.number_of_nodes(), graph.number_of_edges()
+
+
+class _CounterCondition(ICondition):
+    def __init__(self, counter, predicate, motive):
+        self.counter = counter
+        self.predicate = predicate
+        self.motive = motive
+
+    def fingerprint(self, graph):
+        return self.counter()
+
+    def check(self, graph):
+        return self.predicate(self.counter())
+
+
+def counter_condition(counter, predicate, motive):
+    """
+    Return a condition reading a counter maintained elsewhere, instead
+    of recomputing it from the graph; the predicate is evaluated only
+    when the value of the counter changes.
+
+    For example, with a :class:`pynetsym.node_state.NodeStateStore`
+    tracking the state column::
+
+        counter_condition(
+            lambda: simulation.node_state_store.count('state', 'I'),
+            lambda infected: infected == 0,
+            'No more infected nodes')
+
+    :param counter: function without arguments returning the value
+    :param predicate: function taking the value and returning a boolean
     """
-    return _FuncCondition(func, motive)
+    return _CounterCondition(counter, predicate, motive)
 
 
 always_true = partial(make_condition, lambda graph: True)
@@ -6,6 +6,7 @@ For example functions to manipulate primitive data types and such.
 
 __all__ = [
     'extract_sub_dictionary',
+    'picklable_sub_dictionary',
     'choice_from_iter',
     'SequenceAsyncResult',
     'encapsulate_global',
@@ -21,15 +22,18 @@ except ImportError:
     pass
 else:
     from sna import ccdf, approximate_cpl, trivial_power_law_estimator, make_hist, degrees_to_hist
+    from ensemble import Ensemble, QuantileSketch
 
     __all__.extend([
         "ccdf",
         "approximate_cpl",
         "trivial_power_law_estimator",
         "make_hist",
-        "degrees_to_hist"])
+        "degrees_to_hist",
+        "Ensemble",
+        "QuantileSketch"])
 
-from dictionary import extract_sub_dictionary
+from dictionary import extract_sub_dictionary, picklable_sub_dictionary
 from rnd import choice_from_iter
 from concurrency import SequenceAsyncResult
 from global_state import encapsulate_global
@@ -1,5 +1,29 @@
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
 def extract_sub_dictionary(dct, keys):
     """
     Extracts a sub-dictionary of dct with the keys specified in keys.
     """
-    return {k: v for k, v in dct.iteritems() if k in keys}
\ No newline at end of file
+    return {k: v for k, v in dct.iteritems() if k in keys}
+
+
+def picklable_sub_dictionary(dct, exclude=()):
+    """
+    Extracts the sub-dictionary of dct whose values can be pickled,
+    leaving out the values that are (identical to) an object in
+    exclude.
+    """
+    sub_dictionary = {}
+    for k, v in dct.iteritems():
+        if any(v is excluded for excluded in exclude):
+            continue
+        try:
+            pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        sub_dictionary[k] = v
+    return sub_dictionary
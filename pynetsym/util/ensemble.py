@@ -0,0 +1,288 @@
+"""
+Online aggregation of arrays (e.g., degree distributions) across the
+replicates of a simulation.
+
+An :class:`Ensemble` consumes one array per run and keeps, position by
+position, the running mean, variance, minimum and maximum and
+(optionally) a sketch of the quantiles, without storing the arrays::
+
+    ensemble = Ensemble()
+    for _replicate in xrange(replicates):
+        ensemble.add(np.bincount(degrees_of_a_run()))
+    mean, std = ensemble.mean, ensemble.std()
+    low, high = ensemble.quantile([0.05, 0.95])
+
+Arrays may have different lengths: the shorter ones are padded with
+fill (0 by default, as appropriate for histograms and ccdfs).
+Ensembles can be pickled and merged, so that every worker process can
+aggregate its own runs (see :meth:`Ensemble.merge`).
+"""
+
+import numpy as np
+
+
+__all__ = [
+    'Ensemble',
+    'QuantileSketch',
+]
+
+
+def _pad(array, width, fill):
+    """
+    Pads array (1 or 2 dimensional) with fill up to width columns.
+    """
+    missing = width - array.shape[-1]
+    if missing <= 0:
+        return array
+    padding = [(0, 0)] * (array.ndim - 1) + [(0, missing)]
+    return np.pad(array, padding, 'constant', constant_values=fill)
+
+
+class QuantileSketch(object):
+    """
+    Approximate quantiles of each position of a stream of arrays.
+
+    This is a KLL-like sketch, whose items are whole arrays: level h
+    holds at most k arrays of weight 2 ** h; when a level is full its
+    arrays are sorted position by position and every other one
+    (starting at random) is moved to the next level. The memory used is
+    O(k log(n / k)) arrays of n; the rank error is O(log(n / k) / k).
+    """
+
+    def __init__(self, k=128, fill=0.0, seed=None):
+        """
+        :param k: the number of arrays in every level
+        :param fill: the value used to pad the shorter arrays
+        :param seed: the seed of the compactions
+        """
+        if k < 2:
+            raise ValueError('k must be at least 2.')
+        self.k = k
+        self.fill = fill
+        self.count = 0
+        self.width = 0
+        self.levels = [[]]
+        self.random = np.random.RandomState(seed)
+
+    def _size(self, level):
+        return sum(len(block) for block in self.levels[level])
+
+    def _block(self, level):
+        return np.vstack([_pad(block, self.width, self.fill)
+                          for block in self.levels[level]])
+
+    def update(self, array):
+        """
+        Adds an array to the sketch.
+        """
+        array = np.asarray(array, dtype=np.float64).ravel()
+        self.width = max(self.width, len(array))
+        self.levels[0].append(array[np.newaxis])
+        self.count += 1
+        self._compact()
+
+    def merge(self, other):
+        """
+        Adds the arrays summarized by other to the sketch.
+
+        :rtype: QuantileSketch
+        :return: self
+        """
+        self.width = max(self.width, other.width)
+        self.count += other.count
+        for level, blocks in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(blocks)
+        self._compact()
+        return self
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            if self._size(level) > self.k:
+                block = self._block(level)
+                # an odd array stays where it is
+                kept, block = block[:len(block) % 2], block[len(block) % 2:]
+                block.sort(axis=0)
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[level + 1].append(
+                    block[self.random.randint(2)::2])
+                self.levels[level] = [kept] if len(kept) else []
+            level += 1
+
+    def quantile(self, q):
+        """
+        Return the q-quantiles of every position.
+
+        :param q: a number or a sequence of numbers in [0, 1]
+        :return: an array of width values, or one per element of q
+        :raise ValueError: if the sketch is empty
+        """
+        if not self.count:
+            raise ValueError('No arrays in the sketch.')
+        items, weights = [], []
+        for level, blocks in enumerate(self.levels):
+            if blocks:
+                items.append(self._block(level))
+                weights.append(np.repeat(2.0 ** level, len(items[-1])))
+        items = np.vstack(items)
+        weights = np.concatenate(weights)
+        order = np.argsort(items, axis=0)
+        items = np.take_along_axis(items, order, axis=0)
+        ranks = np.cumsum(weights[order], axis=0)
+        columns = np.arange(self.width)
+        qs = np.atleast_1d(q)
+        quantiles = np.array([
+            items[(ranks >= value * ranks[-1]).argmax(axis=0), columns]
+            for value in qs])
+        return quantiles if np.ndim(q) else quantiles[0]
+
+
+class Ensemble(object):
+    """
+    Running statistics of each position of a stream of arrays of
+    possibly different lengths (see the module documentation).
+
+    Mean and variance are updated with Welford's method and merged with
+    the formulas of Chan et al., hence they are exact (but for rounding);
+    the quantiles are approximated by a :class:`QuantileSketch`.
+    """
+
+    def __init__(self, fill=0.0, quantiles=True, k=128, seed=None):
+        """
+        :param fill: the value used to pad the shorter arrays
+        :param quantiles: whether to keep a sketch of the quantiles
+        :param k: the accuracy of the sketch (see :class:`QuantileSketch`)
+        :param seed: the seed of the sketch
+        """
+        self.fill = fill
+        self.count = 0
+        self._mean = np.empty(0)
+        self._m2 = np.empty(0)
+        self._minimum = np.empty(0)
+        self._maximum = np.empty(0)
+        self.sketch = (QuantileSketch(k, fill, seed) if quantiles
+                       else None)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def width(self):
+        """
+        The length of the longest array.
+        """
+        return len(self._mean)
+
+    def _resize(self, width):
+        if width > self.width:
+            # the arrays seen so far all had fill there
+            self._mean = _pad(self._mean, width, self.fill)
+            self._m2 = _pad(self._m2, width, 0.0)
+            self._minimum = _pad(self._minimum, width, self.fill)
+            self._maximum = _pad(self._maximum, width, self.fill)
+
+    def add(self, array):
+        """
+        Adds the array of a run.
+        """
+        array = np.asarray(array, dtype=np.float64).ravel()
+        if self.count:
+            self._resize(len(array))
+            array = _pad(array, self.width, self.fill)
+            self._minimum = np.minimum(self._minimum, array)
+            self._maximum = np.maximum(self._maximum, array)
+        else:
+            self._mean = np.zeros(len(array))
+            self._m2 = np.zeros(len(array))
+            self._minimum = array.copy()
+            self._maximum = array.copy()
+        self.count += 1
+        delta = array - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (array - self._mean)
+        if self.sketch is not None:
+            self.sketch.update(array)
+
+    def extend(self, arrays):
+        """
+        Adds the arrays of several runs.
+        """
+        for array in arrays:
+            self.add(array)
+
+    def merge(self, other):
+        """
+        Adds the runs aggregated by other (e.g., in another process).
+
+        :rtype: Ensemble
+        :return: self
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            self._mean = other._mean.copy()
+            self._m2 = other._m2.copy()
+            self._minimum = other._minimum.copy()
+            self._maximum = other._maximum.copy()
+        else:
+            width = max(self.width, other.width)
+            self._resize(width)
+            count = self.count + other.count
+            mean = _pad(other._mean, width, other.fill)
+            delta = mean - self._mean
+            self._m2 += (_pad(other._m2, width, 0.0) +
+                         delta * delta * self.count * other.count / count)
+            self._mean += delta * other.count / count
+            self._minimum = np.minimum(
+                self._minimum, _pad(other._minimum, width, other.fill))
+            self._maximum = np.maximum(
+                self._maximum, _pad(other._maximum, width, other.fill))
+        self.count += other.count
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        elif self.sketch is not None:
+            self.sketch = None
+        return self
+
+    @property
+    def mean(self):
+        return self._mean.copy()
+
+    @property
+    def minimum(self):
+        return self._minimum.copy()
+
+    @property
+    def maximum(self):
+        return self._maximum.copy()
+
+    def variance(self, ddof=0):
+        """
+        Return the variance of every position.
+
+        :param ddof: the delta degrees of freedom (1 for the unbiased
+            estimator)
+        """
+        if self.count <= ddof:
+            return np.repeat(np.nan, self.width)
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        """
+        Return the standard deviation of every position.
+        """
+        return np.sqrt(self.variance(ddof))
+
+    def quantile(self, q):
+        """
+        Return the (approximate) q-quantiles of every position (see
+        :meth:`QuantileSketch.quantile`).
+
+        :raise ValueError: if the ensemble has no quantile sketch
+        """
+        if self.sketch is None:
+            raise ValueError('The ensemble does not keep quantiles.')
+        return self.sketch.quantile(q)
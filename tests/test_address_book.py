@@ -1,4 +1,5 @@
 import unittest
+import operator
 from pynetsym import addressing
 
 
@@ -88,3 +89,114 @@ class TestNamespacedAddressBook(unittest.TestCase):
 
         self.assertEqual([], complete_list)
 
+
+
+class TestIntAddressBook(unittest.TestCase):
+    def setUp(self):
+        self.address_book = addressing.IntAddressBook()
+        self.agent = object()
+        self.address_book.register(self.agent, 5)
+
+    def testResolve(self):
+        self.assertIs(self.agent, self.address_book.resolve(5))
+
+    def testMissing(self):
+        for identifier in (0, 4, 6, 100, -1, -3):
+            self.assertRaises(addressing.AddressingError,
+                              self.address_book.resolve, identifier)
+
+    def testReRegister(self):
+        self.address_book.register(self.agent, 5)
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.register, object(), 5)
+
+    def testBadIdentifier(self):
+        self.assertRaises(TypeError,
+                          self.address_book.register, object(), 'a')
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.register, object(), -1)
+
+    def testUnregister(self):
+        self.address_book.unregister(5)
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.resolve, 5)
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.unregister, 5)
+        self.address_book.register(object(), 5)
+
+    def testList(self):
+        self.address_book.register(object(), 1)
+        self.assertEqual([1, 5], self.address_book.list())
+        self.assertEqual(2, len(self.address_book))
+
+
+class TestAutoResolvingAddressBook(unittest.TestCase):
+    def setUp(self):
+        self.node_book = addressing.IntAddressBook()
+        self.main_book = addressing.FlatAddressBook()
+        self.address_book = addressing.AutoResolvingAddressBook(
+            main=self.main_book, node=self.node_book)
+        self.address_book.add_resolver('node', operator.isNumberType)
+        self.address_book.add_resolver(
+            'main', lambda o: isinstance(o, basestring))
+
+    def testDispatch(self):
+        node, agent = object(), object()
+        self.address_book.register(node, 3)
+        self.address_book.register(agent, 'agent')
+        self.assertIs(node, self.address_book.resolve(3))
+        self.assertIs(node, self.address_book.resolve(3L))
+        self.assertIs(agent, self.address_book.resolve('agent'))
+        self.assertIs(node, self.node_book.resolve(3))
+
+    def testUnknownType(self):
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.resolve, None)
+
+    def testNamespaceChangeClearsCache(self):
+        self.address_book.register(object(), 3)
+        other_book = addressing.IntAddressBook()
+        self.address_book.unregister_namespace('node')
+        self.address_book.register_namespace('node', other_book)
+        self.assertRaises(addressing.AddressingError,
+                          self.address_book.resolve, 3)
+
+
+class TestAgentHandle(unittest.TestCase):
+    def setUp(self):
+        self.node_book = addressing.IntAddressBook()
+        self.main_book = addressing.FlatAddressBook()
+        self.address_book = addressing.AutoResolvingAddressBook(
+            main=self.main_book, node=self.node_book)
+        self.address_book.add_resolver('node', operator.isNumberType)
+        self.address_book.add_resolver(
+            'main', lambda o: isinstance(o, basestring))
+        self.agent = object()
+        self.address_book.register(self.agent, 'agent')
+
+    def testResolve(self):
+        handle = self.address_book.handle('agent')
+        self.assertIs(self.agent, handle.resolve())
+        self.assertIs(handle, self.address_book.handle('agent'))
+        self.assertIs(handle, self.main_book.handle('agent'))
+
+    def testInvalidation(self):
+        handle = self.address_book.handle('agent')
+        self.address_book.unregister('agent')
+        self.assertRaises(addressing.AddressingError, handle.resolve)
+        other = object()
+        self.address_book.register(other, 'agent')
+        self.assertIs(other, handle.resolve())
+
+    def testIntInvalidation(self):
+        handle = self.address_book.handle(7)
+        self.assertRaises(addressing.AddressingError, handle.resolve)
+        node = object()
+        self.address_book.register(node, 7)
+        self.assertIs(node, handle.resolve())
+        self.address_book.unregister(7)
+        self.assertIsNone(handle.agent)
+
+    def testHandlesAreNotKeptAlive(self):
+        self.address_book.handle('agent')
+        self.assertEqual(0, len(self.main_book.handles))
@@ -33,3 +33,37 @@ class TestAgent(TestCase):
         self.agent_a.join()
         self.assertEqual(42, self.agent_a.val)
 
+
+    def test_send_handle(self):
+        handle = self.agent_b.handle(self.agent_a_id)
+        self.agent_a.send(self.agent_b_id, 'question', agent_id=handle)
+        self.agent_a.join()
+        self.assertEqual(42, self.agent_a.val)
+
+
+class LateMessageAgent(Agent):
+    hibernated = t.false
+    timed_out = t.false
+
+    def can_be_collected(self):
+        return True
+
+    def read(self, timeout=None):
+        if not self.timed_out:
+            # the message is put in the mailbox while the read times out
+            self.timed_out = True
+            self.send(self.id, 'answer')
+            raise core.NoMessage()
+        return super(LateMessageAgent, self).read(timeout)
+
+    def _store_agent(self):
+        self.hibernated = True
+
+
+class TestLateMessage(TestCase):
+    def test_late_message_is_processed(self):
+        runtime = core.MinimalAgentRuntime()
+        agent = runtime.spawn_agent(LateMessageAgent, 'a')
+        agent.join()
+        self.assertEqual(42, agent.val)
+        self.assertFalse(agent.hibernated)
@@ -1,5 +1,8 @@
 from unittest import TestCase
-from pynetsym import core
+
+import numpy
+
+from pynetsym import core, agent_db
 
 class TestAgentDB(TestCase):
 
@@ -18,3 +21,125 @@ class TestAgentDB(TestCase):
 
     def test_store(self):
         self.node_db.store(self.agent)
+
+
+class PrefetchingAgentDB(agent_db.AgentDB):
+    def __init__(self, pickling_module, storage):
+        super(PrefetchingAgentDB, self).__init__(pickling_module, storage)
+        self.prefetched = []
+
+    def prefetch(self, identifiers):
+        self.prefetched.extend(identifiers)
+
+
+class TestCachedAgentDB(TestCase):
+    def setUp(self):
+        self.backend = agent_db.AgentDB(agent_db.PythonPickler(), dict())
+        self.node_db = agent_db.CachedAgentDB(self.backend, max_agents=2)
+        self.agents = [core.Agent() for _ in xrange(3)]
+        for identifier, agent in enumerate(self.agents):
+            agent.id = identifier
+
+    def test_hit(self):
+        self.node_db.store(self.agents[0])
+        self.assertIs(self.agents[0], self.node_db.recover(0))
+        self.assertEqual(1, self.node_db.hits)
+        self.assertEqual(0, len(self.backend.storage))
+        self.assertNotIn(0, self.node_db)
+
+    def test_eviction(self):
+        for agent in self.agents:
+            self.node_db.store(agent)
+        self.assertEqual(1, self.node_db.evictions)
+        self.assertEqual([0], self.backend.storage.keys())
+        agent = self.node_db.recover(0)
+        self.assertIsNot(self.agents[0], agent)
+        self.assertEqual(0, agent.id)
+        self.assertEqual(1, self.node_db.misses)
+
+    def test_restore_refreshes(self):
+        self.node_db.store(self.agents[0])
+        self.node_db.store(self.agents[1])
+        self.node_db.store(self.agents[0])
+        self.node_db.store(self.agents[2])
+        self.assertEqual([1], self.backend.storage.keys())
+
+    def test_missing(self):
+        self.assertRaises(agent_db.MissingNode, self.node_db.recover, 7)
+
+    def test_byte_budget(self):
+        self.node_db.max_agents = None
+        self.node_db.max_bytes = 1
+        self.node_db.store(self.agents[0])
+        self.assertEqual(0, len(self.node_db))
+        self.assertEqual(0, self.node_db.cached_bytes)
+        self.assertEqual(1, self.node_db.evictions)
+
+    def test_flush(self):
+        self.node_db.store(self.agents[0])
+        self.node_db.store(self.agents[1])
+        self.node_db.flush()
+        self.assertEqual(0, len(self.node_db))
+        self.assertItemsEqual([0, 1], self.backend.storage.keys())
+
+    def test_prefetch(self):
+        backend = PrefetchingAgentDB(agent_db.PythonPickler(), dict())
+        node_db = agent_db.CachedAgentDB(backend)
+        node_db.store(self.agents[0])
+        node_db.prefetch([0, 1, 2])
+        self.assertEqual([1, 2], backend.prefetched)
+        self.node_db.prefetch([0, 1])
+
+    def test_records(self):
+        for agent in self.agents:
+            self.node_db.store(agent)
+        serializer = self.backend.pickling_module
+        records = self.node_db.records(serializer)
+        self.assertItemsEqual([0, 1, 2], records.keys())
+        self.assertIs(self.backend.storage[0], records[0])
+        self.assertEqual(1, serializer.loads(records[1]).id)
+        self.assertEqual(0, self.node_db.misses)
+
+    def test_former_parameters(self):
+        storage = dict()
+        node_db = agent_db.CachedAgentDB(
+            pickling_module=agent_db.PythonPickler(), storage=storage,
+            max_agents=0)
+        node_db.store(self.agents[0])
+        self.assertIsInstance(node_db.agent_db.pickling_module,
+                              agent_db.PythonPickler)
+        self.assertEqual([0], storage.keys())
+
+
+class TestLazyAgentDB(TestCase):
+    def setUp(self):
+        self.backend = agent_db.AgentDB(agent_db.PythonPickler(), dict())
+        self.node_db = agent_db.LazyAgentDB(self.backend)
+        self.node_db.add_factory([1, 2, 5], core.Agent, {})
+
+    def test_materialize_once(self):
+        self.assertEqual(3, self.node_db.pending)
+        agent = self.node_db.recover(5)
+        self.assertIsInstance(agent, core.Agent)
+        self.assertEqual(1, self.node_db.materialized)
+        self.assertEqual(2, self.node_db.pending)
+        self.assertRaises(agent_db.MissingNode, self.node_db.recover, 5)
+
+    def test_stored_agents_win(self):
+        agent = core.Agent()
+        agent.id = 2
+        self.node_db.store(agent)
+        self.assertEqual(2, self.node_db.recover(2).id)
+        self.assertEqual(0, self.node_db.materialized)
+
+    def test_set_state_copies(self):
+        state = self.node_db.get_state()
+        node_db = agent_db.LazyAgentDB(self.backend)
+        node_db.set_state(state)
+        node_db.recover(5)
+        self.assertEqual(3, numpy.count_nonzero(state['pending']))
+
+    def test_missing(self):
+        for identifier in (0, 3, 100, -1, 'agent'):
+            self.assertRaises(agent_db.MissingNode,
+                              self.node_db.recover, identifier)
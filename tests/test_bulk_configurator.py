@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+import paramunittest
+
+import pynetsym
+from pynetsym import BulkConfigurator
+from pynetsym.graph import DirectedScipyGraph, ScipyGraph, snapshot
+
+
+class Node(pynetsym.Node):
+    notified = set()
+
+    def edges_loaded(self):
+        self.notified.add(self.id)
+
+
+class SilentNode(pynetsym.Node):
+    def accept_link(self, originating_node):
+        raise AssertionError('Nodes are not told about their links.')
+
+
+def write_text(graph, path, both=False, reverse=False):
+    with open(path, 'w') as stream:
+        stream.write('# an edge list\n')
+        for u, v in graph.edges():
+            if reverse:
+                u, v = v, u
+            stream.write('%d %d\n' % (u, v))
+            if both:
+                stream.write('%d %d\n' % (v, u))
+
+
+def write_snapshot(graph, path):
+    matrix = nx.to_scipy_sparse_matrix(
+        graph, nodelist=range(graph.number_of_nodes()), format='csr')
+    snapshot.write(path, matrix.indptr, matrix.indices)
+
+
+@paramunittest.parametrized(
+    (None, Node),
+    ('edges.txt', Node),
+    ('both.txt', Node),
+    ('reversed.txt', Node),
+    ('graph.npz', SilentNode),
+    ('graph.h5', SilentNode),
+)
+class TestBulkConfigurator(paramunittest.ParametrizedTestCase):
+    def setParameters(self, file_name, node_type):
+        self.file_name = file_name
+        self.node_type = node_type
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.network = nx.gnm_random_graph(30, 70, seed=11)
+        if self.file_name is None:
+            self.starting_network = self.network
+        else:
+            self.starting_network = os.path.join(
+                self.directory, self.file_name)
+            if self.file_name.endswith('.txt'):
+                write_text(self.network, self.starting_network,
+                           both=self.file_name == 'both.txt',
+                           reverse=self.file_name == 'reversed.txt')
+            else:
+                write_snapshot(self.network, self.starting_network)
+        Node.notified.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testLoad(self):
+        node_class = self.node_type
+
+        class Simulation(pynetsym.Simulation):
+            class configurator_type(BulkConfigurator):
+                chunk_size = 8
+                node_type = node_class
+                node_options = set()
+
+        sim = Simulation()
+        sim.run(starting_network=self.starting_network, steps=1)
+        self.assertEqual(30, sim.graph.number_of_nodes())
+        self.assertEqual(
+            set(tuple(sorted(edge)) for edge in self.network.edges()),
+            set(tuple(sorted(edge)) for edge in sim.graph.to_nx().edges()))
+        if node_class is Node:
+            self.assertEqual(set(range(30)), Node.notified)
+
+
+class TestSymmetricText(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'edges.txt')
+        self.network = nx.gnm_random_graph(30, 70, seed=11)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def chunks(self, graph_type=ScipyGraph):
+        configurator = BulkConfigurator(
+            starting_network=self.path, chunk_size=8, graph=graph_type(30))
+        configurator.node_map = np.arange(30)
+        size, symmetric = configurator._scan_text(self.path)
+        self.assertEqual(30, size)
+        configurator.symmetric_text = (
+            symmetric and not configurator.graph.is_directed())
+        return list(configurator.edge_chunks())
+
+    def count(self, chunks):
+        return sum(len(sources) for sources, _targets in chunks)
+
+    def testBothDirections(self):
+        write_text(self.network, self.path, both=True)
+        chunks = self.chunks()
+        self.assertEqual(70, self.count(chunks))
+        for sources, targets in chunks:
+            self.assertTrue((sources <= targets).all())
+
+    def testOneDirection(self):
+        write_text(self.network, self.path, reverse=True)
+        self.assertEqual(70, self.count(self.chunks()))
+
+    def testDirected(self):
+        write_text(self.network, self.path, both=True)
+        self.assertEqual(140, self.count(self.chunks(DirectedScipyGraph)))
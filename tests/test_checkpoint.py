@@ -0,0 +1,196 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+import paramunittest
+from traits.api import Int
+
+import pynetsym
+from pynetsym import Clock, FastClock
+from pynetsym import checkpoint
+from pynetsym.checkpoint import Checkpoint, CheckpointError
+from pynetsym.checkpoint import PeriodicCheckpointer
+from pynetsym.configurators.h5_configurator import BasicH5Configurator
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+from pynetsym.graph import BasicH5Graph, NxGraph, snapshot
+
+
+class BA(barabasi_albert.BA):
+    pass
+
+
+def edges(graph):
+    return set(tuple(sorted(edge)) for edge in graph.to_nx().edges())
+
+
+@paramunittest.parametrized(
+    (Clock, ),
+    (FastClock, ),
+)
+class TestCheckpoint(paramunittest.ParametrizedTestCase):
+    def setParameters(self, clock_type):
+        self.clock_type = clock_type
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_simulation(self, callback=None, max_agents=10000):
+        class Simulation(BA):
+            clock_type = self.clock_type
+            agent_db_parameters = dict(max_agents=max_agents)
+
+            def create_simulation_agents(self):
+                super(Simulation, self).create_simulation_agents()
+                if callback is not None:
+                    self.clock.register_callback(
+                        lambda tick: callback(self, tick))
+        return Simulation()
+
+    def testResume(self, max_agents=10000):
+        drawn = {}
+
+        def checkpoint(sim, tick):
+            if tick == 11:
+                sim.checkpoint(self.path)
+                drawn['saved'] = edges(sim.graph)
+                drawn['before'] = random.random()
+
+        def draw(sim, tick):
+            if 'after' not in drawn:
+                drawn['after'] = random.random()
+                drawn['first_tick'] = tick
+
+        sim = self.make_simulation(checkpoint, max_agents)
+        sim.run(starting_network_size=5, starting_edges=2, steps=30)
+        resumed = self.make_simulation(draw, max_agents)
+        resumed.resume(self.path)
+
+        self.assertEqual(11, drawn['first_tick'])
+        self.assertEqual(drawn['before'], drawn['after'])
+        self.assertEqual('Exhausted Count Down.', resumed.motive)
+        self.assertEqual(30, resumed.clock.ticks)
+        self.assertEqual(35, resumed.graph.number_of_nodes())
+        self.assertEqual(60, resumed.graph.number_of_edges())
+        self.assertLessEqual(drawn['saved'], edges(resumed.graph))
+
+    def testResumeHibernated(self):
+        # the hibernated nodes are in the storage of the AgentDB
+        self.testResume(max_agents=0)
+
+    def testPeriodic(self):
+        sim = self.make_simulation()
+        sim.checkpointer_type = PeriodicCheckpointer
+        sim.checkpointer_parameters = dict(path=self.path, interval=0.0)
+        sim.run(starting_network_size=5, starting_edges=2, steps=20)
+        self.assertGreater(sim.checkpointer.checkpoints, 0)
+        self.assertTrue(os.path.isdir(self.path))
+
+        resumed = self.make_simulation()
+        resumed.resume(self.path)
+        self.assertEqual(25, resumed.graph.number_of_nodes())
+
+
+class TestFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint')
+        self.records_per_pickle = checkpoint._RECORDS_PER_PICKLE
+        checkpoint._RECORDS_PER_PICKLE = 2
+
+    def tearDown(self):
+        checkpoint._RECORDS_PER_PICKLE = self.records_per_pickle
+        shutil.rmtree(self.directory)
+
+    def make_checkpoint(self, nodes, graph_type=NxGraph):
+        graph = graph_type(None)
+        graph.add_nodes(nodes)
+        return Checkpoint(snapshot.take(graph), dict(
+            graph_type=graph_type,
+            hibernated=dict((node, str(node)) for node in xrange(nodes))))
+
+    def testPieces(self):
+        checkpoint.write(self.path, self.make_checkpoint(5), cooperate=True)
+        saved = checkpoint.read(self.path)
+        self.assertEqual(5, len(saved.snapshot.nodes))
+        self.assertEqual(dict((node, str(node)) for node in xrange(5)),
+                         saved.state['hibernated'])
+
+    def testStaleOld(self):
+        checkpoint.write(self.path, self.make_checkpoint(3))
+        os.makedirs(self.path + '.old')
+        checkpoint.write(self.path, self.make_checkpoint(4))
+        self.assertFalse(os.path.exists(self.path + '.old'))
+        self.assertEqual(4, len(checkpoint.read(self.path).snapshot.nodes))
+
+    def testReadOld(self):
+        checkpoint.write(self.path, self.make_checkpoint(3))
+        os.rename(self.path, self.path + '.old')
+        self.assertEqual(3, len(checkpoint.read(self.path).snapshot.nodes))
+
+    def testGraphNotRestorable(self):
+        class Graph(NxGraph):
+            @classmethod
+            def from_snapshot(cls, snapshot):
+                raise NotImplementedError()
+
+        saved = self.make_checkpoint(3, Graph)
+        self.assertRaises(CheckpointError, checkpoint.restore_graph,
+                          pynetsym.Simulation(), saved)
+
+
+class CountingNode(pynetsym.Node):
+    activations = Int(0)
+    counts = {}
+
+    def activate(self):
+        self.activations += 1
+        self.counts[self.id] = self.activations
+
+
+class ActivateAll(pynetsym.Activator):
+    def nodes_to_activate(self):
+        return list(self.graph)
+
+
+class H5Simulation(pynetsym.Simulation):
+    graph_type = BasicH5Graph
+    graph_options = {'h5_file'}
+    activator_type = ActivateAll
+
+    class configurator_type(BasicH5Configurator):
+        node_type = CountingNode
+        node_options = set()
+
+
+class TestReadOnlyGraph(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint')
+        self.h5_file = os.path.join(self.directory, 'graph.h5')
+        matrix = nx.to_scipy_sparse_matrix(nx.cycle_graph(6), format='csr')
+        snapshot.write(self.h5_file, matrix.indptr, matrix.indices)
+        CountingNode.counts.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testResume(self):
+        sim = H5Simulation()
+        sim.checkpointer_type = PeriodicCheckpointer
+        sim.checkpointer_parameters = dict(path=self.path, interval=0.0)
+        sim.run(h5_file=self.h5_file, steps=4)
+        CountingNode.counts.clear()
+
+        resumed = H5Simulation()
+        resumed.resume(self.path)
+        self.assertEqual(6, resumed.graph.number_of_nodes())
+        self.assertEqual(range(6), sorted(CountingNode.counts))
+        self.assertTrue(all(count > 1
+                            for count in CountingNode.counts.values()))
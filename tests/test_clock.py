@@ -0,0 +1,43 @@
+import unittest
+
+import paramunittest
+
+from pynetsym import Clock, FastClock
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+
+
+class CountingFastClock(FastClock):
+    def __init__(self, **traits):
+        super(CountingFastClock, self).__init__(**traits)
+        self.seen_ticks = []
+        self.register_callback(self.seen_ticks.append)
+
+
+@paramunittest.parametrized(
+    (Clock, {}),
+    (CountingFastClock, {}),
+    (CountingFastClock, dict(ticks_per_quantum=7)),
+)
+class TestClocks(paramunittest.ParametrizedTestCase):
+    def setParameters(self, clock_type, clock_options):
+        self.clock_type = clock_type
+        self.clock_options = clock_options
+
+    def testSteps(self):
+        clock_type, clock_options = self.clock_type, self.clock_options
+
+        class BA(barabasi_albert.BA):
+            pass
+        BA.clock_type = clock_type
+        BA.clock_parameters = clock_options
+
+        sim = BA()
+        sim.run(starting_network_size=5, starting_edges=2, steps=40)
+        self.assertEqual(45, sim.graph.number_of_nodes())
+        self.assertEqual("Exhausted Count Down.", sim.motive)
+        self.assertEqual(40, sim.clock.ticks)
+        if clock_type is CountingFastClock:
+            self.assertEqual(range(1, 41), sim.clock.seen_ticks)
+        checker = sim.termination_checker
+        checker._greenlet.join(timeout=1)
+        self.assertTrue(checker._greenlet.ready())
@@ -0,0 +1,134 @@
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+from traits.api import Bool, Int, Set
+
+import pynetsym
+from pynetsym import NXGraphConfigurator
+from pynetsym.configuration_cache import ConfigurationCache
+from pynetsym.configuration_cache import configuration_key
+from pynetsym.node_state import Column, NodeStateStore
+
+
+class Node(pynetsym.Node):
+    ready = Bool(False)
+    messages = []
+
+    def initialize(self):
+        self.messages.append('initialize')
+        self.ready = True
+        self.send(pynetsym.Activator.name, 'node_ready', node=self.id)
+
+    def accept_link(self, originating_node):
+        self.messages.append('accept_link')
+        return super(Node, self).accept_link(originating_node)
+
+    def activate(self):
+        assert self.ready
+
+
+class Activator(pynetsym.Activator):
+    ready_nodes = Set(Int)
+
+    def node_ready(self, node):
+        self.ready_nodes.add(node)
+
+
+class Simulation(pynetsym.Simulation):
+    activator_type = Activator
+
+    class configurator_type(NXGraphConfigurator):
+        node_type = Node
+        node_options = set()
+        initialize_nodes = NXGraphConfigurator.do_initialize
+
+
+class CountingNode(pynetsym.Node):
+    activations = Column(0)
+
+    def activate(self):
+        self.activations += 1
+
+
+class CountingSimulation(pynetsym.Simulation):
+    node_state_store_type = NodeStateStore
+
+    class configurator_type(NXGraphConfigurator):
+        node_type = CountingNode
+        node_options = set()
+
+    def run_simulation(self):
+        self.starting_activations = list(
+            self.node_state_store.values('activations'))
+        return super(CountingSimulation, self).run_simulation()
+
+
+def edges(graph):
+    return set(tuple(sorted(edge)) for edge in graph.to_nx().edges())
+
+
+class TestConfigurationCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.starting_graph = nx.cycle_graph(8)
+        del Node.messages[:]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_simulation(self, cache, steps=5):
+        sim = Simulation()
+        sim.configuration_cache = cache
+        return sim.run(starting_graph=self.starting_graph, steps=steps)
+
+    def checkReuse(self, cache):
+        first = self.run_simulation(cache)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(16, len(Node.messages))
+
+        self.assertEqual(set(range(8)), first.activator.ready_nodes)
+
+        del Node.messages[:]
+        second = self.run_simulation(cache, steps=3)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual([], Node.messages)
+        self.assertEqual(edges(first.graph), edges(second.graph))
+        # the agents of the simulation are not restored from the cache
+        self.assertEqual(set(), second.activator.ready_nodes)
+        self.assertEqual('Exhausted Count Down.', second.motive)
+        self.assertEqual(first.clock.ticks - 2, second.clock.ticks)
+
+    def testMemory(self):
+        self.checkReuse(ConfigurationCache())
+
+    def testDirectory(self):
+        self.checkReuse(ConfigurationCache(self.directory + '/cache'))
+
+    def checkReplicates(self, cache):
+        for _replicate in xrange(3):
+            sim = CountingSimulation()
+            sim.configuration_cache = cache
+            sim.run(starting_graph=nx.cycle_graph(4), steps=20)
+            self.assertEqual([0, 0, 0, 0], sim.starting_activations)
+            self.assertGreater(
+                sim.node_state_store.values('activations').sum(), 0)
+        self.assertEqual(2, cache.hits)
+
+    def testReplicatesMemory(self):
+        self.checkReplicates(ConfigurationCache())
+
+    def testReplicatesDirectory(self):
+        self.checkReplicates(ConfigurationCache(self.directory + '/cache'))
+
+    def testKey(self):
+        sim = Simulation()
+        sim.update_parameters(dict(starting_graph=self.starting_graph,
+                                   steps=5))
+        key = configuration_key(sim)
+        sim.update_parameters(dict(steps=10))
+        self.assertEqual(key, configuration_key(sim))
+        sim.update_parameters(dict(starting_graph=nx.path_graph(8)))
+        self.assertNotEqual(key, configuration_key(sim))
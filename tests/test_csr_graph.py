@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+import h5py
+import networkx as nx
+import numpy as np
+from numpy import testing
+
+from pynetsym.graph import CSRGraph, NxGraph, GraphError
+from pynetsym.graph.random_selector import AliasTable
+
+
+class TestCSRGraphStar(unittest.TestCase):
+    def setUp(self):
+        self.size = 6
+        sources = np.zeros(self.size - 1, dtype=int)
+        targets = np.arange(1, self.size)
+        self.graph = CSRGraph.from_edges(sources, targets)
+
+    def testSize(self):
+        self.assertEqual(self.size, self.graph.number_of_nodes())
+        self.assertEqual(self.size - 1, self.graph.number_of_edges())
+
+    def testNeighbors(self):
+        testing.assert_array_equal(range(1, self.size),
+                                   self.graph.neighbors(0))
+        for node in xrange(1, self.size):
+            testing.assert_array_equal([0], self.graph.neighbors(node))
+
+    def testNeighborsAreViews(self):
+        self.assert_(np.may_share_memory(self.graph.indices,
+                                         self.graph.neighbors(0)))
+
+    def testDegree(self):
+        self.assertEqual(self.size - 1, self.graph.degree(0))
+        self.assertEqual(1, self.graph.degree(1))
+
+    def testHasEdge(self):
+        self.assert_(self.graph.has_edge(0, 3))
+        self.assert_(self.graph.has_edge(3, 0))
+        self.assertFalse(self.graph.has_edge(1, 2))
+
+    def testReadOnly(self):
+        self.assertRaises(GraphError, self.graph.add_edge, 1, 2)
+        self.assertRaises(GraphError, self.graph.remove_edge, 0, 1)
+        self.assertRaises(GraphError, self.graph.remove_node, 0)
+
+    def testAddNodeClaimsExistingNodes(self):
+        self.assertEqual(range(self.size), self.graph.add_nodes(self.size))
+        self.assertRaises(GraphError, self.graph.add_node)
+
+    def testContains(self):
+        self.assert_(0 in self.graph)
+        self.assertFalse(self.size in self.graph)
+        self.assertFalse(-1 in self.graph)
+        self.assertFalse('foo' in self.graph)
+
+    def testToNx(self):
+        self.assert_(nx.is_isomorphic(nx.star_graph(self.size - 1),
+                                      self.graph.to_nx()))
+
+    def testRandomSelector(self):
+        selector = self.graph.random_selector
+        for _ in xrange(20):
+            self.assert_(selector.random_node() in self.graph)
+            self.assert_(selector.preferential_attachment() in self.graph)
+            self.assert_(self.graph.has_edge(*selector.random_edge()))
+
+
+class TestCSRGraphConversion(unittest.TestCase):
+    def setUp(self):
+        self.nx_graph = nx.gnm_random_graph(30, 60, seed=3)
+        self.graph = NxGraph(self.nx_graph)
+
+    def testFromGraph(self):
+        frozen = CSRGraph.from_graph(self.graph)
+        self.assertEqual(self.graph.number_of_nodes(),
+                         frozen.number_of_nodes())
+        self.assertEqual(self.graph.number_of_edges(),
+                         frozen.number_of_edges())
+        for node in self.graph:
+            self.assertItemsEqual(self.graph.neighbors(node),
+                                  frozen.neighbors(node).tolist())
+
+    def testFromGraphDirected(self):
+        graph = NxGraph(nx.DiGraph(self.nx_graph.edges()))
+        frozen = CSRGraph.from_graph(graph)
+        self.assert_(frozen.is_directed())
+        for node in graph:
+            self.assertItemsEqual(graph.predecessors(node),
+                                  frozen.predecessors(node).tolist())
+            self.assertEqual(graph.degree(node), frozen.degree(node))
+
+    def testFromH5(self):
+        frozen = CSRGraph.from_graph(self.graph)
+        handle, path = tempfile.mkstemp(suffix='.h5')
+        os.close(handle)
+        try:
+            with h5py.File(path, 'w') as h5:
+                h5['indptr'] = frozen.indptr
+                h5['indices'] = frozen.indices
+            loaded = CSRGraph.from_h5(path)
+        finally:
+            os.remove(path)
+        testing.assert_array_equal(frozen.indptr, loaded.indptr)
+        testing.assert_array_equal(frozen.indices, loaded.indices)
+
+
+class TestAliasTable(unittest.TestCase):
+    def testDistribution(self):
+        table = AliasTable(np.arange(3), [1, 2, 7])
+        counts = np.bincount([table.sample() for _ in xrange(20000)],
+                             minlength=3)
+        testing.assert_allclose([0.1, 0.2, 0.7], counts / 20000., atol=0.02)
+
+    def testEmpty(self):
+        self.assertRaises(IndexError, AliasTable([], []).sample)
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from pynetsym.util import Ensemble, QuantileSketch
+
+
+class TestEnsemble(unittest.TestCase):
+    def setUp(self):
+        rs = np.random.RandomState(7)
+        self.arrays = [rs.poisson(5, rs.randint(1, 20)).astype(float)
+                       for _i in xrange(300)]
+        self.padded = np.zeros((len(self.arrays),
+                                max(len(a) for a in self.arrays)))
+        for row, array in zip(self.padded, self.arrays):
+            row[:len(array)] = array
+
+    def testStatistics(self):
+        ensemble = Ensemble()
+        ensemble.extend(self.arrays)
+        self.assertEqual(len(self.arrays), len(ensemble))
+        self.assertTrue(np.allclose(self.padded.mean(axis=0), ensemble.mean))
+        self.assertTrue(np.allclose(self.padded.var(axis=0, ddof=1),
+                                    ensemble.variance(ddof=1)))
+        self.assertTrue(np.allclose(self.padded.min(axis=0), ensemble.minimum))
+        self.assertTrue(np.allclose(self.padded.max(axis=0), ensemble.maximum))
+
+    def testMerge(self):
+        parts = [Ensemble(seed=seed) for seed in xrange(3)]
+        for i, array in enumerate(self.arrays):
+            parts[i % 3].add(array)
+        parts = [pickle.loads(pickle.dumps(part)) for part in parts]
+        ensemble = reduce(Ensemble.merge, parts, Ensemble())
+        self.assertEqual(len(self.arrays), len(ensemble))
+        self.assertTrue(np.allclose(self.padded.mean(axis=0), ensemble.mean))
+        self.assertTrue(np.allclose(self.padded.var(axis=0),
+                                    ensemble.variance()))
+        self.assertTrue(np.allclose(self.padded.max(axis=0), ensemble.maximum))
+        self.check_quantiles(ensemble.quantile([0.1, 0.5, 0.9]),
+                             [0.1, 0.5, 0.9])
+
+    def testQuantiles(self):
+        ensemble = Ensemble(k=32)
+        ensemble.extend(self.arrays)
+        self.assertEqual((self.padded.shape[1], ),
+                         ensemble.quantile(0.5).shape)
+        self.check_quantiles(ensemble.quantile([0.1, 0.5, 0.9]),
+                             [0.1, 0.5, 0.9])
+
+    def check_quantiles(self, quantiles, qs):
+        # the ranks of the quantiles are close to the requested ones
+        for q, values in zip(qs, quantiles):
+            below = (self.padded < values).mean(axis=0)
+            not_above = (self.padded <= values).mean(axis=0)
+            self.assertTrue(np.all(below <= q + 0.1))
+            self.assertTrue(np.all(not_above >= q - 0.1))
+
+    def testNoQuantiles(self):
+        ensemble = Ensemble(quantiles=False)
+        ensemble.add([1, 2])
+        self.assertRaises(ValueError, ensemble.quantile, 0.5)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def testExactWhenSmall(self):
+        sketch = QuantileSketch(k=16)
+        for value in xrange(10):
+            sketch.update([value, 2 * value])
+        self.assertEqual([4, 8], list(sketch.quantile(0.5)))
+        self.assertEqual([0, 0], list(sketch.quantile(0)))
+        self.assertEqual([9, 18], list(sketch.quantile(1)))
+
+    def testMemory(self):
+        sketch = QuantileSketch(k=16)
+        for value in xrange(10000):
+            sketch.update([value])
+        self.assertEqual(10000, sketch.count)
+        self.assertTrue(sum(sketch._size(level)
+                            for level in xrange(len(sketch.levels))) < 16 * 12)
+        self.assertTrue(abs(sketch.quantile(0.5)[0] - 5000) < 1000)
+
+    def testEmpty(self):
+        self.assertRaises(ValueError, QuantileSketch().quantile, 0.5)
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import paramunittest
+
+import pynetsym
+from pynetsym.configurators import GNMConfigurator, GNPConfigurator, \
+    WattsStrogatzConfigurator, BarabasiAlbertConfigurator, \
+    ConfigurationModelConfigurator
+from pynetsym.graph import GraphError, generators
+
+
+def collect(chunks):
+    chunks = list(chunks)
+    return (np.concatenate([sources for sources, _targets in chunks]),
+            np.concatenate([targets for _sources, targets in chunks]))
+
+
+@paramunittest.parametrized(
+    (generators.gnm_edges, (300, 900), 300, 900),
+    (generators.gnm_edges, (20, 150), 20, 150),
+    (generators.gnp_edges, (300, 0.02), 300, None),
+    (generators.gnp_edges, (10, 1.0), 10, 45),
+    (generators.watts_strogatz_edges, (300, 3, 0.4), 300, 900),
+    (generators.barabasi_albert_edges, (300, 3), 300, 891),
+    (generators.configuration_model_edges, (np.repeat(4, 300), ), 300, None),
+)
+class TestGenerators(paramunittest.ParametrizedTestCase):
+    def setParameters(self, generator, arguments, n, number_of_edges):
+        self.generator = generator
+        self.arguments = arguments
+        self.n = n
+        self.number_of_edges = number_of_edges
+
+    def generate(self, seed):
+        return collect(self.generator(*self.arguments, seed=seed,
+                                      chunk_size=64))
+
+    def testSimpleGraph(self):
+        n = self.n
+        sources, targets = self.generate(42)
+        self.assertFalse((sources == targets).any())
+        self.assertTrue(((sources >= 0) & (sources < n)).all())
+        self.assertTrue(((targets >= 0) & (targets < n)).all())
+        codes = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+        self.assertEqual(len(codes), len(np.unique(codes)))
+        if self.number_of_edges is not None:
+            self.assertEqual(self.number_of_edges, len(sources))
+
+    def testSeed(self):
+        first, second = self.generate(7), self.generate(7)
+        self.assertSequenceEqual(first[0].tolist(), second[0].tolist())
+        self.assertSequenceEqual(first[1].tolist(), second[1].tolist())
+
+
+class TestErrors(unittest.TestCase):
+    def testTooManyEdges(self):
+        self.assertRaises(GraphError, generators.gnm_edges, 4, 7)
+
+    def testLatticeTooLarge(self):
+        self.assertRaises(
+            GraphError, generators.watts_strogatz_edges, 4, 2, 0.1)
+
+    def testOddDegrees(self):
+        self.assertRaises(
+            GraphError, generators.configuration_model_edges, [1, 2])
+
+
+@paramunittest.parametrized(
+    (GNMConfigurator, dict(number_of_edges=120), 120),
+    (GNPConfigurator, dict(edge_probability=1.0), 1225),
+    (WattsStrogatzConfigurator,
+     dict(lattice_connections=2, rewiring_probability=0.2), 100),
+    (BarabasiAlbertConfigurator, dict(starting_edges=2), 96),
+    (ConfigurationModelConfigurator,
+     dict(degree_sequence=[1] * 50), 25),
+)
+class TestGeneratorConfigurators(paramunittest.ParametrizedTestCase):
+    def setParameters(self, configurator, parameters, number_of_edges):
+        self.configurator = configurator
+        self.parameters = parameters
+        self.number_of_edges = number_of_edges
+
+    def run_simulation(self):
+        base = self.configurator
+
+        class Simulation(pynetsym.Simulation):
+            class configurator_type(base):
+                node_type = pynetsym.Node
+                node_options = set()
+
+        return Simulation().run(starting_network_size=50, seed=3, steps=1,
+                                **self.parameters)
+
+    def testConfigure(self):
+        sim = self.run_simulation()
+        self.assertEqual(50, sim.graph.number_of_nodes())
+        self.assertEqual(self.number_of_edges, sim.graph.number_of_edges())
+        edges = set(sim.graph.to_nx().edges())
+        self.assertEqual(
+            edges, set(self.run_simulation().graph.to_nx().edges()))
@@ -27,6 +27,20 @@ class TestEmptyGraph(unittest.TestCase):
         self.assertEqual(1, self.graph.number_of_nodes())
         self.assertEqual(0, self.graph.number_of_edges())
 
+    def testAddNodesInBulk(self):
+        def add_node():
+            raise AssertionError('Nodes are added one at a time.')
+        self.graph.add_node = add_node
+        self.assertEqual(range(1000), list(self.graph.add_nodes(1000)))
+        self.assertEqual(1000, self.graph.number_of_nodes())
+
+    def testAddedNodes(self):
+        self.assertEqual([0, 1, 2], list(self.graph.add_nodes(3)))
+        self.graph.remove_node(1)
+        self.assertEqual([1, 3], list(self.graph.add_nodes(2)))
+        self.assertEqual(4, self.graph.number_of_nodes())
+        self.assertEqual([0, 1, 2, 3], sorted(self.graph))
+
     def testDiad(self):
         self.assertEqual(0, self.graph.add_node())
         self.assertEqual(1, self.graph.add_node())
@@ -44,6 +58,31 @@ class TestEmptyGraph(unittest.TestCase):
         self.assertEqual(2, self.graph.number_of_nodes())
         self.assertEqual(1, self.graph.number_of_edges())
 
+    def testAddEdgesFrom(self):
+        self.graph.add_nodes(4)
+        self.graph.random_selector.prepare_preferential_attachment()
+        self.graph.add_edges_from([0, 0, 2], [1, 2, 3])
+
+        self.assertEqual(3, self.graph.number_of_edges())
+        for source, target in [(0, 1), (0, 2), (2, 3)]:
+            self.assert_(self.graph.has_edge(source, target))
+        self.assertEqual(
+            [0, 0, 0, 1, 1, 2, 2, 2, 3, 3],
+            sorted(self.graph.random_selector.repeated_nodes))
+
+    def testAddEdgeChunks(self):
+        self.graph.add_nodes(4)
+        self.graph.add_edge_chunks(iter([([0, 0], [1, 2]), ([2, 0], [3, 1])]))
+
+        self.assertEqual(3, self.graph.number_of_edges())
+        for source, target in [(0, 1), (0, 2), (2, 3)]:
+            self.assert_(self.graph.has_edge(source, target))
+
+    def testAddEdgesFromNoNodes(self):
+        self.graph.add_nodes(2)
+        with self.assertRaises(GraphError):
+            self.graph.add_edges_from([0, 1], [1, 2])
+
     def testDiadNoNodes(self):
         with self.assertRaises(GraphError):
             self.graph.add_edge(0, 1)
@@ -292,3 +331,34 @@ class TestNXExport(paramunittest.ParametrizedTestCase):
         other_graph.add_edge(self.new_node, 0)
         self.assertEqual(self.size - 1, self.graph.number_of_edges())
 
+
+
+@paramunittest.parametrized(
+    (ScipyGraph, ),
+    (DirectedScipyGraph, ))
+class TestScipyEdgeBatches(paramunittest.ParametrizedTestCase):
+    def setParameters(self, graph_type):
+        self.graph = graph_type(max_nodes=10)
+
+    def setUp(self):
+        self.graph.edge_batch_size = 2
+        self.graph.add_nodes(4)
+
+    def testBatchesAreAppliedLazily(self):
+        def chunks():
+            yield [0], [1]
+            yield [1], [2]
+            self.assert_(self.graph.has_edge(0, 1))
+            self.assertFalse(self.graph.has_edge(2, 3))
+            yield [2], [3]
+
+        self.graph.add_edge_chunks(chunks())
+        self.assertEqual(3, self.graph.number_of_edges())
+        self.assert_(self.graph.has_edge(2, 3))
+
+    def testRemovedNode(self):
+        self.graph.remove_node(2)
+        with self.assertRaises(GraphError):
+            self.graph.add_edge_chunks([([0], [1]), ([1], [2])])
+        with self.assertRaises(GraphError):
+            self.graph.add_edge_chunks([([0], [10])])
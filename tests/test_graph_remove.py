@@ -32,3 +32,14 @@ class TestGraphRemoveNode(paramunittest.ParametrizedTestCase):
         self.graph.remove_node(0)
         self.assertEquals(self.number_of_initial_nodes-1, self.graph.number_of_nodes())
         self.assertEquals(0, self.graph.number_of_edges())
+
+    def testRemovedIdentifierIsReused(self):
+        self.graph.remove_node(2)
+        self.assertEqual(2, self.graph.add_node())
+
+    def testRemoveNodeKeepsOtherEdges(self):
+        self.graph.add_edge(1, 2)
+        self.graph.remove_node(0)
+        self.assert_(self.graph.has_edge(1, 2))
+        self.assertEquals(1, self.graph.number_of_edges())
+        self.assertEqual([2], list(self.graph.successors(1)))
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import unittest
+import itertools as it
+
+import numpy as np
+import paramunittest
+import networkx as nx
+
+from pynetsym.graph import NxGraph, ScipyGraph, DirectedScipyGraph, \
+    CSRGraph, GraphError
+from pynetsym.graph import snapshot
+
+
+def make_nx(directed):
+    return NxGraph(nx.DiGraph() if directed else nx.Graph())
+
+
+def make_scipy(directed):
+    graph_type = DirectedScipyGraph if directed else ScipyGraph
+    return graph_type(max_nodes=20)
+
+
+edges = [(0, 1), (1, 2), (2, 0), (5, 3), (6, 7)]
+formats = [('graph.h5', None), ('graph.h5', 'gzip'),
+           ('graph.npz', None), ('graph.npz', True)]
+backends = [(make_nx, NxGraph), (make_scipy, ScipyGraph)]
+
+
+@paramunittest.parametrized(*it.product(formats, backends, [False, True]))
+class TestRoundTrip(paramunittest.ParametrizedTestCase):
+    def setParameters(self, file_format, backend, directed):
+        self.filename, self.compression = file_format
+        self.make_graph, self.graph_type = backend
+        self.directed = directed
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, self.filename)
+        self.graph = self.make_graph(self.directed)
+        self.graph.add_nodes(8)
+        for source, target in edges:
+            self.graph.add_edge(source, target)
+        self.graph.remove_node(4)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameGraph(self, loaded):
+        self.assertEqual(self.directed, loaded.is_directed())
+        self.assertItemsEqual(list(self.graph), list(loaded))
+        self.assertEqual(self.graph.number_of_edges(),
+                         loaded.number_of_edges())
+        for node in self.graph:
+            self.assertItemsEqual(self.graph.successors(node),
+                                  [int(n) for n in loaded.successors(node)])
+
+    def testCSR(self):
+        self.graph.save(self.path, self.compression)
+        self.assertSameGraph(snapshot.load(self.path))
+
+    def testSameBackend(self):
+        if self.directed and self.graph_type is ScipyGraph:
+            self.graph_type = DirectedScipyGraph
+        self.graph.save(self.path, self.compression)
+        loaded = self.graph_type.load(self.path)
+        self.assertSameGraph(loaded)
+        self.assertEqual(4, loaded.add_node())
+        self.assertEqual(8, loaded.add_node())
+
+    def expected_edges(self):
+        if self.directed:
+            return set(edges)
+        return set((min(edge), max(edge)) for edge in edges)
+
+    def testIterEdges(self):
+        self.graph.save(self.path, self.compression)
+        streamed = []
+        for sources, targets in snapshot.iter_edges(self.path, 2):
+            streamed.extend(zip(sources.tolist(), targets.tolist()))
+        self.assertItemsEqual(self.expected_edges(), streamed)
+
+    def testWriteEdges(self):
+        sources, targets = np.array(edges).T
+        chunks = lambda: iter([(sources[:3], targets[:3]),
+                               (sources[3:], targets[3:])])
+        snapshot.write_edges(self.path, 8, chunks, self.directed,
+                             max_entries=3, compression=self.compression)
+        loaded = snapshot.load(self.path)
+        self.assertEqual(range(8), list(loaded))
+        self.assertEqual(self.directed, loaded.is_directed())
+        self.assertEqual(5, loaded.number_of_edges())
+        for source, target in edges:
+            self.assertTrue(loaded.has_edge(source, target))
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'graph.h5')
+        self.graph = CSRGraph.from_edges([0, 1, 2], [1, 2, 3])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testMemoryMap(self):
+        self.graph.save(self.path)
+        loaded = CSRGraph.load(self.path, mmap=True)
+        self.assertIsInstance(loaded.indices, np.memmap)
+        self.assertItemsEqual([0, 2], loaded.neighbors(1))
+
+    def testMemoryMapCompressed(self):
+        self.graph.save(self.path, compression='gzip')
+        self.assertRaises(GraphError, snapshot.read, self.path, True)
+
+    def testDirectedInUndirected(self):
+        CSRGraph.from_edges([0], [1], directed=True).save(self.path)
+        self.assertRaises(GraphError, ScipyGraph.load, self.path)
+
+    def testBareLayout(self):
+        snapshot.write(self.path, [0, 1, 2, 2], [1, 0])
+        loaded = NxGraph.load(self.path)
+        self.assertEqual([0, 1, 2], list(loaded))
+        self.assertTrue(loaded.has_edge(0, 1))
+        self.assertFalse(loaded.is_directed())
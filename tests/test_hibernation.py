@@ -0,0 +1,117 @@
+import unittest
+
+import gevent
+import networkx as nx
+
+import pynetsym
+from pynetsym import addressing, core
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+from pynetsym.graph import NxGraph
+from pynetsym.hibernation import MemoryBudgetPolicy, current_rss
+from pynetsym.node_manager import NodeManager
+
+
+class Agent(object):
+    def __init__(self, identifier):
+        self.id = identifier
+
+
+class TestMemoryBudgetPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = MemoryBudgetPolicy(
+            max_agents=4, low_water=0.5, sample_interval=0.0)
+        self.agents = [Agent(identifier) for identifier in xrange(6)]
+        for agent in self.agents:
+            self.policy.activity(agent)
+
+    def testLeastRecentlyActiveFirst(self):
+        self.policy.activity(self.agents[0])
+        hibernated = [agent.id for agent in self.agents
+                      if self.policy.should_hibernate(agent)]
+        self.assertEqual([1, 2, 3, 4], hibernated)
+        self.assertEqual(2, self.policy.resident)
+        self.assertEqual(4, self.policy.hibernations)
+
+    def testWithinBudget(self):
+        self.policy.forget(self.agents[0])
+        self.policy.forget(self.agents[1])
+        self.assertFalse(any(self.policy.should_hibernate(agent)
+                             for agent in self.agents))
+        self.assertEqual(4, self.policy.metrics()['resident'])
+
+    def testNoBudget(self):
+        policy = MemoryBudgetPolicy(sample_interval=0.0)
+        policy.activity(self.agents[0])
+        self.assertFalse(policy.should_hibernate(self.agents[0]))
+
+    def testRSSBudget(self):
+        policy = MemoryBudgetPolicy(max_rss=1, sample_interval=0.0)
+        for agent in self.agents:
+            policy.activity(agent)
+        self.assertTrue(policy.should_hibernate(self.agents[0]))
+        self.assertLess(0, policy.samples[-1][1])
+        self.assertEqual(0, policy.metrics()['rss_cap'])
+
+    def testCurrentRSS(self):
+        self.assertLess(0, current_rss())
+
+
+class CountingPolicy(MemoryBudgetPolicy):
+    def __init__(self, **traits):
+        super(CountingPolicy, self).__init__(**traits)
+        self.questions = 0
+
+    def should_hibernate(self, agent):
+        self.questions += 1
+        return super(CountingPolicy, self).should_hibernate(agent)
+
+
+class TestIdleNodes(unittest.TestCase):
+    def setUp(self):
+        self.runtime = core.MinimalAgentRuntime()
+        self.policy = CountingPolicy(
+            max_agents=3, low_water=1.0, sample_interval=0.0)
+        self.node_manager = self.runtime.spawn_agent(
+            NodeManager, NodeManager.name, graph=NxGraph(nx.Graph()),
+            hibernation_policy=self.policy)
+        self.node_manager.create_nodes(pynetsym.Node, 3, {})
+        gevent.sleep(0.1)
+
+    def resident(self):
+        resident = []
+        for identifier in xrange(3):
+            try:
+                self.runtime.address_book.resolve(identifier)
+            except addressing.AddressingError:
+                pass
+            else:
+                resident.append(identifier)
+        return resident
+
+    def testNoPolling(self):
+        self.assertEqual(3, self.policy.questions)
+        self.assertEqual([0, 1, 2], self.resident())
+
+    def testVictimsWokenUp(self):
+        self.policy.max_agents = 1
+        self.node_manager.sync_send(0, 'neighbors')
+        gevent.sleep(0.1)
+        self.assertEqual([0], self.resident())
+
+    def testHibernateAll(self):
+        self.policy.hibernate_all()
+        gevent.sleep(0.1)
+        self.assertEqual([], self.resident())
+
+
+class TestSimulationPolicy(unittest.TestCase):
+    def testRun(self):
+        class BA(barabasi_albert.BA):
+            hibernation_policy_type = MemoryBudgetPolicy
+            hibernation_policy_parameters = dict(max_agents=20)
+
+        sim = BA()
+        sim.run(starting_network_size=10, starting_edges=2, steps=100)
+        policy = sim.hibernation_policy
+        self.assertLess(0, policy.hibernations)
+        self.assertEqual(110, sim.graph.number_of_nodes())
@@ -65,4 +65,41 @@ class TestPeek(TestCase):
 
     def test(self):
         self.perform_actions(self.actions)
-        self.assertEquals(self.result, self.store.peek())
\ No newline at end of file
+        self.assertEquals(self.result, self.store.peek())
+
+class TestBulkIntIdentifierStore(TestCase):
+    def setUp(self):
+        self.store = IntIdentifierStore()
+
+    def testTakeMany(self):
+        self.assertEqual(range(5), self.store.take_many(5))
+        self.assertEqual(5, self.store.peek())
+
+    def testTakeManyReusesHoles(self):
+        self.store.take_many(5)
+        self.store.free_many([3, 1])
+        self.assertEqual([1, 3, 5, 6], self.store.take_many(4))
+        self.assertEqual(7, self.store.peek())
+
+    def testFreeManyRegressesUpper(self):
+        self.store.take_many(10)
+        self.store.free_many(range(4, 10))
+        self.assertEqual(4, self.store.peek())
+        self.assertEqual([4, 5], self.store.take_many(2))
+
+    def testFreeTwice(self):
+        self.store.take_many(3)
+        self.store.free(1)
+        self.store.free(1)
+        self.assertEqual(1, self.store.take())
+        self.assertEqual(3, self.store.take())
+
+    def testChurn(self):
+        self.store.take_many(100)
+        for identifier in xrange(0, 100, 2):
+            self.store.free(identifier)
+        self.store.free_many(range(50, 100))
+        self.assertEqual(range(0, 50, 2) + [50, 51], self.store.take_many(27))
+
+    def testNegative(self):
+        self.assertRaises(ValueError, self.store.free, -1)
@@ -0,0 +1,86 @@
+import unittest
+
+import gevent
+
+try:
+    import mongomock
+    from pynetsym.agent_db import MongoAgentDB, get_mongo_client
+except ImportError:
+    mongomock = None
+
+from pynetsym import MissingNode
+from pynetsym.generation_models import nx_barabasi_albert as ba
+
+
+@unittest.skipIf(mongomock is None, 'mongomock and pymongo required')
+class TestMongoAgentDB(unittest.TestCase):
+    def setUp(self):
+        self.client = mongomock.MongoClient()
+        self.node_db = MongoAgentDB(client=self.client, batch_size=2,
+                                    batch_seconds=60)
+        self.collection = self.client[MongoAgentDB.db_name].agents
+        self.nodes = [ba.Node(starting_edges=edges) for edges in xrange(3)]
+        for identifier, node in enumerate(self.nodes):
+            node.id = identifier
+
+    def testBatchedStores(self):
+        self.node_db.store(self.nodes[0])
+        self.assertEqual(0, self.collection.count())
+        self.node_db.store(self.nodes[1])
+        self.assertEqual(2, self.collection.count())
+
+    def testTimedFlush(self):
+        node_db = MongoAgentDB(client=self.client, batch_size=10,
+                               batch_seconds=0.05)
+        node_db.store(self.nodes[0])
+        self.assertEqual(0, self.collection.count())
+        gevent.sleep(0.1)
+        self.assertEqual(1, self.collection.count())
+
+    def testCommit(self):
+        self.node_db.store(self.nodes[0])
+        self.node_db.commit()
+        self.assertEqual(1, self.collection.count())
+
+    def testClose(self):
+        self.node_db.store(self.nodes[0])
+        self.node_db.close()
+        self.assertEqual(1, self.collection.count())
+        self.assertIsNone(self.node_db._timer)
+
+    def testRecoverPending(self):
+        self.node_db.store(self.nodes[2])
+        node = self.node_db.recover(2)
+        self.assertIsInstance(node, ba.Node)
+        self.assertEqual(2, node.starting_edges)
+
+    def testRecoverStored(self):
+        self.node_db.store(self.nodes[1])
+        self.node_db.flush()
+        self.assertEqual(1, self.node_db.recover(1).starting_edges)
+
+    def testPrefetch(self):
+        for node in self.nodes:
+            self.node_db.store(node)
+        self.node_db.flush()
+        self.node_db.prefetch([0, 2, 5])
+        self.collection.delete_many({})
+        self.assertEqual(2, self.node_db.recover(2).starting_edges)
+        self.assertRaises(MissingNode, self.node_db.recover, 1)
+
+    def testStoreInvalidatesPrefetch(self):
+        self.node_db.store(self.nodes[1])
+        self.node_db.flush()
+        self.node_db.prefetch([1])
+        self.nodes[1].starting_edges = 7
+        self.node_db.store(self.nodes[1])
+        self.assertEqual(7, self.node_db.recover(1).starting_edges)
+
+    def testNoDrop(self):
+        self.node_db.store(self.nodes[0])
+        self.node_db.flush()
+        other = MongoAgentDB(client=self.client, drop=False)
+        self.assertEqual(0, other.recover(0).starting_edges)
+
+    def testSharedClient(self):
+        self.assertIs(get_mongo_client(), get_mongo_client())
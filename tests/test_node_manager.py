@@ -0,0 +1,76 @@
+import unittest
+
+import networkx as nx
+import traits.api as t
+
+import pynetsym
+from pynetsym import core
+from pynetsym.agent_db import AgentDB, LazyAgentDB, PythonPickler
+from pynetsym.graph import NxGraph
+from pynetsym.node_manager import NodeManager
+
+
+class Node(pynetsym.Node):
+    value = t.Int(0)
+
+    def get_value(self):
+        return self.value
+
+
+class TestCreateNodes(unittest.TestCase):
+    def setUp(self):
+        self.runtime = core.MinimalAgentRuntime()
+        self.graph = NxGraph(nx.Graph())
+        self.node_manager = self.runtime.spawn_agent(
+            NodeManager, NodeManager.name, graph=self.graph)
+
+    def testCreateNodes(self):
+        identifiers = self.node_manager.create_nodes(
+            Node, 5, dict(value=3))
+        self.assertEqual(range(5), identifiers)
+        self.assertEqual(5, self.graph.number_of_nodes())
+        for identifier in identifiers:
+            self.assertEqual(
+                3, self.node_manager.sync_send(identifier, 'get_value'))
+
+    def testCreateNodesFrom(self):
+        identifiers = self.node_manager.create_nodes_from(
+            (Node, dict(value=value)) for value in (4, 2, 7))
+        self.assertEqual(
+            [4, 2, 7],
+            [self.node_manager.sync_send(identifier, 'get_value')
+             for identifier in identifiers])
+
+    def testCreateNoNodes(self):
+        self.assertEqual([], self.node_manager.create_nodes(Node, 0, {}))
+
+    def testActivatorCreatesNoNodes(self):
+        runtime = core.MinimalAgentRuntime()
+        # no NodeManager: sending it a message would fail
+        activator = runtime.spawn_agent(
+            pynetsym.Activator, pynetsym.Activator.name, graph=self.graph)
+        activator.create_nodes()
+        self.assertEqual([], activator.fresh_nodes)
+
+
+class TestDeclareNodes(unittest.TestCase):
+    def setUp(self):
+        self.runtime = core.MinimalAgentRuntime(
+            agent_db_factory=lambda: LazyAgentDB(
+                AgentDB(PythonPickler(), dict())))
+        self.graph = NxGraph(nx.Graph())
+        self.node_manager = self.runtime.spawn_agent(
+            NodeManager, NodeManager.name, graph=self.graph)
+
+    def testMaterializedOnFirstMessage(self):
+        identifiers = self.node_manager.declare_nodes(
+            Node, 4, dict(value=3))
+        self.assertEqual(range(4), identifiers)
+        self.assertEqual(4, self.graph.number_of_nodes())
+        self.assertEqual(['manager'], list(self.runtime.address_book.list()))
+        self.assertEqual(
+            3, self.node_manager.sync_send(2, 'get_value'))
+        self.assertEqual(1, self.runtime.node_db.materialized)
+        self.assertEqual(
+            3, self.node_manager.sync_send(2, 'get_value'))
+        self.assertEqual(1, self.runtime.node_db.materialized)
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+import pynetsym
+from pynetsym.node_state import Column, NodeStateStore
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+
+
+class SIRNode(pynetsym.Node):
+    state = Column('S', values=('S', 'I', 'R'))
+    rate = Column(1.0)
+
+
+class TestNodeStateStore(unittest.TestCase):
+    def setUp(self):
+        self.store = NodeStateStore(capacity=2)
+        self.nodes = []
+        for identifier, state in enumerate('SIISR'):
+            node = SIRNode(state=state)
+            node.id = identifier
+            node.bind_state_store(self.store)
+            self.nodes.append(node)
+
+    def testViews(self):
+        self.assertEqual('I', self.nodes[1].state)
+        self.nodes[1].state = 'R'
+        self.assertEqual(2, self.store.column('state')[1])
+        self.store.column('rate')[3] = 0.25
+        self.assertEqual(0.25, self.nodes[3].rate)
+
+    def testGrowth(self):
+        self.assertGreaterEqual(self.store.capacity, 5)
+        self.assertEqual(['S', 'I', 'I', 'S', 'R'],
+                         [node.state for node in self.nodes])
+
+    def testCount(self):
+        self.assertEqual(2, self.store.count('state', 'I'))
+        self.assertEqual({'S': 2, 'I': 2, 'R': 1},
+                         self.store.distribution('state'))
+
+    def testRemoveRow(self):
+        self.store.remove_row(1)
+        self.assertEqual(1, self.store.count('state', 'I'))
+        self.assertEqual(4, np.count_nonzero(self.store.alive))
+        self.assertEqual('S', self.nodes[1].state)
+
+    def testNotPickledWhenBound(self):
+        self.assertNotIn('state', self.nodes[0].__getstate__())
+
+    def testUnbound(self):
+        node = SIRNode(state='R')
+        self.assertEqual('R', node.state)
+        self.assertEqual(1.0, node.rate)
+        self.assertEqual('R', node.__getstate__()['state'])
+
+
+class TestTrackedStore(TestNodeStateStore):
+    def setUp(self):
+        super(TestTrackedStore, self).setUp()
+        self.store.track('state')
+
+    def testTrackedCount(self):
+        self.nodes[0].state = 'I'
+        self.nodes[2].state = 'R'
+        self.store.remove_row(4)
+        self.store.add_rows([4, 5])
+        self.assertEqual({'S': 3, 'I': 2, 'R': 1},
+                         self.store.distribution('state'))
+        self.store.track('rate')
+        self.nodes[1].rate = 0.5
+        self.assertEqual(5, self.store.count('rate', 1.0))
+        self.assertEqual(1, self.store.count('rate', 0.5))
+
+
+class TestStoreState(unittest.TestCase):
+    def testSetStateCopies(self):
+        store = NodeStateStore(capacity=2)
+        node = SIRNode()
+        node.id = 0
+        node.bind_state_store(store)
+        state = store.get_state()
+        restored = NodeStateStore()
+        restored.set_state(state)
+        restored.column('rate')[0] = 0.5
+        restored.alive[0] = False
+        self.assertEqual(1.0, state['columns']['rate'][0])
+        self.assertTrue(state['alive'][0])
+
+
+class CountingNode(barabasi_albert.Node):
+    activations = Column(0)
+
+    def activate(self):
+        self.activations += 1
+        super(CountingNode, self).activate()
+
+
+class TestSimulationStore(unittest.TestCase):
+    def testRun(self):
+        class Activator(barabasi_albert.Activator):
+            def nodes_to_create(self):
+                return [(CountingNode,
+                         dict(starting_edges=self.starting_edges))]
+
+        class BA(barabasi_albert.BA):
+            activator_type = Activator
+            node_state_store_type = NodeStateStore
+
+        sim = BA()
+        sim.run(starting_network_size=10, starting_edges=2, steps=50)
+        store = sim.node_state_store
+        self.assertEqual(60, np.count_nonzero(store.alive))
+        self.assertEqual(50, store.values('activations').sum())
@@ -0,0 +1,104 @@
+import collections
+import unittest
+import paramunittest
+import itertools as it
+
+import networkx as nx
+from pynetsym.graph import NxGraph, ScipyGraph, DirectedScipyGraph, CSRGraph
+from pynetsym.graph import _util
+
+
+def make_csr(edges, size, directed):
+    sources, targets = zip(*edges)
+    return CSRGraph.from_edges(sources, targets, size, directed=directed)
+
+
+def make_mutable(graph_factory, make_parameters):
+    def factory(edges, size, directed):
+        graph = graph_factory(**make_parameters())
+        graph.add_nodes(size)
+        for source, target in edges:
+            graph.add_edge(source, target)
+        return graph
+    return factory
+
+
+graph_makers = [
+    (make_mutable(ScipyGraph, lambda: dict(max_nodes=20)), False),
+    (make_mutable(NxGraph, lambda: dict(graph=nx.Graph())), False),
+    (make_mutable(DirectedScipyGraph, lambda: dict(max_nodes=20)), True),
+    (make_mutable(NxGraph, lambda: dict(graph=nx.DiGraph())), True),
+    (make_csr, False),
+    (make_csr, True),
+]
+
+
+@paramunittest.parametrized(*graph_makers)
+class TestOpenTriads(paramunittest.ParametrizedTestCase):
+    def setParameters(self, make_graph, directed):
+        self.make_graph = make_graph
+        self.directed = directed
+
+    def setUp(self):
+        # 0 is linked to 1..5; 1-2, 2-3 and 4-3 close some triads
+        edges = [(0, node) for node in xrange(1, 6)]
+        edges += [(1, 2), (2, 3), (4, 3)]
+        self.graph = self.make_graph(edges, 7, self.directed)
+        self.open_pairs = set(it.combinations(range(1, 6), 2)).difference(
+            [(1, 2), (2, 3), (3, 4)])
+
+    def testCount(self):
+        self.assertEqual(len(self.open_pairs),
+                         self.graph.count_open_triads(0))
+
+    def testCountLeaf(self):
+        self.assertEqual(0, self.graph.count_open_triads(5))
+
+    def testSample(self):
+        for _ in xrange(50):
+            node_a, node_b = self.graph.sample_open_triad(0)
+            self.assertIn(tuple(sorted((node_a, node_b))), self.open_pairs)
+
+    def testSampleIsolated(self):
+        self.assertIsNone(self.graph.sample_open_triad(6))
+
+
+class TestClique(unittest.TestCase):
+    def setUp(self):
+        self.graph = NxGraph(nx.complete_graph(6))
+
+    def testCount(self):
+        self.assertEqual(0, self.graph.count_open_triads(0))
+
+    def testSample(self):
+        self.assertIsNone(self.graph.sample_open_triad(0))
+
+    def testSampleAlmostClique(self):
+        self.graph.remove_edge(2, 4)
+        for _ in xrange(20):
+            self.assertEqual((2, 4), tuple(sorted(
+                self.graph.sample_open_triad(0))))
+
+    def testSampleReadsLinksOnce(self):
+        graph = CountingNxGraph(nx.complete_graph(30))
+        self.assertIsNone(graph.sample_open_triad(0))
+        # the neighborhood of 0, then the links of each neighbor
+        self.assertEqual(30, graph.neighbors_calls)
+
+    def testSampleAlmostCliqueIsUniform(self):
+        open_pairs = [(1, 2), (2, 4), (3, 5)]
+        for pair in open_pairs:
+            self.graph.remove_edge(*pair)
+        counts = collections.Counter(
+            tuple(sorted(_util.sample_open_triad(self.graph, 0, trials=0)))
+            for _ in xrange(600))
+        self.assertEqual(set(open_pairs), set(counts))
+        self.assert_(all(count > 100 for count in counts.itervalues()))
+
+
+class CountingNxGraph(NxGraph):
+    neighbors_calls = 0
+
+    def neighbors(self, node):
+        self.neighbors_calls += 1
+        return super(CountingNxGraph, self).neighbors(node)
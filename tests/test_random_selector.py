@@ -119,4 +119,35 @@ class TestDirectedScipyRandomSelector(AbstractTestRandomSelector, TestCase):
         matrix[0,0]= 0
         self.graph = DirectedScipyGraph(matrix=matrix)
 
-        self.random_selector = self.graph.random_selector
\ No newline at end of file
+        self.random_selector = self.graph.random_selector
+
+class TestIncrementalRemoval(TestCase):
+    def setUp(self):
+        self.graph = NxGraph(nx.Graph())
+        self.graph.add_nodes(8)
+        for source, target in [(0, 1), (0, 2), (1, 2), (2, 3),
+                               (3, 4), (4, 5), (5, 6), (6, 7), (7, 0)]:
+            self.graph.add_edge(source, target)
+        self.random_selector = self.graph.random_selector
+        self.random_selector.preferential_attachment()
+
+    def assertMatchesRebuilt(self):
+        incremental = sorted(self.random_selector.repeated_nodes)
+        self.random_selector.prepare_preferential_attachment()
+        self.assertEqual(sorted(self.random_selector.repeated_nodes),
+                         incremental)
+
+    def testRemoveNode(self):
+        self.graph.remove_node(2)
+        self.assertMatchesRebuilt()
+
+    def testRemoveEdge(self):
+        self.graph.remove_edge(7, 0)
+        self.assertMatchesRebuilt()
+
+    def testChurn(self):
+        self.graph.remove_node(0)
+        self.graph.add_node()
+        self.graph.add_edge(0, 4)
+        self.graph.remove_node(4)
+        self.assertMatchesRebuilt()
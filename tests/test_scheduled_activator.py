@@ -0,0 +1,74 @@
+import unittest
+
+import networkx as nx
+from traits.api import Int, List
+
+import pynetsym
+from pynetsym import FastClock, NXGraphConfigurator
+from pynetsym.simulation import ScheduledActivator
+
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self):
+        self.activator = ScheduledActivator()
+
+    def testOrder(self):
+        self.activator.schedule(1, delay=3)
+        self.activator.schedule(2, at=1.5)
+        self.activator.schedule(3)
+        self.assertEqual(1.0, self.activator.next_event_time())
+        self.activator.current_time = 2
+        self.assertEqual([3, 2], self.activator.nodes_to_activate())
+        self.assertEqual(1, self.activator.pending_events())
+
+    def testReschedule(self):
+        self.activator.schedule(1, delay=1)
+        self.activator.schedule(1, delay=5)
+        self.activator.schedule(2, delay=2)
+        self.activator.unschedule(2)
+        self.assertEqual(5, self.activator.next_event_time())
+        self.activator.current_time = 10
+        self.assertEqual([1], self.activator.nodes_to_activate())
+        self.assertIsNone(self.activator.next_event_time())
+
+    def testPast(self):
+        self.activator.current_time = 4
+        self.activator.schedule(1, at=2)
+        self.assertEqual(4, self.activator.next_event_time())
+
+
+class Node(pynetsym.Node):
+    wake_ups = Int(3)
+
+    def initialize(self):
+        self.send(ScheduledActivator.name, 'schedule',
+                  node=self.id, delay=0.5 * self.id)
+
+    def activate(self):
+        Simulation.activations.append((self.id, self.wake_ups))
+        self.wake_ups -= 1
+        if self.wake_ups:
+            return 2.0
+
+
+class Simulation(pynetsym.Simulation):
+    activations = []
+    activator_type = ScheduledActivator
+    clock_type = FastClock
+
+    class configurator_type(NXGraphConfigurator):
+        node_type = Node
+        node_options = set()
+        initialize_nodes = NXGraphConfigurator.do_initialize
+
+
+class TestScheduledSimulation(unittest.TestCase):
+    def testRun(self):
+        del Simulation.activations[:]
+        sim = Simulation()
+        sim.run(starting_graph=nx.path_graph(2), steps=100)
+        self.assertEqual('No more events', sim.motive)
+        self.assertEqual(
+            [(0, 3), (1, 3), (0, 2), (1, 2), (0, 1), (1, 1)],
+            Simulation.activations)
+        self.assertEqual(4.5, sim.activator.current_time)
@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import traits.api as t
+
+import pynetsym
+from pynetsym.agent_db import SchemaPickler, SerializationError
+
+
+class Sample(pynetsym.Node):
+    state = t.Enum('S', 'I', 'R')
+    rate = t.Float(0.5)
+    counter = t.Int
+    flag = t.false
+    neighbors = t.List(t.Int)
+    scratch = t.Int(transient=True)
+
+
+class Outer(object):
+    class Inner(pynetsym.Node):
+        counter = t.Int
+
+
+class TestSchemaPickler(TestCase):
+    def setUp(self):
+        self.pickler = SchemaPickler()
+        self.node = Sample(state='I', rate=0.25, counter=7, flag=True,
+                           neighbors=[1, 2], scratch=3)
+        self.node.id = 42
+
+    def roundtrip(self, obj):
+        return self.pickler.loads(self.pickler.dumps(obj))
+
+    def testSingleton(self):
+        self.assertIs(self.pickler, SchemaPickler())
+
+    def testRoundtrip(self):
+        node = self.roundtrip(self.node)
+        self.assertIsInstance(node, Sample)
+        self.assertEqual(42, node.id)
+        self.assertEqual('I', node.state)
+        self.assertEqual(0.25, node.rate)
+        self.assertEqual(7, node.counter)
+        self.assertTrue(node.flag)
+        self.assertEqual([1, 2], node.neighbors)
+        self.assertEqual(0, node.scratch)
+
+    def testDynamicAttribute(self):
+        self.node.set(color='red')
+        self.assertEqual('red', self.roundtrip(self.node).color)
+
+    def testOverflowFallsBack(self):
+        self.node.counter = 2 ** 70
+        self.assertEqual(2 ** 70, self.roundtrip(self.node).counter)
+
+    def testPlainObjects(self):
+        objects = [1, 'hi', dict(foo='bar'), [3, 4, 2], frozenset((3, 5))]
+        self.assertListEqual(objects, map(self.roundtrip, objects))
+
+    def testSmallerThanPickle(self):
+        self.assertLess(len(self.pickler.dumps(self.node)),
+                        len(pynetsym.agent_db.PythonPickler().dumps(
+                            self.node)))
+
+    def testGarbage(self):
+        self.assertRaises(SerializationError, self.pickler.loads, 'x')
+
+    def testNestedClass(self):
+        node = Outer.Inner(counter=3)
+        node.id = 5
+        node = self.roundtrip(node)
+        self.assertIsInstance(node, Outer.Inner)
+        self.assertEqual(3, node.counter)
+
+    def testMissingClass(self):
+        header = SchemaPickler._HEADER
+        for class_path in ('pynetsym_missing_module:Sample',
+                           '%s:Missing' % __name__,
+                           '%s:Inner#1' % __name__):
+            self.assertRaises(
+                SerializationError, self.pickler.loads,
+                header.pack(0, len(class_path)) + class_path)
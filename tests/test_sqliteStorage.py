@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import gevent
+
+from pynetsym import core
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+from pynetsym.agent_db import SQLiteStorage, SQLiteAgentDB, \
+    PythonPickler, MissingNode
+
+
+def committed(path):
+    storage = SQLiteStorage(path)
+    try:
+        return storage.connection.execute(
+            'SELECT COUNT(*) FROM agents').fetchone()[0]
+    finally:
+        storage.close()
+
+
+class TestSQLiteStorage(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'agents.db')
+        self.storage = SQLiteStorage(self.path, batch_size=3,
+                                     batch_seconds=60, cache_size=2)
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.directory)
+
+    def committed(self):
+        return committed(self.path)
+
+    def testSetGet(self):
+        self.storage[1] = 'one'
+        self.storage['a'] = '\x00binary\xff'
+        self.assertEqual('one', self.storage[1])
+        self.assertEqual('\x00binary\xff', self.storage['a'])
+        self.assertRaises(KeyError, lambda: self.storage[2])
+
+    def testBatchedCommits(self):
+        self.storage[1] = 'one'
+        self.storage[2] = 'two'
+        self.assertEqual(0, self.committed())
+        self.storage[3] = 'three'
+        self.assertEqual(3, self.committed())
+
+    def testTimedCommits(self):
+        self.storage.batch_seconds = 0
+        self.storage[1] = 'one'
+        self.assertEqual(1, self.committed())
+
+    def testLastBatchCommitted(self):
+        self.storage.batch_seconds = 0.05
+        self.storage.flush()
+        self.storage[1] = 'one'
+        self.assertEqual(0, self.committed())
+        gevent.sleep(0.1)
+        self.assertEqual(1, self.committed())
+
+    def testCopy(self):
+        self.storage[1] = 'one'
+        self.storage[2] = 'two'
+        del self.storage[2]
+        self.storage['a'] = '\x00binary\xff'
+        self.assertEqual({1: 'one', 'a': '\x00binary\xff'},
+                         self.storage.copy())
+
+    def testReadAfterCommit(self):
+        for key in xrange(5):
+            self.storage[key] = str(key)
+        self.storage.close()
+        storage = SQLiteStorage(self.path)
+        self.assertEqual('3', storage[3])
+        self.assertItemsEqual(range(5), list(storage))
+        self.assertEqual(5, len(storage))
+        storage.connection.close()
+
+    def testOverwriteInvalidatesCache(self):
+        self.storage[1] = 'one'
+        self.storage.flush()
+        self.assertEqual('one', self.storage[1])
+        self.storage[1] = 'uno'
+        self.assertEqual('uno', self.storage[1])
+
+    def testDelete(self):
+        self.storage[1] = 'one'
+        self.storage.flush()
+        del self.storage[1]
+        self.assertNotIn(1, self.storage)
+        self.storage.flush()
+        self.assertEqual(0, len(self.storage))
+        with self.assertRaises(KeyError):
+            del self.storage[1]
+
+
+class TestSQLiteAgentDB(TestCase):
+    def setUp(self):
+        self.node_db = SQLiteAgentDB(PythonPickler(), ':memory:')
+        self.agent = core.Agent()
+        self.agent.id = 7
+
+    def tearDown(self):
+        self.node_db.close()
+
+    def testRoundtrip(self):
+        self.node_db.store(self.agent)
+        agent = self.node_db.recover(7)
+        self.assertEqual(7, agent.id)
+        self.assertIsInstance(agent, core.Agent)
+
+    def testMissing(self):
+        self.assertRaises(MissingNode, self.node_db.recover, 7)
+
+
+class TestSimulationCommits(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'agents.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testCommittedAtTheEnd(self):
+        path = self.path
+
+        class BA(barabasi_albert.BA):
+            agent_db_type = SQLiteAgentDB
+
+            @property
+            def agent_db_parameters(self):
+                return dict(pickling_module=PythonPickler(), path=path,
+                            batch_size=10 ** 6, batch_seconds=60)
+
+        sim = BA()
+        sim.run(starting_network_size=5, starting_edges=2, steps=20)
+        self.assertEqual(25, committed(path))
+        sim.agent_db.close()
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from pynetsym import sweep
+from pynetsym.generation_models import nx_barabasi_albert as barabasi_albert
+
+
+class Failing(barabasi_albert.BA):
+    def setup(self):
+        if self.steps == 13:
+            raise ValueError('unlucky number of steps')
+        super(Failing, self).setup()
+
+
+def degrees(sim):
+    return dict(degrees=sim.graph.to_nx().degree().values())
+
+
+def some_degrees(sim):
+    # the metric is missing in the runs with 10 steps
+    if sim.steps == 10:
+        return {}
+    return degrees(sim)
+
+
+class TestParameters(unittest.TestCase):
+    def testGrid(self):
+        self.assertEqual(
+            [dict(a=1, b='x'), dict(a=1, b='y'),
+             dict(a=2, b='x'), dict(a=2, b='y')],
+            sweep.parameter_grid(dict(b=['x', 'y'], a=[1, 2])))
+
+    def testLoad(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'grid.json')
+            with open(path, 'w') as stream:
+                json.dump(dict(steps=[10, 20]), stream)
+            self.assertEqual([dict(steps=10), dict(steps=20)],
+                             sweep.load_parameters(path))
+        finally:
+            shutil.rmtree(directory)
+
+    def testSeeds(self):
+        first = sweep.Run(dict(steps=10), 0, 0)
+        self.assertEqual(first.key, sweep.Run(dict(steps=10), 0, 0).key)
+        self.assertEqual(first.seed, sweep.Run(dict(steps=10), 0, 0).seed)
+        self.assertNotEqual(first.seed, sweep.Run(dict(steps=10), 1, 0).seed)
+        self.assertNotEqual(first.seed, sweep.Run(dict(steps=10), 0, 1).seed)
+        self.assertNotEqual(first.seed, sweep.Run(dict(steps=20), 0, 0).seed)
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sweep.h5')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_sweep(self, steps, processes, **traits):
+        return sweep.Sweep(
+            barabasi_albert.BA,
+            sweep.parameter_grid(dict(
+                steps=steps, starting_network_size=[5], starting_edges=[2])),
+            replicates=2, path=self.path, processes=processes,
+            metrics=degrees, **traits)
+
+    def check(self, columns, steps):
+        self.assertEqual(2 * len(steps), len(columns['key']))
+        self.assertItemsEqual(
+            [s for s in steps for _replicate in xrange(2)], columns['steps'])
+        for run_steps, run_degrees in zip(columns['steps'],
+                                          columns['metrics/degrees']):
+            self.assertEqual(5 + run_steps, len(run_degrees))
+            self.assertEqual(2 * 2 * run_steps, run_degrees.sum())
+
+    def testInProcess(self):
+        simulation_sweep = self.make_sweep([10, 20], 0, save_graphs=True)
+        self.assertEqual(4, simulation_sweep.run())
+        columns = sweep.read(self.path)
+        self.check(columns, [10, 20])
+        for run_steps, graph in zip(columns['steps'], columns['graphs']):
+            self.assertEqual(5 + run_steps, len(graph.nodes))
+        self.assertEqual(0, simulation_sweep.run())
+
+    def testPoolResume(self):
+        self.assertEqual(4, self.make_sweep([10, 20], 2).run())
+        simulation_sweep = self.make_sweep([10, 20, 30], 2)
+        self.assertEqual(2, len(simulation_sweep.pending()))
+        self.assertEqual(2, simulation_sweep.run())
+        self.check(sweep.read(self.path), [10, 20, 30])
+
+    def testReproducible(self):
+        self.make_sweep([20], 0).run()
+        first = sweep.read(self.path)['metrics/degrees']
+        os.remove(self.path)
+        self.make_sweep([20], 2).run()
+        second = sweep.read(self.path)['metrics/degrees']
+        self.assertItemsEqual([tuple(d) for d in first],
+                              [tuple(d) for d in second])
+
+    def testMissingMetric(self):
+        simulation_sweep = self.make_sweep([20, 10, 30], 0)
+        simulation_sweep.metrics = some_degrees
+        self.assertEqual(6, simulation_sweep.run())
+        columns = sweep.read(self.path)
+        for run_steps, run_degrees in zip(columns['steps'],
+                                          columns['metrics/degrees']):
+            if run_steps == 10:
+                self.assertEqual(0, len(run_degrees))
+            else:
+                self.assertEqual(5 + run_steps, len(run_degrees))
+
+    def testErrors(self):
+        simulation_sweep = self.make_sweep([10, 13], 0)
+        simulation_sweep.simulation_type = Failing
+        self.assertEqual(2, simulation_sweep.run())
+        self.assertEqual(2, len(simulation_sweep.errors))
+        self.assertEqual(2, len(simulation_sweep.pending()))
+        self.check(sweep.read(self.path), [10])
@@ -0,0 +1,53 @@
+import unittest
+
+import networkx as nx
+
+from pynetsym.graph import NxGraph
+from pynetsym.termination import TerminationChecker
+from pynetsym.termination import make_condition, counter_condition
+from pynetsym.termination import graph_size
+
+
+class TestConditionScheduling(unittest.TestCase):
+    def setUp(self):
+        self.graph = NxGraph(nx.path_graph(3))
+        self.evaluations = []
+
+    def condition(self, **kwargs):
+        def func(graph):
+            self.evaluations.append(self.checker.checks)
+            return False
+        return make_condition(func, 'never', **kwargs)
+
+    def check(self, times):
+        for _ in xrange(times):
+            self.assertFalse(self.checker.check('requester'))
+
+    def testPeriod(self):
+        self.checker = TerminationChecker(
+            self.graph, [self.condition(period=4)])
+        self.check(10)
+        self.assertEqual([4, 8], self.evaluations)
+
+    def testFingerprint(self):
+        self.checker = TerminationChecker(
+            self.graph, [self.condition(fingerprint=graph_size)])
+        self.check(3)
+        self.graph.add_edge(0, 2)
+        self.check(2)
+        self.assertEqual([1, 4], self.evaluations)
+
+    def testCounter(self):
+        counter = [3]
+        predicates = []
+
+        def predicate(value):
+            predicates.append(value)
+            return False
+        self.checker = TerminationChecker(
+            self.graph,
+            [counter_condition(lambda: counter[0], predicate, 'empty')])
+        self.check(2)
+        counter[0] = 2
+        self.check(2)
+        self.assertEqual([3, 2], predicates)
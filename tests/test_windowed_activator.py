@@ -0,0 +1,55 @@
+import networkx as nx
+import paramunittest
+
+import pynetsym
+from pynetsym import NXGraphConfigurator
+from pynetsym.simulation import WindowedActivator
+
+
+class Node(pynetsym.Node):
+    in_flight = [0]
+    peaks = []
+
+    def activate(self):
+        self.in_flight[0] += 1
+        self.peaks.append(self.in_flight[0])
+        self.cooperate()
+        self.in_flight[0] -= 1
+
+
+class Activator(WindowedActivator):
+    def nodes_to_activate(self):
+        return list(self.graph)
+
+
+class Simulation(pynetsym.Simulation):
+    activator_type = Activator
+
+    class configurator_type(NXGraphConfigurator):
+        node_type = Node
+        node_options = set()
+
+
+@paramunittest.parametrized(
+    (1, 1),
+    (3, 3),
+    (None, 10),
+)
+class TestWindow(paramunittest.ParametrizedTestCase):
+    def setParameters(self, window, peak):
+        self.window = window
+        self.peak = peak
+
+    def testPeak(self):
+        del Node.peaks[:]
+        sim = Simulation()
+        sim.activator_parameters = dict(window=self.window)
+        sim.run(starting_graph=nx.empty_graph(10), steps=4)
+        self.assertEqual(40, len(Node.peaks))
+        self.assertEqual(self.peak, max(Node.peaks))
+        self.assertEqual(0, Node.in_flight[0])
+
+        metrics = sim.activator.metrics()
+        self.assertEqual(4, metrics['ticks'])
+        self.assertEqual(40, metrics['activations'])
+        self.assertGreater(metrics['throughput'], 0)